@@ -0,0 +1,59 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.dependencies import get_state_manager
+from app.models import FileStatus
+from app.services.state_manager import StateManager
+from app.services.websocket_manager import serialize_tracked_file
+
+router = APIRouter(prefix="/api", tags=["history"])
+
+
+@router.get("/history")
+async def get_history(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[FileStatus] = None,
+    state_manager: StateManager = Depends(get_state_manager),
+):
+    """
+    Page through finished (Completed/Failed/Removed) files, newest first.
+
+    The initial WebSocket state only carries the newest page of history;
+    the UI fetches older entries from here.
+    """
+    files, total = await state_manager.get_history_page(offset, limit, status)
+    return {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "files": [serialize_tracked_file(tracked_file) for tracked_file in files],
+    }
+
+
+@router.get("/checksum")
+async def get_checksum(
+    file_path: str = Query(..., description="Source path of the copied file"),
+    state_manager: StateManager = Depends(get_state_manager),
+):
+    """
+    Content checksum recorded for the latest copy of a source file.
+
+    Set when VERIFICATION_MODE is source_hash or readback, so downstream ingest
+    can trust the destination without reading it again. `content_hash` is null
+    while the copy is running or when only sizes were verified.
+    """
+    tracked_file = await state_manager.get_file_by_path(file_path)
+    if tracked_file is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No tracked file for {file_path}",
+        )
+    return {
+        "file_path": tracked_file.file_path,
+        "destination_path": tracked_file.destination_path,
+        "status": tracked_file.status,
+        "content_hash": tracked_file.content_hash,
+        "content_hash_algorithm": tracked_file.content_hash_algorithm,
+    }
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+
+from app.core.events.event_bus import DomainEventBus
+from app.dependencies import get_event_bus
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("/event-queues")
+async def get_event_queue_metrics(event_bus: DomainEventBus = Depends(get_event_bus)):
+    """Depth, high-water mark and drop/coalesce counters per queued subscriber."""
+    return {
+        "queues": event_bus.queue_metrics(),
+        "coalesced_on_publish": event_bus.coalesced_count,
+    }
+
+
+@router.get("/event-handlers")
+async def get_event_handler_metrics(event_bus: DomainEventBus = Depends(get_event_bus)):
+    """Per event type and handler: calls, errors, in-flight and latency percentiles."""
+    return {"handlers": event_bus.handler_metrics()}
@@ -9,6 +9,7 @@ from fastapi import Depends
 from app.config import Settings
 from app.dependencies import get_settings
 from app.dependencies import get_file_scanner
+from app.dependencies import get_file_repository
 
 router = APIRouter(prefix="/api", tags=["uiactions"])
 
@@ -85,6 +86,12 @@ async def restart_application():
             await asyncio.sleep(2)  # Give time for response to be sent
             logging.info("Restarting application...")
 
+            # execv skips the lifespan shutdown - persist pending state first
+            try:
+                await get_file_repository().close()
+            except Exception as e:
+                logging.error(f"Failed to flush state before restart: {e}")
+
             # Get the current Python executable and original command
             python_executable = sys.executable
 
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 
 from app.dependencies import get_websocket_manager
@@ -8,9 +10,13 @@ router = APIRouter(prefix="/api/ws", tags=["websockets"])
 
 @router.websocket("/live")
 async def websocket_endpoint(
-    websocket: WebSocket, ws_manager: WebSocketManager = Depends(get_websocket_manager)
+    websocket: WebSocket,
+    last_seq: Optional[int] = None,
+    epoch: Optional[str] = None,
+    ws_manager: WebSocketManager = Depends(get_websocket_manager),
 ):
-    await ws_manager.connect(websocket)
+    # A reconnecting client passes the last change it saw to get only the missed deltas
+    await ws_manager.connect(websocket, last_seq=last_seq, epoch=epoch)
 
     try:
         while True:
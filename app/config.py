@@ -18,6 +18,13 @@ class Settings(BaseSettings):
     # Timing konfiguration
     file_stable_time_seconds: int = 120
     polling_interval_seconds: int = 10
+    scanner_include_patterns: str = "*.mxf"  # Comma-separated globs on the file name, or "re:<regex>"
+    scanner_exclude_patterns: str = ".*,*test_file*"  # Checked first; excluded files are never stat'ed
+    scanner_full_rescan_interval_seconds: int = 300  # Seconds between full re-listings; polls in between re-list only directories whose mtime changed
+    scanner_walk_workers: int = 4  # Threads walking source subtrees in parallel, off the event loop
+    scanner_directory_timeout_seconds: float = 10.0  # Hung directories are skipped, not waited on
+    scanner_inotify_enabled: bool = True  # Linux only: react to inotify events, polling reconciles
+    inotify_close_settle_seconds: float = 1.0  # Size must hold this long after close-write before READY
 
     # Filkopiering
     use_temporary_file: bool = True
@@ -27,9 +34,15 @@ class Settings(BaseSettings):
     copy_progress_update_interval: int = (
         1  # Update progress every N percent (10 = every 10%)
     )
+    progress_sample_interval_seconds: float = 0.5  # Live copy progress pushed to state/UI at this rate
 
     # Simple, optimal chunk size for all file transfers
     chunk_size_kb: int = 2048  # 2MB chunks - optimal for network transfers
+    use_kernel_copy: bool = True  # Linux: copy_file_range/sendfile instead of read+write through Python
+    kernel_copy_range_mb: int = 16  # Bytes per kernel copy call between progress/network checks
+    copy_mode: str = "sequential"  # "sequential", "pipelined" (read/write overlap) or "threaded" (one thread per transfer)
+    copy_stall_timeout_seconds: float = 60.0  # Threaded copies fail when no byte moved for this long
+    copy_pipeline_depth: int = 4  # Buffers in the pipelined ring (memory = depth x chunk size)
 
     # Logging konfiguration
     log_level: str = "INFO"
@@ -56,6 +69,21 @@ class Settings(BaseSettings):
 
     # File history management
     keep_files_hours: int = 336  # Keep ALL files in memory for 14 days (14*24=336 hours) - provides complete UI log
+    retention_interval_seconds: int = 300  # How often expired history is pruned (own loop, not every scan)
+    history_page_size: int = 500  # Newest history entries sent to a new UI client (older ones via /api/history)
+
+    # Event delivery
+    websocket_event_queue_size: int = 1000  # Per-subscription queue for UI broadcasts (backpressure bound)
+    event_coalesce_interval_seconds: float = 0.25  # Max one progress event per file per interval (0 = off)
+    websocket_change_buffer_size: int = 5000  # Recent file changes kept for delta resync on reconnect
+
+    # State persistence (warm restart)
+    state_backend: str = "memory"  # "memory" (no persistence), "sqlite" or "journal"
+    state_db_path: str = "data/file_agent_state.db"
+    state_journal_dir: str = "data/state_journal"
+    state_journal_compact_mb: float = 64.0  # Fold the journal into a snapshot past this size
+    state_flush_interval_seconds: float = 1.0  # Write-behind commit interval
+    state_flush_batch_size: int = 500  # Commit early when this many changes are pending
 
     # Growing file support (now default)
     growing_file_min_size_mb: int = 100  # Minimum size in MB to start growing copy
@@ -71,6 +99,12 @@ class Settings(BaseSettings):
     enable_secure_resume: bool = (
         True  # Enable secure resume functionality for interrupted copies
     )
+    resume_verify_window_mb: int = 4  # Tail of the kept prefix hashed on both sides before resuming
+
+    # Copy verification
+    verification_mode: str = "size"  # "size", "source_hash" (hash while copying) or "readback" (also re-read destination)
+    checksum_algorithm: str = "blake2b"  # "blake2b" or "xxhash" (needs the optional xxhash package)
+    readback_verify_workers: int = 2  # Threads for destination read-back hashing, apart from copy threads
 
     # Parallel processing
     max_concurrent_copies: int = 8  # Maximum number of concurrent copy operations
@@ -0,0 +1,54 @@
+"""
+Change Buffer - sequence-numbered ring buffer of recent state-change messages.
+"""
+
+import json
+import uuid
+from collections import deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+# This class is responsible solely for numbering and retaining recent change messages, adhering to SRP.
+class SequencedChangeBuffer:
+    """
+    Every appended message gets the next sequence number (as `seq`) and is kept,
+    already serialised, until `capacity` newer messages push it out. A client
+    that remembers the last `seq` it saw can ask for exactly what it missed.
+
+    `epoch` identifies this buffer instance: sequence numbers restart with the
+    process, so a client from a previous run never gets a bogus delta.
+    """
+
+    def __init__(self, capacity: int = 5000):
+        self.epoch = uuid.uuid4().hex[:12]
+        self._latest_seq = 0
+        self._entries: Deque[Tuple[int, str]] = deque(maxlen=max(1, capacity))
+
+    @property
+    def latest_seq(self) -> int:
+        return self._latest_seq
+
+    def append(self, message: Dict[str, Any]) -> str:
+        """Stamp, serialise and retain a message. Returns the JSON text to send."""
+        self._latest_seq += 1
+        message["seq"] = self._latest_seq
+        message_json = json.dumps(message)
+        self._entries.append((self._latest_seq, message_json))
+        return message_json
+
+    def since(self, seq: int, epoch: Optional[str] = None) -> Optional[List[str]]:
+        """
+        Messages after `seq`, oldest first, or None when the gap cannot be
+        bridged (other epoch, a future seq, or messages already evicted).
+        """
+        if epoch is not None and epoch != self.epoch:
+            return None
+        if seq < 0 or seq > self._latest_seq:
+            return None
+        if seq == self._latest_seq:
+            return []
+        oldest_seq = self._entries[0][0] if self._entries else self._latest_seq + 1
+        if seq + 1 < oldest_seq:
+            return None
+        return [message_json for _, message_json in islice(self._entries, seq + 1 - oldest_seq, None)]
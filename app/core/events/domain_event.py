@@ -5,6 +5,7 @@ Base class for all domain events.
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from typing import ClassVar, Optional
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -15,7 +16,13 @@ class DomainEvent:
     Attributes:
         event_id: A unique identifier for the event instance.
         timestamp: The UTC time when the event was created.
+
+    Subclasses that only describe a latest value (e.g. progress) set
+    `coalesce_by` to the field that identifies the subject. The event bus may
+    then drop superseded events of that type; events without it never are.
     """
 
+    coalesce_by: ClassVar[Optional[str]] = None
+
     event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
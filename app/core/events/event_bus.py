@@ -3,15 +3,106 @@ Central domain event bus (Mediator Pattern).
 """
 
 import asyncio
+import itertools
 import logging
-from collections import defaultdict
-from typing import Callable, List, Type, Dict
+import time
+from collections import OrderedDict, defaultdict
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, List, Optional, Type
 
 from app.core.events.domain_event import DomainEvent
+from app.core.events.handler_metrics import HandlerMetricsRegistry
 
 # Define a type hint for an event handler
 # An event handler is an async function that takes a DomainEvent and returns None
 EventHandler = Callable[[DomainEvent], asyncio.Future[None]]
+CoalesceKey = Callable[[DomainEvent], Optional[Hashable]]
+
+
+class OverflowPolicy(str, Enum):
+    """What a full subscriber queue does with the next event."""
+
+    BLOCK = "block"  # The publisher waits for room
+    DROP_OLDEST = "drop_oldest"  # The oldest pending event is discarded
+    COALESCE = "coalesce"  # A pending event with the same key is replaced; otherwise block
+
+
+def coalesce_key_of(event: DomainEvent) -> Optional[Hashable]:
+    """Key for superseding events of a type marked with `coalesce_by`, else None."""
+    if event.coalesce_by is None:
+        return None
+    return (type(event), getattr(event, event.coalesce_by))
+
+
+# This class is responsible solely for buffering events for one queued subscriber, adhering to SRP.
+class SubscriberQueue:
+    def __init__(
+        self,
+        handler: EventHandler,
+        maxsize: int,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        coalesce_key: CoalesceKey = coalesce_key_of,
+    ):
+        self.handler = handler
+        self.maxsize = max(1, maxsize)
+        self.overflow = overflow
+        self._coalesce_key = coalesce_key
+        self._pending: "OrderedDict[Hashable, DomainEvent]" = OrderedDict()
+        self._unique_keys = itertools.count()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self.dispatcher: Optional[asyncio.Task] = None
+
+        self.high_water = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    async def put(self, event: DomainEvent) -> None:
+        key = None
+        if self.overflow == OverflowPolicy.COALESCE:
+            key = self._coalesce_key(event)
+            if key is not None and key in self._pending:
+                self._pending[key] = event  # Latest wins, keeps its place in line
+                self.coalesced += 1
+                return
+
+        while len(self._pending) >= self.maxsize:
+            if self.overflow == OverflowPolicy.DROP_OLDEST:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            else:
+                self._not_full.clear()
+                await self._not_full.wait()
+
+        self._pending[key if key is not None else ("event", next(self._unique_keys))] = event
+        self.high_water = max(self.high_water, len(self._pending))
+        self._not_empty.set()
+
+    async def get(self) -> DomainEvent:
+        while not self._pending:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        _, event = self._pending.popitem(last=False)
+        self._not_full.set()
+        return event
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "handler": self.handler.__name__,
+            "overflow": self.overflow.value,
+            "depth": self.depth,
+            "capacity": self.maxsize,
+            "high_water": self.high_water,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
 
 
 class DomainEventBus:
@@ -21,14 +112,43 @@ class DomainEventBus:
     This implementation ensures that if one event handler fails, it does not
     prevent other handlers from being executed. It logs errors from failed
     handlers without stopping the entire event publication process.
+
+    Handlers run inline in publish() by default. A subscriber that passes a
+    queue_size instead gets its own bounded SubscriberQueue and dispatcher task,
+    so a slow handler never holds up the publisher (beyond the BLOCK policy's
+    backpressure) and never makes the bus spawn a task per event.
+
+    With a coalesce interval, event types marked with `coalesce_by` are
+    delivered at most once per interval per key. An event arriving inside the
+    interval is parked, superseded by any newer one, and the newest is
+    delivered when the interval ends. Unmarked events (status changes etc.)
+    always go straight through, but first flush any parked event about the
+    same subject, so a file's last progress never arrives after its status.
+
+    Every handler call is counted and timed per (event type, handler) in a
+    HandlerMetricsRegistry, cheap enough to leave on.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, coalesce_interval_seconds: float = 0.0) -> None:
         self._handlers: Dict[Type[DomainEvent], List[EventHandler]] = defaultdict(list)
+        self._queues: Dict[Type[DomainEvent], List[SubscriberQueue]] = defaultdict(list)
         self._lock = asyncio.Lock()
 
+        self._coalesce_interval = coalesce_interval_seconds
+        self._last_delivery: Dict[Hashable, float] = {}
+        self._parked: Dict[Hashable, DomainEvent] = {}
+        self._flush_handles: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._flush_tasks: Dict[asyncio.Task, Hashable] = {}
+        self.coalesced_count = 0
+        self._handler_metrics = HandlerMetricsRegistry()
+
     async def subscribe(
-        self, event_type: Type[DomainEvent], handler: EventHandler
+        self,
+        event_type: Type[DomainEvent],
+        handler: EventHandler,
+        queue_size: Optional[int] = None,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+        coalesce_key: CoalesceKey = coalesce_key_of,
     ) -> None:
         """
         Subscribes a handler to a specific event type.
@@ -36,13 +156,52 @@ class DomainEventBus:
         Args:
             event_type: The class of the domain event to subscribe to.
             handler: The asynchronous function to call when the event is published.
+            queue_size: If set, deliver through a bounded queue of this size
+                drained by a dedicated dispatcher task instead of inline.
+            overflow: What a full queue does with the next event.
+            coalesce_key: Key used by OverflowPolicy.COALESCE to merge events.
         """
         async with self._lock:
-            self._handlers[event_type].append(handler)
+            if queue_size is None:
+                self._handlers[event_type].append(handler)
+            else:
+                queue = SubscriberQueue(handler, queue_size, overflow, coalesce_key)
+                queue.dispatcher = asyncio.create_task(self._dispatch(queue))
+                self._queues[event_type].append(queue)
             logging.debug(
                 f"Handler {handler.__name__} subscribed to {event_type.__name__}"
+                + (f" (queued: {queue_size}, {overflow.value})" if queue_size else "")
             )
 
+    def queue_metrics(self) -> List[Dict[str, Any]]:
+        """Depth and counters for every queued subscriber."""
+        return [
+            {"event_type": event_type.__name__, **queue.metrics()}
+            for event_type, queues in self._queues.items()
+            for queue in queues
+        ]
+
+    def handler_metrics(self) -> List[Dict[str, Any]]:
+        """Calls, errors, in-flight and p50/p95/p99 latency per event type and handler."""
+        return self._handler_metrics.snapshot()
+
+    async def close(self) -> None:
+        """Stop every dispatcher task. Events still queued or parked are discarded."""
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        self._flush_handles.clear()
+        self._parked.clear()
+        dispatchers = [
+            queue.dispatcher
+            for queues in self._queues.values()
+            for queue in queues
+            if queue.dispatcher
+        ]
+        for dispatcher in dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*dispatchers, *self._flush_tasks, return_exceptions=True)
+        self._queues.clear()
+
     async def publish(self, event: DomainEvent) -> None:
         """
         Publishes a domain event, calling all subscribed handlers.
@@ -53,14 +212,31 @@ class DomainEventBus:
         Args:
             event: The domain event instance to publish.
         """
+        if self._coalesce_interval > 0:
+            key = coalesce_key_of(event)
+            if key is None:
+                await self._flush_subject(event)
+            elif not self._admit(key, event):
+                return
+        await self._deliver(event)
+
+    async def _deliver(self, event: DomainEvent) -> None:
         event_type = type(event)
         handlers = self._handlers.get(event_type, [])
+        queues = self._queues.get(event_type, [])
 
-        if not handlers:
+        if not handlers and not queues:
             logging.debug(f"No handlers for event {event_type.__name__}")
             return
 
-        logging.info(f"Publishing {event_type.__name__} to {len(handlers)} handler(s)")
+        logging.debug(
+            f"Publishing {event_type.__name__} to {len(handlers) + len(queues)} handler(s)"
+        )
+
+        for queue in queues:
+            await queue.put(event)
+        if not handlers:
+            return
 
         # Create a list of tasks to run all handlers concurrently
         tasks = [self._safe_execute(handler, event) for handler in handlers]
@@ -72,11 +248,84 @@ class DomainEventBus:
         """
         Executes a single event handler safely, catching and logging any exceptions.
         """
+        metrics = self._handler_metrics.for_handler(type(event), handler)
+        metrics.calls += 1
+        metrics.in_flight += 1
+        started = time.perf_counter()
         try:
             await handler(event)
         except Exception as e:
+            metrics.errors += 1
             logging.error(
                 f"Unhandled exception in handler '{handler.__name__}' for event "
                 f"'{type(event).__name__}': {e}",
                 exc_info=True,  # Include stack trace in the log
             )
+        finally:
+            metrics.in_flight -= 1
+            metrics.latency.record(time.perf_counter() - started)
+
+    def _admit(self, key: Hashable, event: DomainEvent) -> bool:
+        """True to deliver now; otherwise the event is parked for the next slot."""
+        if key in self._parked:
+            self._parked[key] = event  # Supersedes the parked one
+            self.coalesced_count += 1
+            return False
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        last = self._last_delivery.get(key)
+        if last is None or now - last >= self._coalesce_interval:
+            self._last_delivery[key] = now
+            if len(self._last_delivery) > 4096:
+                self._forget_idle_keys(now)
+            return True
+
+        self._parked[key] = event
+        self._flush_handles[key] = loop.call_later(
+            last + self._coalesce_interval - now, self._flush_parked, key
+        )
+        return False
+
+    def _flush_parked(self, key: Hashable) -> None:
+        self._flush_handles.pop(key, None)
+        event = self._parked.pop(key, None)
+        if event is None:
+            return
+        self._last_delivery[key] = asyncio.get_running_loop().time()
+        task = asyncio.create_task(self._deliver(event))
+        self._flush_tasks[task] = key
+        task.add_done_callback(self._flush_tasks.pop)
+
+    async def _flush_subject(self, event: DomainEvent) -> None:
+        """Deliver parked or in-flight coalesced events about this event's subject first."""
+
+        def same_subject(key: Hashable) -> bool:
+            event_type, subject = key
+            return getattr(event, event_type.coalesce_by, None) == subject
+
+        in_flight = [task for task, key in self._flush_tasks.items() if same_subject(key)]
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+        for key in [key for key in self._parked if same_subject(key)]:
+            handle = self._flush_handles.pop(key, None)
+            if handle is not None:
+                handle.cancel()
+            parked = self._parked.pop(key)
+            self._last_delivery[key] = asyncio.get_running_loop().time()
+            await self._deliver(parked)
+
+    def _forget_idle_keys(self, now: float) -> None:
+        # Keys idle for a full interval would be admitted anyway
+        self._last_delivery = {
+            key: last
+            for key, last in self._last_delivery.items()
+            if now - last < self._coalesce_interval or key in self._parked
+        }
+
+    async def _dispatch(self, queue: SubscriberQueue) -> None:
+        """Deliver one subscriber's events in order, one at a time."""
+        while True:
+            event = await queue.get()
+            await self._safe_execute(queue.handler, event)
+            queue.delivered += 1
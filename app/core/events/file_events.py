@@ -3,7 +3,7 @@ Domain events specific to file operations.
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import ClassVar, Optional, Tuple
 
 from app.core.events.domain_event import DomainEvent
 from app.models import FileStatus
@@ -28,6 +28,14 @@ class FileStatusChangedEvent(DomainEvent):
     new_status: FileStatus
 
 
+@dataclass(frozen=True)
+class FilesBatchUpdatedEvent(DomainEvent):
+    """Event published once per StateManager.update_many batch that changed anything."""
+
+    file_ids: Tuple[str, ...]
+    status_changes: Tuple[FileStatusChangedEvent, ...] = ()
+
+
 @dataclass(frozen=True)
 class FileReadyEvent(DomainEvent):
     """Event published when a file becomes stable and is ready for processing."""
@@ -68,6 +76,8 @@ class FileCopyFailedEvent(DomainEvent):
 class FileCopyProgressEvent(DomainEvent):
     """Event published periodically during a file copy operation."""
 
+    coalesce_by: ClassVar[Optional[str]] = "file_id"  # Only the newest progress matters
+
     file_id: str
     bytes_copied: int
     total_bytes: int
@@ -0,0 +1,130 @@
+"""
+File History - compact cold tier for files that reached a terminal status.
+
+A TrackedFile carries ~30 validated fields, most of which only matter while the
+file is moving through the pipeline. Once it is COMPLETED, FAILED or REMOVED it
+is only browsed, so it is kept as a slotted record with timestamps packed into
+plain integers, and turned back into a TrackedFile only when somebody reads it.
+That TrackedFile is a copy, so reads get a FrozenTrackedFile: changing it
+raises instead of being silently lost.
+"""
+
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from app.models import FileStatus, FrozenTrackedFile, TrackedFile
+
+HISTORY_STATUSES = frozenset(
+    {FileStatus.COMPLETED, FileStatus.FAILED, FileStatus.REMOVED}
+)
+
+_TIMESTAMP_FIELDS = (
+    "last_write_time",
+    "discovered_at",
+    "started_copying_at",
+    "completed_at",
+    "failed_at",
+    "space_error_at",
+)
+_VALUE_FIELDS = (
+    "id",
+    "file_path",
+    "status",
+    "file_size",
+    "copy_progress",
+    "error_message",
+    "retry_count",
+    "destination_path",
+    "bytes_copied",
+    "copy_speed_mbps",
+    "content_hash",
+    "content_hash_algorithm",
+    "copy_checkpoint",  # Lets the retry of a FAILED copy resume its destination
+)
+
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _pack(value: Optional[datetime]):
+    """Naive datetimes become exact microsecond offsets; anything else is kept."""
+    if value is None or value.tzinfo is not None:
+        return value
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _unpack(value) -> Optional[datetime]:
+    if isinstance(value, int):
+        return _EPOCH + value * _MICROSECOND
+    return value
+
+
+# This class is responsible solely for holding one finished file compactly, adhering to SRP.
+class HistoryRecord:
+    __slots__ = _VALUE_FIELDS + _TIMESTAMP_FIELDS
+
+    @classmethod
+    def from_tracked_file(cls, tracked_file: TrackedFile) -> "HistoryRecord":
+        record = cls.__new__(cls)
+        for name in _VALUE_FIELDS:
+            setattr(record, name, getattr(tracked_file, name))
+        for name in _TIMESTAMP_FIELDS:
+            setattr(record, name, _pack(getattr(tracked_file, name)))
+        return record
+
+    def to_tracked_file(self, editable: bool = False) -> TrackedFile:
+        """
+        A detached TrackedFile, read-only unless `editable`. Changes to an
+        editable one only count once it is saved back through the repository.
+        """
+        fields = {name: getattr(self, name) for name in _VALUE_FIELDS}
+        for name in _TIMESTAMP_FIELDS:
+            fields[name] = _unpack(getattr(self, name))
+        model = TrackedFile if editable else FrozenTrackedFile
+        return model.model_construct(**fields)
+
+
+# This class is responsible solely for storing and paging history records, adhering to SRP.
+class FileHistory:
+    """
+    History records keyed by id. Dict order is the order files finished in
+    (a re-saved record moves to the end), so pages are served newest first
+    without sorting.
+    """
+
+    def __init__(self) -> None:
+        self._records: Dict[str, HistoryRecord] = {}
+
+    def put(self, tracked_file: TrackedFile) -> HistoryRecord:
+        record = HistoryRecord.from_tracked_file(tracked_file)
+        self._records.pop(tracked_file.id, None)
+        self._records[tracked_file.id] = record
+        return record
+
+    def get(self, file_id: str) -> Optional[HistoryRecord]:
+        return self._records.get(file_id)
+
+    def discard(self, file_id: str) -> Optional[HistoryRecord]:
+        return self._records.pop(file_id, None)
+
+    def page(
+        self, offset: int, limit: int, status: Optional[FileStatus] = None
+    ) -> Tuple[List[HistoryRecord], int]:
+        """Newest-first slice of the history and the total number of matches."""
+        newest_first = reversed(self._records.values())
+        if status is None:
+            page = list(islice(newest_first, offset, offset + limit))
+            return page, len(self._records)
+        matches = [record for record in newest_first if record.status == status]
+        return matches[offset : offset + limit], len(matches)
+
+    def clear(self) -> None:
+        self._records.clear()
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
@@ -0,0 +1,167 @@
+"""
+File Index - secondary lookup structures maintained alongside the FileRepository.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from app.models import FileStatus, TrackedFile
+
+# Lower value = more "current". Used to pick the entry that represents a path
+# when several entries (history + active) share the same file path.
+CURRENCY_PRIORITY: Dict[FileStatus, int] = {
+    FileStatus.COPYING: 1,
+    FileStatus.IN_QUEUE: 2,
+    FileStatus.GROWING_COPY: 3,
+    FileStatus.READY_TO_START_GROWING: 4,
+    FileStatus.READY: 5,
+    FileStatus.GROWING: 6,
+    FileStatus.DISCOVERED: 7,
+    FileStatus.WAITING_FOR_SPACE: 8,
+    FileStatus.WAITING_FOR_NETWORK: 8,
+    FileStatus.COMPLETED: 9,
+    FileStatus.FAILED: 10,
+    FileStatus.REMOVED: 11,
+    FileStatus.SPACE_ERROR: 12,
+}
+
+ACTIVE_STATUSES = frozenset(
+    {
+        FileStatus.DISCOVERED,
+        FileStatus.READY,
+        FileStatus.GROWING,
+        FileStatus.READY_TO_START_GROWING,
+        FileStatus.IN_QUEUE,
+        FileStatus.COPYING,
+        FileStatus.GROWING_COPY,
+        FileStatus.WAITING_FOR_SPACE,
+        FileStatus.WAITING_FOR_NETWORK,
+        FileStatus.SPACE_ERROR,
+    }
+)
+
+CurrencyKey = Tuple[int, float]
+
+
+def currency_key(tracked_file: TrackedFile) -> CurrencyKey:
+    """Sort key where the smallest value is the most current entry for a path."""
+    priority = CURRENCY_PRIORITY.get(tracked_file.status, 99)
+    time_priority = -(
+        tracked_file.discovered_at.timestamp() if tracked_file.discovered_at else 0
+    )
+    return (priority, time_priority)
+
+
+@dataclass(frozen=True)
+class _IndexEntry:
+    file_path: str
+    status: FileStatus
+    key: CurrencyKey
+
+
+# This class is responsible solely for keeping path/status lookups in sync with
+# the stored files, adhering to SRP. It holds ids only - never the files themselves.
+class FileIndex:
+    def __init__(self) -> None:
+        self._entries: Dict[str, _IndexEntry] = {}
+        self._ids_by_path: Dict[str, List[str]] = {}
+        self._ids_by_status: Dict[FileStatus, Set[str]] = defaultdict(set)
+
+    def index(self, tracked_file: TrackedFile) -> bool:
+        """
+        Add a file to the index, or refresh it after its status/path changed.
+
+        Returns False when nothing the index tracks changed (e.g. progress-only updates).
+        """
+        new_entry = _IndexEntry(
+            file_path=tracked_file.file_path,
+            status=tracked_file.status,
+            key=currency_key(tracked_file),
+        )
+        old_entry = self._entries.get(tracked_file.id)
+        if old_entry == new_entry:
+            return False
+
+        if old_entry is not None:
+            self._unlink(tracked_file.id, old_entry, new_entry.file_path)
+
+        self._entries[tracked_file.id] = new_entry
+        self._ids_by_status[new_entry.status].add(tracked_file.id)
+        path_ids = self._ids_by_path.setdefault(new_entry.file_path, [])
+        if tracked_file.id not in path_ids:
+            path_ids.append(tracked_file.id)
+        path_ids.sort(key=lambda file_id: self._entries[file_id].key)
+        return True
+
+    def unindex(self, file_id: str) -> bool:
+        """Remove a file from every index."""
+        entry = self._entries.pop(file_id, None)
+        if entry is None:
+            return False
+        self._unlink(file_id, entry, None)
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._ids_by_path.clear()
+        self._ids_by_status.clear()
+
+    def _unlink(
+        self, file_id: str, entry: _IndexEntry, new_path: Optional[str]
+    ) -> None:
+        status_ids = self._ids_by_status.get(entry.status)
+        if status_ids is not None:
+            status_ids.discard(file_id)
+            if not status_ids:
+                del self._ids_by_status[entry.status]
+
+        if entry.file_path != new_path:
+            path_ids = self._ids_by_path.get(entry.file_path, [])
+            if file_id in path_ids:
+                path_ids.remove(file_id)
+            if not path_ids:
+                self._ids_by_path.pop(entry.file_path, None)
+
+    def path_of(self, file_id: str) -> Optional[str]:
+        entry = self._entries.get(file_id)
+        return entry.file_path if entry else None
+
+    def status_of(self, file_id: str) -> Optional[FileStatus]:
+        entry = self._entries.get(file_id)
+        return entry.status if entry else None
+
+    def ids_for_path(self, file_path: str) -> List[str]:
+        """All ids for a path, most current first."""
+        return list(self._ids_by_path.get(file_path, ()))
+
+    def current_id_for_path(self, file_path: str) -> Optional[str]:
+        path_ids = self._ids_by_path.get(file_path)
+        return path_ids[0] if path_ids else None
+
+    def active_id_for_path(self, file_path: str) -> Optional[str]:
+        for file_id in self._ids_by_path.get(file_path, ()):
+            if self._entries[file_id].status in ACTIVE_STATUSES:
+                return file_id
+        return None
+
+    def ids_with_status(self, status: FileStatus) -> Set[str]:
+        return set(self._ids_by_status.get(status, ()))
+
+    def current_ids_with_status(self, status: FileStatus) -> List[str]:
+        """Ids with the given status, reduced to the most current one per path."""
+        best_by_path: Dict[str, str] = {}
+        for file_id in self._ids_by_status.get(status, ()):
+            entry = self._entries[file_id]
+            best_id = best_by_path.get(entry.file_path)
+            if best_id is None or entry.key < self._entries[best_id].key:
+                best_by_path[entry.file_path] = file_id
+        return list(best_by_path.values())
+
+    def current_ids(self) -> Iterator[str]:
+        """The most current id for every tracked path."""
+        for path_ids in self._ids_by_path.values():
+            yield path_ids[0]
+
+    def path_count(self) -> int:
+        return len(self._ids_by_path)
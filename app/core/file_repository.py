@@ -2,53 +2,258 @@
 File Repository - A pure data access layer for TrackedFile objects.
 """
 
-import asyncio
 import logging
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 
-from app.models import TrackedFile
+from app.core.file_history import HISTORY_STATUSES, FileHistory, HistoryRecord
+from app.core.file_index import FileIndex
+from app.core.file_statistics import FileStatistics
+from app.core.persistence.state_store import StateStore
+from app.core.retention_index import RetentionIndex, retention_timestamp
+from app.models import FileStatus, TrackedFile
 
 
 class FileRepository:
     """
-    Provides a thread-safe, in-memory repository for TrackedFile objects.
+    Provides an in-memory repository for TrackedFile objects.
     This class is responsible for the direct storage and retrieval of file data,
     acting as a thin data access layer.
+
+    Every method runs to completion without awaiting, so the event loop already
+    serialises them and no lock is taken. Callers that need read-modify-write
+    atomicity across several calls coordinate that themselves (StateManager).
+
+    Files live in two tiers. Active files are kept as the TrackedFile objects the
+    pipeline mutates (the hot tier). Once a file is saved with a terminal status
+    it moves to FileHistory as a compact record, and reads of it get a detached,
+    read-only FrozenTrackedFile. To change any file, take it from
+    get_for_update() and save it back through update().
+
+    Secondary indexes (by path, by status and "current entry per path") cover
+    both tiers and are kept in sync on every add/update/remove, so lookups never
+    scan the full history. snapshot()/current_snapshot() hand out immutable
+    tuples of hot files that are rebuilt only after a change the index tracks,
+    so repeated full reads are cheap and never observe a half-applied change.
+    FileStatistics counters are moved on the same calls, so aggregate statistics
+    never need a scan, and a RetentionIndex keeps entries ordered by age so
+    retention only visits what has expired.
+
+    An optional StateStore makes the repository durable: every change is handed
+    to the store (write-behind) and load() restores the previous run's files.
     """
 
-    def __init__(self):
-        self._files_by_id: Dict[str, TrackedFile] = {}
-        self._lock = asyncio.Lock()
-        logging.info("FileRepository initialized")
+    def __init__(self, state_store: Optional[StateStore] = None):
+        self._files_by_id: Dict[str, TrackedFile] = {}  # Hot tier only
+        self._history = FileHistory()
+        self._index = FileIndex()
+        self._statistics = FileStatistics()
+        self._retention = RetentionIndex()
+        self._state_store = state_store
+        self._all_snapshot: Optional[Tuple[TrackedFile, ...]] = None
+        self._current_snapshot: Optional[Tuple[TrackedFile, ...]] = None
+        logging.info(
+            f"FileRepository initialized (persistent: {state_store is not None})"
+        )
+
+    @property
+    def is_persistent(self) -> bool:
+        return self._state_store is not None
+
+    async def load(self) -> int:
+        """Load persisted files into memory and start the store's writer."""
+        if not self._state_store:
+            return 0
+        persisted_files = await self._state_store.load()
+        for tracked_file in persisted_files:
+            self._place(tracked_file)
+            self._index.index(tracked_file)
+            self._retention.update(tracked_file.id, retention_timestamp(tracked_file))
+        for file_path in {tracked_file.file_path for tracked_file in persisted_files}:
+            self._refresh_statistics(file_path)
+        self._invalidate_snapshots()
+        await self._state_store.start()
+        return len(persisted_files)
+
+    async def close(self) -> None:
+        """Flush pending changes to the store."""
+        if self._state_store:
+            await self._state_store.close()
 
     async def get_by_id(self, file_id: str) -> Optional[TrackedFile]:
         """Get a single tracked file by its unique ID."""
-        async with self._lock:
-            return self._files_by_id.get(file_id)
+        return self._resolve_one(file_id)
+
+    async def get_for_update(self, file_id: str) -> Optional[TrackedFile]:
+        """The file to change and save back with update(): an editable copy for history entries."""
+        return self._resolve_one(file_id, editable=True)
 
     async def get_all(self) -> List[TrackedFile]:
-        """Get a list of all tracked files."""
-        async with self._lock:
-            return list(self._files_by_id.values())
+        """Get every tracked file, history included (materialises the whole history)."""
+        history, _ = self._history.page(0, len(self._history))
+        return list(self.snapshot()) + [record.to_tracked_file() for record in history]
+
+    async def get_history_page(
+        self, offset: int, limit: int, status: Optional[FileStatus] = None
+    ) -> Tuple[List[TrackedFile], int]:
+        """Newest-first page of finished files and the total number of matches."""
+        records, total = self._history.page(offset, limit, status)
+        return [record.to_tracked_file() for record in records], total
+
+    async def history_count(self) -> int:
+        return len(self._history)
 
     async def add(self, tracked_file: TrackedFile) -> None:
         """Add a new tracked file to the repository."""
-        async with self._lock:
-            if tracked_file.id in self._files_by_id:
-                logging.warning(
-                    f"File with ID {tracked_file.id} already exists in repository. Overwriting."
-                )
-            self._files_by_id[tracked_file.id] = tracked_file
+        if self._contains(tracked_file.id):
+            logging.warning(
+                f"File with ID {tracked_file.id} already exists in repository. Overwriting."
+            )
+        self._store(tracked_file)
+
+    async def update(self, tracked_file: TrackedFile) -> None:
+        """Save changes to a tracked file and refresh its index entries."""
+        if not self._contains(tracked_file.id):
+            logging.warning(
+                f"File with ID {tracked_file.id} not in repository. Adding it."
+            )
+        self._store(tracked_file)
 
     async def remove(self, file_id: str) -> bool:
         """Remove a tracked file from the repository by its ID."""
-        async with self._lock:
-            if file_id in self._files_by_id:
-                del self._files_by_id[file_id]
-                return True
+        removed_file = self._files_by_id.pop(file_id, None) or self._history.discard(
+            file_id
+        )
+        if removed_file is None:
             return False
+        self._index.unindex(file_id)
+        self._retention.discard(file_id)
+        self._refresh_statistics(removed_file.file_path)
+        self._invalidate_snapshots()
+        if self._state_store:
+            self._state_store.record_remove(file_id)
+        return True
+
+    async def remove_older_than(self, cutoff: datetime) -> List[TrackedFile]:
+        """Remove every entry whose retention timestamp is older than `cutoff`."""
+        removed_files = []
+        for file_id in self._retention.pop_expired(cutoff):
+            tracked_file = self._resolve_one(file_id)
+            if tracked_file is None:
+                continue
+            # Re-check hot files in case the entry was changed without update()
+            timestamp = retention_timestamp(tracked_file)
+            if timestamp is not None and timestamp >= cutoff:
+                self._retention.update(file_id, timestamp)
+                continue
+            await self.remove(file_id)
+            removed_files.append(tracked_file)
+        return removed_files
 
     async def count(self) -> int:
         """Return the total number of files in the repository."""
-        async with self._lock:
-            return len(self._files_by_id)
+        return len(self._files_by_id) + len(self._history)
+
+    async def get_by_path(self, file_path: str) -> List[TrackedFile]:
+        """Get all entries for a path, most current first."""
+        return self._resolve(self._index.ids_for_path(file_path))
+
+    async def get_current_for_path(self, file_path: str) -> Optional[TrackedFile]:
+        """Get the entry that currently represents a path (active or history)."""
+        return self._resolve_one(self._index.current_id_for_path(file_path))
+
+    async def get_active_for_path(self, file_path: str) -> Optional[TrackedFile]:
+        """Get the most current non-terminal entry for a path."""
+        return self._resolve_one(self._index.active_id_for_path(file_path))
+
+    async def get_by_status(self, status: FileStatus) -> List[TrackedFile]:
+        """Get every entry with the given status."""
+        return self._resolve(self._index.ids_with_status(status))
+
+    async def get_current_by_status(self, status: FileStatus) -> List[TrackedFile]:
+        """Get entries with the given status, one (the most current) per path."""
+        return self._resolve(self._index.current_ids_with_status(status))
+
+    async def get_current_files(self) -> List[TrackedFile]:
+        """Get the current entry for every tracked path."""
+        return list(self.current_snapshot())
+
+    @property
+    def statistics(self) -> FileStatistics:
+        """Live counters over the current entry of every path (read-only use)."""
+        return self._statistics
+
+    def snapshot(self) -> Tuple[TrackedFile, ...]:
+        """Immutable view of every hot (not yet finished) file."""
+        if self._all_snapshot is None:
+            self._all_snapshot = tuple(self._files_by_id.values())
+        return self._all_snapshot
+
+    def current_snapshot(self) -> Tuple[TrackedFile, ...]:
+        """Immutable view of the current entry for every path whose entry is hot."""
+        if self._current_snapshot is None:
+            self._current_snapshot = tuple(
+                self._files_by_id[file_id]
+                for file_id in self._index.current_ids()
+                if file_id in self._files_by_id
+            )
+        return self._current_snapshot
+
+    def _store(self, tracked_file: TrackedFile) -> None:
+        was_hot = self._files_by_id.get(tracked_file.id) is tracked_file
+        previous_path = self._index.path_of(tracked_file.id)
+        previous_status = self._index.status_of(tracked_file.id)
+
+        is_hot = self._place(tracked_file)
+        if self._index.index(tracked_file) or is_hot != was_hot:
+            self._invalidate_snapshots()
+        self._retention.update(tracked_file.id, retention_timestamp(tracked_file))
+
+        self._refresh_statistics(tracked_file.file_path)
+        if previous_path is not None and previous_path != tracked_file.file_path:
+            self._refresh_statistics(previous_path)
+        if (
+            tracked_file.status == FileStatus.COMPLETED
+            and previous_status != FileStatus.COMPLETED
+        ):
+            self._statistics.record_completion(tracked_file.file_size)
+
+        if self._state_store:
+            self._state_store.record_upsert(tracked_file)
+
+    def _place(self, tracked_file: TrackedFile) -> bool:
+        """Put a file in the tier its status belongs to. Returns True if it is hot."""
+        if tracked_file.status in HISTORY_STATUSES:
+            self._files_by_id.pop(tracked_file.id, None)
+            self._history.put(tracked_file)
+            return False
+        self._history.discard(tracked_file.id)
+        self._files_by_id[tracked_file.id] = tracked_file
+        return True
+
+    def _contains(self, file_id: str) -> bool:
+        return file_id in self._files_by_id or file_id in self._history
+
+    def _record(self, file_id: Optional[str]) -> Optional[Union[TrackedFile, HistoryRecord]]:
+        if not file_id:
+            return None
+        return self._files_by_id.get(file_id) or self._history.get(file_id)
+
+    def _refresh_statistics(self, file_path: str) -> None:
+        current_id = self._index.current_id_for_path(file_path)
+        self._statistics.set_current(file_path, self._record(current_id))
+
+    def _invalidate_snapshots(self) -> None:
+        self._all_snapshot = None
+        self._current_snapshot = None
+
+    def _resolve_one(
+        self, file_id: Optional[str], editable: bool = False
+    ) -> Optional[TrackedFile]:
+        record = self._record(file_id)
+        if isinstance(record, HistoryRecord):
+            return record.to_tracked_file(editable)
+        return record
+
+    def _resolve(self, file_ids) -> List[TrackedFile]:
+        return [self._resolve_one(file_id) for file_id in file_ids]
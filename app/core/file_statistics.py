@@ -0,0 +1,88 @@
+"""
+File Statistics - counters kept in step with the repository on every change.
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from app.models import FileStatus, TrackedFile
+
+GROWING_STATUSES = (
+    FileStatus.GROWING,
+    FileStatus.READY_TO_START_GROWING,
+    FileStatus.GROWING_COPY,
+)
+
+
+# This class is responsible solely for maintaining aggregate file counters, adhering to SRP.
+class FileStatistics:
+    """
+    Status counts and total size cover the *current* entry of every path, like
+    the UI shows them. The repository reports the current entry of each path it
+    touches; the counters move by the difference, so reading them is O(1).
+
+    Completions are also kept in a rolling window to derive files/min and bytes/s.
+    """
+
+    def __init__(self, rate_window_seconds: float = 300.0):
+        self._rate_window_seconds = rate_window_seconds
+        self._status_counts: Dict[FileStatus, int] = {status: 0 for status in FileStatus}
+        self._total_size = 0
+        self._contributions: Dict[str, Tuple[FileStatus, int]] = {}
+        self._completions: Deque[Tuple[float, int]] = deque()
+        self._window_bytes = 0
+
+    def set_current(self, file_path: str, tracked_file: Optional[TrackedFile]) -> None:
+        """Record which entry (if any) currently represents `file_path`."""
+        previous = self._contributions.pop(file_path, None)
+        if previous is not None:
+            self._status_counts[previous[0]] -= 1
+            self._total_size -= previous[1]
+        if tracked_file is not None:
+            contribution = (tracked_file.status, tracked_file.file_size)
+            self._contributions[file_path] = contribution
+            self._status_counts[contribution[0]] += 1
+            self._total_size += contribution[1]
+
+    def record_completion(self, file_size: int, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._completions.append((now, file_size))
+        self._window_bytes += file_size
+        self._prune(now)
+
+    def clear(self) -> None:
+        self._status_counts = {status: 0 for status in FileStatus}
+        self._total_size = 0
+        self._contributions.clear()
+        self._completions.clear()
+        self._window_bytes = 0
+
+    @property
+    def total_files(self) -> int:
+        return len(self._contributions)
+
+    @property
+    def total_size(self) -> int:
+        return self._total_size
+
+    def count(self, status: FileStatus) -> int:
+        return self._status_counts[status]
+
+    def status_counts(self) -> Dict[str, int]:
+        return {status.value: count for status, count in self._status_counts.items()}
+
+    def rates(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Completed files per minute and bytes per second over the rolling window."""
+        self._prune(time.monotonic() if now is None else now)
+        window_minutes = self._rate_window_seconds / 60
+        return {
+            "files_per_minute": len(self._completions) / window_minutes,
+            "bytes_per_second": self._window_bytes / self._rate_window_seconds,
+        }
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self._rate_window_seconds
+        while self._completions and self._completions[0][0] < cutoff:
+            _, file_size = self._completions.popleft()
+            self._window_bytes -= file_size
@@ -0,0 +1,9 @@
+from .state_store import StateStore
+from .sqlite_state_store import SqliteStateStore
+from .journal_state_store import JournalStateStore
+
+__all__ = [
+    "StateStore",
+    "SqliteStateStore",
+    "JournalStateStore",
+]
@@ -0,0 +1,149 @@
+"""
+Journal State Store - append-only JSON-lines journal with snapshot compaction.
+
+Every flushed change is appended as one line to the journal. Once the journal
+grows past the compaction threshold it is folded into a snapshot file and
+truncated, so a boot replays at most one snapshot plus one bounded journal in a
+single sequential read each.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from app.core.persistence.write_behind_store import StateRow, WriteBehindStateStore
+from app.models import TrackedFile
+
+JOURNAL_FILE_NAME = "journal.jsonl"
+SNAPSHOT_FILE_NAME = "snapshot.jsonl"
+
+
+# This class is responsible solely for persisting tracked files to an append-only
+# journal and compacting it into snapshots, adhering to SRP.
+class JournalStateStore(WriteBehindStateStore):
+    def __init__(
+        self,
+        journal_dir: str,
+        compact_threshold_mb: float = 64.0,
+        flush_interval_seconds: float = 1.0,
+        flush_batch_size: int = 500,
+    ):
+        super().__init__(
+            flush_interval_seconds=flush_interval_seconds,
+            flush_batch_size=flush_batch_size,
+            thread_name="journal-state-store",
+        )
+        self._journal_dir = Path(journal_dir)
+        self._journal_path = self._journal_dir / JOURNAL_FILE_NAME
+        self._snapshot_path = self._journal_dir / SNAPSHOT_FILE_NAME
+        self._compact_threshold_bytes = int(compact_threshold_mb * 1024 * 1024)
+        self._journal: Optional[TextIO] = None
+
+        logging.info(
+            f"JournalStateStore initialized: {self._journal_dir} "
+            f"(compaction at {compact_threshold_mb} MB)"
+        )
+
+    def _load_sync(self) -> List[TrackedFile]:
+        documents = self._replay_sync()
+        files = []
+        for file_id, data in documents.items():
+            try:
+                files.append(TrackedFile.model_validate(data))
+            except ValueError as e:
+                logging.warning(f"Skipping unreadable persisted file {file_id}: {e}")
+        logging.info(f"Replayed {len(files)} tracked files from {self._journal_dir}")
+        return files
+
+    def _write_batch_sync(self, rows: List[StateRow], removed_ids: List[str]) -> None:
+        journal = self._open_journal_sync()
+        lines = [
+            # The document is already JSON; splice it in rather than re-encoding.
+            f'{{"op":"upsert","file_id":{json.dumps(file_id)},'
+            f'"status":{json.dumps(status)},"ts":{recorded_at},"file":{data}}}\n'
+            for file_id, _, status, data, recorded_at in rows
+        ]
+        lines.extend(
+            f'{{"op":"remove","file_id":{json.dumps(file_id)}}}\n'
+            for file_id in removed_ids
+        )
+        journal.writelines(lines)
+        journal.flush()
+
+    def _close_sync(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    async def _after_flush(self) -> None:
+        await self._run(self._compact_if_needed_sync)
+
+    def _compact_if_needed_sync(self) -> None:
+        if self._journal is None or self._journal.tell() < self._compact_threshold_bytes:
+            return
+        self._compact_sync()
+
+    async def compact(self) -> None:
+        """Flush pending changes, then fold the journal into the snapshot."""
+        await self.flush()
+        async with self._flush_lock:
+            await self._run(self._compact_sync)
+
+    def _compact_sync(self) -> None:
+        documents = self._replay_sync()
+
+        self._journal_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = self._snapshot_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as snapshot:
+            snapshot.writelines(
+                json.dumps(data, separators=(",", ":")) + "\n"
+                for data in documents.values()
+            )
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temp_path, self._snapshot_path)
+
+        # Only truncate once the snapshot holding its contents is durable.
+        self._close_sync()
+        with open(self._journal_path, "w", encoding="utf-8"):
+            pass
+
+        logging.info(
+            f"Compacted state journal into snapshot ({len(documents)} files)"
+        )
+
+    def _open_journal_sync(self) -> TextIO:
+        if self._journal is None:
+            self._journal_dir.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self._journal_path, "a", encoding="utf-8")
+        return self._journal
+
+    def _replay_sync(self) -> Dict[str, dict]:
+        documents: Dict[str, dict] = {}
+        for data in self._read_lines(self._snapshot_path):
+            documents[data["id"]] = data
+        for record in self._read_lines(self._journal_path):
+            op = record.get("op")
+            if op == "upsert":
+                documents[record["file_id"]] = record["file"]
+            elif op == "remove":
+                documents.pop(record["file_id"], None)
+        return documents
+
+    @staticmethod
+    def _read_lines(path: Path) -> Iterator[dict]:
+        if not path.exists():
+            return
+        with open(path, "r", encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append leaves a torn last line; skip it.
+                    logging.warning(
+                        f"Skipping corrupt line {line_number} in {path.name}"
+                    )
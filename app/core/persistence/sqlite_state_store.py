@@ -0,0 +1,82 @@
+"""
+SQLite State Store - WAL-mode SQLite persistence with batched write-behind commits.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.persistence.write_behind_store import StateRow, WriteBehindStateStore
+from app.models import TrackedFile
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracked_files (
+    id TEXT PRIMARY KEY,
+    file_path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+# This class is responsible solely for persisting tracked files to SQLite, adhering to SRP.
+class SqliteStateStore(WriteBehindStateStore):
+    def __init__(
+        self,
+        db_path: str,
+        flush_interval_seconds: float = 1.0,
+        flush_batch_size: int = 500,
+    ):
+        super().__init__(
+            flush_interval_seconds=flush_interval_seconds,
+            flush_batch_size=flush_batch_size,
+            thread_name="sqlite-state-store",
+        )
+        self._db_path = Path(db_path)
+        self._connection: Optional[sqlite3.Connection] = None
+
+        logging.info(f"SqliteStateStore initialized: {self._db_path}")
+
+    def _connect_sync(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self._db_path))
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _load_sync(self) -> List[TrackedFile]:
+        connection = self._connect_sync()
+        files = []
+        for file_id, data in connection.execute("SELECT id, data FROM tracked_files"):
+            try:
+                files.append(TrackedFile.model_validate_json(data))
+            except ValueError as e:
+                logging.warning(f"Skipping unreadable persisted file {file_id}: {e}")
+        logging.info(f"Loaded {len(files)} tracked files from {self._db_path}")
+        return files
+
+    def _write_batch_sync(self, rows: List[StateRow], removed_ids: List[str]) -> None:
+        connection = self._connect_sync()
+        with connection:
+            if rows:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO tracked_files "
+                    "(id, file_path, status, data, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            if removed_ids:
+                connection.executemany(
+                    "DELETE FROM tracked_files WHERE id = ?",
+                    [(file_id,) for file_id in removed_ids],
+                )
+
+    def _close_sync(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
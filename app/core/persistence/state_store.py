@@ -0,0 +1,42 @@
+"""
+State Store - persistence port for the FileRepository.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List
+
+from app.models import TrackedFile
+
+
+class StateStore(ABC):
+    """
+    Durable backing store for tracked files.
+
+    The repository calls record_upsert/record_remove on every change. These calls
+    sit on the copy hot path, so implementations must only mark work to be done
+    and persist it later from a background task (write-behind).
+    """
+
+    @abstractmethod
+    async def load(self) -> List[TrackedFile]:
+        """Read every persisted file. Called once at startup."""
+
+    @abstractmethod
+    def record_upsert(self, tracked_file: TrackedFile) -> None:
+        """Mark a file as changed. Must not block."""
+
+    @abstractmethod
+    def record_remove(self, file_id: str) -> None:
+        """Mark a file as deleted. Must not block."""
+
+    @abstractmethod
+    async def start(self) -> None:
+        """Start the background writer."""
+
+    @abstractmethod
+    async def flush(self) -> None:
+        """Persist all pending changes now."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Flush pending changes and release resources."""
@@ -0,0 +1,155 @@
+"""
+Write-behind base for state stores: coalesce changes in memory, persist from a background task.
+"""
+
+import asyncio
+import logging
+import time
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.persistence.state_store import StateStore
+from app.models import TrackedFile
+
+# (file_id, file_path, status, json document, recorded_at)
+StateRow = Tuple[str, str, str, str, float]
+
+
+# This class is responsible solely for batching repository changes and handing them
+# to a storage backend off the hot path, adhering to SRP.
+class WriteBehindStateStore(StateStore):
+    def __init__(
+        self,
+        flush_interval_seconds: float = 1.0,
+        flush_batch_size: int = 500,
+        thread_name: str = "state-store",
+    ):
+        self._flush_interval = flush_interval_seconds
+        self._flush_batch_size = flush_batch_size
+
+        self._pending_upserts: Dict[str, TrackedFile] = {}
+        self._pending_removes: Set[str] = set()
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+        # All backend I/O runs on one worker thread, in submission order.
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=thread_name
+        )
+        self._writer_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @abstractmethod
+    def _load_sync(self) -> List[TrackedFile]:
+        """Read every persisted file (runs on the store thread)."""
+
+    @abstractmethod
+    def _write_batch_sync(self, rows: List[StateRow], removed_ids: List[str]) -> None:
+        """Persist one batch of changes (runs on the store thread)."""
+
+    def _close_sync(self) -> None:
+        """Release backend resources (runs on the store thread)."""
+
+    async def load(self) -> List[TrackedFile]:
+        return await self._run(self._load_sync)
+
+    def record_upsert(self, tracked_file: TrackedFile) -> None:
+        self._pending_removes.discard(tracked_file.id)
+        self._pending_upserts[tracked_file.id] = tracked_file
+        self._request_flush_if_full()
+
+    def record_remove(self, file_id: str) -> None:
+        self._pending_upserts.pop(file_id, None)
+        self._pending_removes.add(file_id)
+        self._request_flush_if_full()
+
+    async def start(self) -> None:
+        if self._writer_task is None:
+            self._writer_task = asyncio.create_task(self._writer_loop())
+            logging.info(f"{type(self).__name__} writer started")
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending_upserts and not self._pending_removes:
+                return
+
+            upserts, self._pending_upserts = self._pending_upserts, {}
+            removes, self._pending_removes = self._pending_removes, set()
+
+            # Serialize on the event loop so the snapshot is consistent with memory.
+            now = time.time()
+            rows: List[StateRow] = [
+                (
+                    tracked_file.id,
+                    tracked_file.file_path,
+                    tracked_file.status.value,
+                    tracked_file.model_dump_json(),
+                    now,
+                )
+                for tracked_file in upserts.values()
+            ]
+            try:
+                await self._run(self._write_batch_sync, rows, list(removes))
+            except BaseException:
+                self._requeue(upserts, removes)
+                raise
+            logging.debug(
+                f"StateStore flush: {len(rows)} upserts, {len(removes)} removes"
+            )
+
+    async def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._writer_task:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        try:
+            await self.flush()
+        finally:
+            await self._run(self._close_sync)
+            self._executor.shutdown(wait=True)
+            logging.info(f"{type(self).__name__} closed")
+
+    def _requeue(self, upserts: Dict[str, TrackedFile], removes: Set[str]) -> None:
+        """Put a batch that failed to persist back for the next flush; newer changes win."""
+        for file_id, tracked_file in upserts.items():
+            if file_id not in self._pending_upserts and file_id not in self._pending_removes:
+                self._pending_upserts[file_id] = tracked_file
+        for file_id in removes:
+            if file_id not in self._pending_upserts:
+                self._pending_removes.add(file_id)
+
+    def _request_flush_if_full(self) -> None:
+        pending = len(self._pending_upserts) + len(self._pending_removes)
+        if pending >= self._flush_batch_size:
+            self._flush_requested.set()
+
+    async def _writer_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self._flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+                await self._after_flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"StateStore flush failed: {e}")
+
+    async def _after_flush(self) -> None:
+        """Hook for backend maintenance between flushes (e.g. compaction)."""
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
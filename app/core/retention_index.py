@@ -0,0 +1,70 @@
+"""
+Retention Index - tracked files ordered by the age that retention is judged by.
+"""
+
+import heapq
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.models import TrackedFile
+
+
+def retention_timestamp(tracked_file: TrackedFile) -> Optional[datetime]:
+    """The moment a file's retention period starts counting from."""
+    return (
+        tracked_file.completed_at
+        or tracked_file.failed_at
+        or tracked_file.discovered_at
+    )
+
+
+# This class is responsible solely for ordering tracked files by retention age, adhering to SRP.
+class RetentionIndex:
+    """
+    Min-heap of (retention timestamp, file id). A changed or removed entry only
+    updates the id -> timestamp map; its old heap entry is skipped when it
+    surfaces, and the heap is rebuilt once stale entries dominate. Popping the
+    expired entries touches only those entries, not the whole history.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[datetime, str]] = []
+        self._timestamps: Dict[str, datetime] = {}
+
+    def update(self, file_id: str, timestamp: Optional[datetime]) -> None:
+        if timestamp is None:
+            self.discard(file_id)
+            return
+        if self._timestamps.get(file_id) == timestamp:
+            return
+        self._timestamps[file_id] = timestamp
+        heapq.heappush(self._heap, (timestamp, file_id))
+        self._maybe_compact()
+
+    def discard(self, file_id: str) -> None:
+        if self._timestamps.pop(file_id, None) is not None:
+            self._maybe_compact()
+
+    def pop_expired(self, cutoff: datetime) -> List[str]:
+        """Remove and return the ids whose timestamp is older than `cutoff`."""
+        expired: List[str] = []
+        while self._heap and self._heap[0][0] < cutoff:
+            timestamp, file_id = heapq.heappop(self._heap)
+            if self._timestamps.get(file_id) == timestamp:
+                del self._timestamps[file_id]
+                expired.append(file_id)
+        return expired
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._timestamps.clear()
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._timestamps) + 64:
+            self._heap = [
+                (timestamp, file_id) for file_id, timestamp in self._timestamps.items()
+            ]
+            heapq.heapify(self._heap)
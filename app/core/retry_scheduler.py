@@ -0,0 +1,110 @@
+"""
+Retry Scheduler - one timer task for every pending retry.
+
+Deadlines live in a min-heap keyed by due time. Cancelling only forgets the
+key (O(1)); the stale heap entry is skipped when it surfaces, and the heap is
+rebuilt once stale entries outnumber live ones. A single background task
+sleeps until the earliest deadline, pops everything that is due and hands the
+whole batch to the callback.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+DueCallback = Callable[[List[str]], Awaitable[None]]
+
+
+# This class is responsible solely for waking up due retries, adhering to SRP.
+class RetryScheduler:
+    def __init__(self, on_due: DueCallback):
+        self._on_due = on_due
+        self._heap: List[Tuple[float, int, str]] = []
+        self._deadlines: Dict[str, Tuple[float, int]] = {}
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def schedule(self, key: str, delay_seconds: float) -> None:
+        """Arm (or re-arm) `key` to fire after `delay_seconds`. O(log n)."""
+        deadline = asyncio.get_running_loop().time() + max(0.0, delay_seconds)
+        sequence = next(self._sequence)
+        self._deadlines[key] = (deadline, sequence)
+        heapq.heappush(self._heap, (deadline, sequence, key))
+        if self._heap[0][1] == sequence:
+            self._wakeup.set()  # New earliest deadline - re-arm the sleeper
+        self._ensure_running()
+
+    def cancel(self, key: str) -> bool:
+        """Forget `key`. Its heap entry is discarded lazily. O(1) amortised."""
+        if self._deadlines.pop(key, None) is None:
+            return False
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._compact()
+        return True
+
+    def is_scheduled(self, key: str) -> bool:
+        return key in self._deadlines
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def pop_due(self, now: float) -> List[str]:
+        """Remove and return every live key whose deadline is at or before `now`."""
+        due: List[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, sequence, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) == (deadline, sequence):
+                del self._deadlines[key]
+                due.append(key)
+        return due
+
+    async def stop(self) -> None:
+        """Stop the timer task. Pending deadlines are kept but no longer fire."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def _next_deadline(self) -> Optional[float]:
+        while self._heap:
+            deadline, sequence, key = self._heap[0]
+            if self._deadlines.get(key) == (deadline, sequence):
+                return deadline
+            heapq.heappop(self._heap)
+        return None
+
+    def _compact(self) -> None:
+        self._heap = [
+            (deadline, sequence, key)
+            for key, (deadline, sequence) in self._deadlines.items()
+        ]
+        heapq.heapify(self._heap)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._wakeup.clear()
+            deadline = self._next_deadline()
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            due = self.pop_due(loop.time())
+            if not due:
+                continue
+            try:
+                await self._on_due(due)
+            except Exception as e:
+                logging.error(f"Error executing {len(due)} due retries: {e}")
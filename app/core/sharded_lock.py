@@ -0,0 +1,54 @@
+"""
+Sharded Lock - a fixed pool of asyncio locks selected by key hash.
+"""
+
+import asyncio
+import zlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, List
+
+
+# This class is responsible solely for mapping keys to a bounded set of locks, adhering to SRP.
+class ShardedLock:
+    """
+    Work on different keys proceeds independently while work on the same key is
+    serialised. for_keys() holds the shards of a batch and exclusive() takes every
+    shard, for the rare operation that spans all keys.
+    """
+
+    def __init__(self, shard_count: int = 64):
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(shard_count)]
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._locks)
+
+    def for_key(self, key: str) -> asyncio.Lock:
+        return self._locks[self._shard_index(key)]
+
+    def for_keys(self, keys: Iterable[str]):
+        """Hold the shards of several keys at once (each shard taken once)."""
+        indexes = sorted({self._shard_index(key) for key in keys})
+        return self._hold([self._locks[index] for index in indexes])
+
+    def exclusive(self):
+        return self._hold(self._locks)
+
+    @asynccontextmanager
+    async def _hold(self, locks: List[asyncio.Lock]) -> AsyncIterator[None]:
+        # Always acquired in shard order, so overlapping holders cannot deadlock.
+        acquired: List[asyncio.Lock] = []
+        try:
+            for lock in locks:
+                await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    def _shard_index(self, key: str) -> int:
+        # crc32 rather than hash() so the shard is stable across processes.
+        return zlib.crc32(key.encode()) % len(self._locks)
@@ -0,0 +1,69 @@
+"""
+Transfer Progress - volatile per-transfer counters, kept outside TrackedFile.
+
+Copy loops bump these counters after every chunk with plain attribute writes
+(no lock, no validation, no repository round-trip). A sampler reads them at a
+fixed rate and pushes the values to TrackedFile and the UI.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+
+# This class is responsible solely for holding the live counters of one transfer, adhering to SRP.
+class TransferProgress:
+    __slots__ = (
+        "file_id",
+        "bytes_copied",
+        "total_bytes",
+        "start_bytes",
+        "started_at",
+        "sampled_bytes",
+    )
+
+    def __init__(self, file_id: str, total_bytes: int = 0, start_bytes: int = 0):
+        self.file_id = file_id
+        self.bytes_copied = start_bytes
+        self.total_bytes = total_bytes
+        self.start_bytes = start_bytes
+        self.started_at = time.monotonic()
+        self.sampled_bytes = -1  # Last value the sampler published
+
+    @property
+    def copy_progress(self) -> float:
+        if self.total_bytes <= 0:
+            return 0.0
+        return min(100.0, (self.bytes_copied / self.total_bytes) * 100.0)
+
+    @property
+    def copy_speed_mbps(self) -> float:
+        """Average speed of this transfer (bytes resumed from are not counted)."""
+        elapsed = time.monotonic() - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return (self.bytes_copied - self.start_bytes) / elapsed / (1024 * 1024)
+
+
+# This class is responsible solely for tracking which transfers are in flight, adhering to SRP.
+class TransferProgressStore:
+    def __init__(self) -> None:
+        self._transfers: Dict[str, TransferProgress] = {}
+
+    def start(
+        self, file_id: str, total_bytes: int = 0, start_bytes: int = 0
+    ) -> TransferProgress:
+        progress = TransferProgress(file_id, total_bytes, start_bytes)
+        self._transfers[file_id] = progress
+        return progress
+
+    def get(self, file_id: str) -> Optional[TransferProgress]:
+        return self._transfers.get(file_id)
+
+    def finish(self, file_id: str) -> Optional[TransferProgress]:
+        return self._transfers.pop(file_id, None)
+
+    def active(self) -> List[TransferProgress]:
+        return list(self._transfers.values())
+
+    def __len__(self) -> int:
+        return len(self._transfers)
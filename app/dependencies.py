@@ -6,26 +6,33 @@ Sikrer singleton pattern og proper dependency management.
 """
 
 import asyncio
+import logging
 from functools import lru_cache
 from typing import Dict, Any, Optional
 
 from app.core.events.event_bus import DomainEventBus
 from app.core.file_repository import FileRepository
+from app.core.persistence import JournalStateStore, SqliteStateStore, StateStore
+from app.core.transfer_progress import TransferProgressStore
 
 from .config import Settings
 from .services.consumer.job_error_classifier import JobErrorClassifier
 from .services.consumer.job_processor import JobProcessor
 from .services.copy.file_copy_executor import FileCopyExecutor
-from .services.copy_strategies import GrowingFileCopyStrategy
+from .services.copy_strategies import GrowingFileCopyStrategy, create_copy_strategy
 from .services.file_copier import FileCopierService
 from .services.job_queue import JobQueueService
 from .services.network_mount import NetworkMountService
 from .domains.file_discovery.file_scanner_service import FileScannerService
+from .services.scanner.file_matcher import FileNameMatcher
+from .services.scanner.observation_stage import FileObservationStage
+from .services.scanner.tree_walker import SourceTreeWalker
 from .services.space_checker import SpaceChecker
 from .services.space_retry_manager import SpaceRetryManager
 from .services.state_manager import StateManager
 from .services.storage_checker import StorageChecker
 from .services.storage_monitor import StorageMonitorService
+from .services.transfer_progress_sampler import TransferProgressSampler
 from .services.websocket_manager import WebSocketManager
 
 
@@ -56,13 +63,43 @@ def get_query_bus() -> QueryBus:
 
 def get_event_bus() -> "DomainEventBus":
     if "event_bus" not in _singletons:
-        _singletons["event_bus"] = DomainEventBus()
+        _singletons["event_bus"] = DomainEventBus(
+            coalesce_interval_seconds=get_settings().event_coalesce_interval_seconds
+        )
     return _singletons["event_bus"]
 
 
+def get_state_store() -> Optional[StateStore]:
+    if "state_store" not in _singletons:
+        settings = get_settings()
+        backend = settings.state_backend.lower()
+        if backend == "sqlite":
+            _singletons["state_store"] = SqliteStateStore(
+                db_path=settings.state_db_path,
+                flush_interval_seconds=settings.state_flush_interval_seconds,
+                flush_batch_size=settings.state_flush_batch_size,
+            )
+        elif backend == "journal":
+            _singletons["state_store"] = JournalStateStore(
+                journal_dir=settings.state_journal_dir,
+                compact_threshold_mb=settings.state_journal_compact_mb,
+                flush_interval_seconds=settings.state_flush_interval_seconds,
+                flush_batch_size=settings.state_flush_batch_size,
+            )
+        else:
+            if backend != "memory":
+                logging.warning(
+                    f"Unknown state_backend '{settings.state_backend}' - using memory"
+                )
+            _singletons["state_store"] = None
+    return _singletons["state_store"]
+
+
 def get_file_repository() -> FileRepository:
     if "file_repository" not in _singletons:
-        _singletons["file_repository"] = FileRepository()
+        _singletons["file_repository"] = FileRepository(
+            state_store=get_state_store()
+        )
     return _singletons["file_repository"]
 
 
@@ -80,11 +117,30 @@ def get_state_manager() -> StateManager:
     return _singletons["state_manager"]
 
 
+def get_observation_stage() -> FileObservationStage:
+    if "observation_stage" not in _singletons:
+        settings = get_settings()
+        tree_walker = SourceTreeWalker(
+            full_rescan_interval_seconds=settings.scanner_full_rescan_interval_seconds,
+            max_workers=settings.scanner_walk_workers,
+            directory_timeout_seconds=settings.scanner_directory_timeout_seconds,
+            matcher=FileNameMatcher.from_patterns(
+                settings.scanner_include_patterns, settings.scanner_exclude_patterns
+            ),
+        )
+        # The scanner's walk and the growing-file monitor share this stage
+        _singletons["observation_stage"] = FileObservationStage(
+            tree_walker, max_age_seconds=settings.growing_file_poll_interval_seconds
+        )
+    return _singletons["observation_stage"]
+
+
 def get_file_scanner() -> FileScannerService:
     if "file_scanner" not in _singletons:
         _singletons["file_scanner"] = FileScannerService(
             settings=get_settings(),
             state_manager=get_state_manager(),
+            observation_stage=get_observation_stage(),
             storage_monitor=get_storage_monitor(),
             event_bus=get_event_bus()
         )
@@ -150,7 +206,13 @@ def get_websocket_manager() -> WebSocketManager:
         state_manager = get_state_manager()
         event_bus = get_event_bus()
         # Note: storage_monitor will be set later to avoid circular dependency
-        ws_manager = WebSocketManager(state_manager, event_bus=event_bus)
+        ws_manager = WebSocketManager(
+            state_manager,
+            event_bus=event_bus,
+            history_page_size=get_settings().history_page_size,
+            event_queue_size=get_settings().websocket_event_queue_size,
+            change_buffer_size=get_settings().websocket_change_buffer_size,
+        )
 
         # Scanner status will be initialized later to avoid circular dependency
         _singletons["websocket_manager"] = ws_manager
@@ -217,14 +279,36 @@ def get_file_copy_executor() -> FileCopyExecutor:
     return _singletons["file_copy_executor"]
 
 
+def get_transfer_progress_store() -> TransferProgressStore:
+    if "transfer_progress_store" not in _singletons:
+        _singletons["transfer_progress_store"] = TransferProgressStore()
+    return _singletons["transfer_progress_store"]
+
+
+def get_transfer_progress_sampler() -> TransferProgressSampler:
+    if "transfer_progress_sampler" not in _singletons:
+        settings = get_settings()
+        _singletons["transfer_progress_sampler"] = TransferProgressSampler(
+            get_transfer_progress_store(),
+            get_state_manager(),
+            event_bus=get_event_bus(),
+            interval_seconds=settings.progress_sample_interval_seconds,
+        )
+    return _singletons["transfer_progress_sampler"]
+
+
 def get_copy_strategy() -> GrowingFileCopyStrategy:
     if "copy_strategy" not in _singletons:
         settings = get_settings()
         state_manager = get_state_manager()
         file_copy_executor = get_file_copy_executor()
         event_bus = get_event_bus()
-        _singletons["copy_strategy"] = GrowingFileCopyStrategy(
-            settings, state_manager, file_copy_executor, event_bus=event_bus
+        _singletons["copy_strategy"] = create_copy_strategy(
+            settings,
+            state_manager,
+            file_copy_executor,
+            event_bus=event_bus,
+            progress_store=get_transfer_progress_store(),
         )
     return _singletons["copy_strategy"]
 
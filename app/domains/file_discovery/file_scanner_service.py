@@ -7,6 +7,7 @@ from app.core.events.scanner_events import ScannerStatusChangedEvent
 from app.services.state_manager import StateManager
 from ...services.scanner.domain_objects import ScanConfiguration
 from ...services.scanner.file_scanner import FileScanner
+from ...services.scanner.observation_stage import FileObservationStage
 
 if TYPE_CHECKING:
     from app.services.storage_monitor import StorageMonitorService
@@ -17,6 +18,7 @@ class FileScannerService:
         self,
         settings: Settings,
         state_manager: StateManager,
+        observation_stage: FileObservationStage,
         storage_monitor: "StorageMonitorService" = None,
         event_bus: Optional[DomainEventBus] = None,
     ):
@@ -27,6 +29,11 @@ class FileScannerService:
             polling_interval_seconds=settings.polling_interval_seconds,
             file_stable_time_seconds=settings.file_stable_time_seconds,
             keep_files_hours=settings.keep_files_hours,
+            retention_interval_seconds=settings.retention_interval_seconds,
+            include_patterns=settings.scanner_include_patterns,
+            exclude_patterns=settings.scanner_exclude_patterns,
+            inotify_enabled=settings.scanner_inotify_enabled,
+            inotify_close_settle_seconds=settings.inotify_close_settle_seconds,
             growing_file_poll_interval_seconds=settings.growing_file_poll_interval_seconds,
             growing_file_safety_margin_mb=settings.growing_file_safety_margin_mb,
             growing_file_growth_timeout_seconds=settings.growing_file_growth_timeout_seconds,
@@ -34,7 +41,12 @@ class FileScannerService:
         )
 
         self.orchestrator = FileScanner(
-            config, state_manager, storage_monitor, settings, event_bus=self._event_bus
+            config,
+            state_manager,
+            observation_stage,
+            storage_monitor,
+            settings,
+            event_bus=self._event_bus,
         )
 
         logging.info("FileScannerService initialized with refactored architecture")
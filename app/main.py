@@ -7,7 +7,7 @@ import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 
-from .api import websockets, storage, logfiles, uiactions
+from .api import websockets, storage, logfiles, uiactions, history, metrics
 
 from .domains.directory_browsing import api as directory
 
@@ -16,6 +16,10 @@ from .dependencies import (
     get_file_scanner,
     get_job_queue_service,
     get_file_copier,
+    get_event_bus,
+    get_file_repository,
+    get_state_manager,
+    get_transfer_progress_sampler,
     get_websocket_manager,
     get_storage_monitor,
     get_storage_checker,
@@ -64,6 +68,13 @@ async def lifespan(app: FastAPI):
     logging.info("File Transfer Agent starting up...")
     logging.info(f"Source directory: {settings.source_directory}")
     logging.info(f"Destination directory: {settings.destination_directory}")
+
+    # Warm restart: reload persisted state before any service starts working on it
+    state_manager = get_state_manager()
+    try:
+        await state_manager.restore_persisted_state()
+    except Exception as e:
+        logging.error(f"Failed to restore persisted state (starting empty): {e}")
     logging.info("StateManager klar til brug")
 
     # Cleanup old test files at startup
@@ -89,6 +100,10 @@ async def lifespan(app: FastAPI):
     _background_tasks.append(queue_task)
     logging.info("JobQueueService producer startet som background task")
 
+    # Start live copy progress sampling (fixed rate, decoupled from chunk writes)
+    progress_sampler = get_transfer_progress_sampler()
+    await progress_sampler.start_sampling()
+
     # Start FileCopierService workers som background task
     file_copier = get_file_copier()
     copier_task = asyncio.create_task(file_copier.start_workers())
@@ -114,7 +129,11 @@ async def lifespan(app: FastAPI):
     await file_scanner.stop_scanning()
     job_queue_service.stop_producer()
     await file_copier.stop_workers()
+    await progress_sampler.stop_sampling()
     await storage_monitor.stop_monitoring()
+    await state_manager.stop_retry_scheduler()
+    await get_event_bus().close()
+    await get_file_repository().close()
 
     # Cancel alle background tasks
     for task in _background_tasks:
@@ -185,6 +204,8 @@ app.include_router(uiactions.router)
 app.include_router(websockets.router)
 app.include_router(storage.router)
 app.include_router(logfiles.router)
+app.include_router(history.router)
+app.include_router(metrics.router)
 app.include_router(directory.directory_router)
 app.include_router(views.router)
 
@@ -176,6 +176,22 @@ class TrackedFile(BaseModel):
         default=None, description="Active retry information if file has scheduled retry"
     )
 
+    # Content verification - digest of the copied bytes for downstream ingest
+    content_hash: Optional[str] = Field(
+        default=None,
+        description="Checksum af de kopierede bytes (hex), sat ved hash-verifikation",
+    )
+
+    content_hash_algorithm: Optional[str] = Field(
+        default=None, description="Algoritme for content_hash (blake2b eller xxh3_128)"
+    )
+
+    # Resume tracking - survives FAILED and restarts via the state store
+    copy_checkpoint: Optional["CopyCheckpoint"] = Field(
+        default=None,
+        description="Resume checkpoint for en afbrudt kopiering (destination og bytes)",
+    )
+
     model_config = ConfigDict(
         # Eksempel data til dokumentation
         json_schema_extra={
@@ -434,3 +450,30 @@ class RetryInfo(BaseModel):
     # Note: asyncio.Task cannot be serialized in Pydantic, so we handle it separately in StateManager
 
     model_config = ConfigDict()
+
+
+class CopyCheckpoint(BaseModel):
+    """
+    Where an interrupted copy of a file was going and how far it got.
+
+    Stored on TrackedFile so it is persisted with it. A retry only trusts the
+    destination prefix after ResumeVerifier has matched it against the source.
+    """
+
+    destination_path: str = Field(..., description="Destination file being written")
+    bytes_copied: int = Field(
+        default=0, ge=0, description="Bytes written when the checkpoint was recorded"
+    )
+    updated_at: datetime = Field(
+        default_factory=datetime.now, description="When the checkpoint was recorded"
+    )
+
+
+class FrozenTrackedFile(TrackedFile):
+    """
+    A finished file as read from history - a copy, so it is read-only and a
+    change raises instead of being silently lost. Writers ask the repository
+    for an editable copy and save it back.
+    """
+
+    model_config = ConfigDict(frozen=True)
@@ -118,12 +118,17 @@ class JobCopyExecutor:
         self, prepared_file: PreparedFile, reason: str, error: Exception
     ) -> None:
         """Handle errors that should result in immediate failure."""
+        # With resume the copied bytes are kept; the retry continues from them
+        progress_reset = (
+            {}
+            if self.settings.enable_secure_resume
+            else {"copy_progress": 0.0, "bytes_copied": 0}
+        )
         await self.state_manager.update_file_status_by_id(
             prepared_file.tracked_file.id,
             FileStatus.FAILED,
-            copy_progress=0.0,
-            bytes_copied=0,
             error_message=f"Failed: {reason}",
+            **progress_reset,
         )
 
         file_name = Path(prepared_file.tracked_file.file_path).name
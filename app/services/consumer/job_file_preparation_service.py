@@ -6,6 +6,8 @@ import logging
 from pathlib import Path
 from typing import Optional
 
+import aiofiles.os
+
 from app.config import Settings
 from app.models import FileStatus, TrackedFile
 from app.services.consumer.job_models import PreparedFile, QueueJob
@@ -41,7 +43,9 @@ class JobFilePreparationService:
         strategy_name = self.copy_strategy.__class__.__name__
 
         initial_status = self._determine_initial_status(tracked_file)
-        destination_path = self._calculate_destination_path(file_path)
+        destination_path = await self._resume_destination_path(tracked_file)
+        if destination_path is None:
+            destination_path = self._calculate_destination_path(file_path)
 
         return PreparedFile(
             tracked_file=tracked_file,
@@ -69,6 +73,32 @@ class JobFilePreparationService:
             logging.info(f"⚡ File marked for STATIC COPY: {tracked_file.file_path}")
             return FileStatus.COPYING  # Static files go straight to copying
 
+    async def _resume_destination_path(
+        self, tracked_file: Optional[TrackedFile]
+    ) -> Optional[Path]:
+        """
+        The partial destination of an interrupted copy, so a retry writes to the
+        same file instead of a new conflict-free name. The checkpoint is attached
+        to the tracked file for the copy strategy to verify and resume from.
+        """
+        if not tracked_file or not self.settings.enable_secure_resume:
+            return None
+
+        checkpoint = await self.state_manager.get_resume_checkpoint(tracked_file)
+        if checkpoint is None or not await aiofiles.os.path.exists(
+            checkpoint.destination_path
+        ):
+            return None
+
+        if tracked_file.copy_checkpoint is None:
+            await self.state_manager.update_many(
+                {tracked_file.id: {"copy_checkpoint": checkpoint}}
+            )
+        logging.info(
+            f"🔁 Resume target for {tracked_file.file_path}: {checkpoint.destination_path}"
+        )
+        return Path(checkpoint.destination_path)
+
     def _calculate_destination_path(self, file_path: str) -> Path:
         """Calculate destination path using template engine if enabled."""
         source = Path(file_path)
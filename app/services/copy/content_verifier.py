@@ -0,0 +1,103 @@
+"""
+Content Verifier - decides whether a copied destination holds the source's bytes.
+
+The `verification_mode` setting picks how far a copy is checked beyond size:
+"size" hashes nothing, "source_hash" streams a ContentHasher over every copied
+chunk and requires it to cover the whole destination, and "readback" also
+re-reads the destination on a small thread pool, kept apart from the copy
+threads, and compares digests. A destination that fails the read-back is
+deleted and its checkpoint cleared, so a retry cannot resume from it.
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import aiofiles
+import aiofiles.os
+
+from app.config import Settings
+from app.models import TrackedFile
+from app.services.copy.content_hasher import ContentHasher, file_digest
+from app.services.state_manager import StateManager
+
+SIZE_ONLY = "size"
+SOURCE_HASH = "source_hash"
+READBACK = "readback"
+VERIFICATION_MODES = (SIZE_ONLY, SOURCE_HASH, READBACK)
+
+
+# This class is responsible solely for checking copied content, adhering to SRP.
+class ContentVerifier:
+    def __init__(self, settings: Settings, state_manager: StateManager) -> None:
+        self.settings = settings
+        self.state_manager = state_manager
+        self.mode = settings.verification_mode
+        if self.mode not in VERIFICATION_MODES:
+            raise ValueError(
+                f"Unknown verification_mode '{self.mode}', "
+                f"expected one of: {', '.join(VERIFICATION_MODES)}"
+            )
+        self._readback_executor: Optional[ThreadPoolExecutor] = None
+
+    def create_hasher(self) -> Optional[ContentHasher]:
+        """Hasher for the copy loop to feed, or None when only sizes are checked."""
+        if self.mode == SIZE_ONLY:
+            return None
+        return ContentHasher(self.settings.checksum_algorithm)
+
+    async def verify(
+        self, dest_path: str, tracked_file: TrackedFile, hasher: Optional[ContentHasher]
+    ) -> bool:
+        """
+        Check the streamed source hash covers the whole destination and, in
+        readback mode, that re-reading the destination gives the same digest.
+        """
+        if hasher is None:
+            return True
+
+        dest_size = (await aiofiles.os.stat(dest_path)).st_size
+        if hasher.position != dest_size:
+            logging.error(
+                f"Checksum covers {hasher.position} of {dest_size} bytes: "
+                f"{os.path.basename(dest_path)}"
+            )
+            return False
+
+        if self.mode == READBACK and not await self._readback_matches(
+            dest_path, tracked_file, hasher
+        ):
+            return False
+
+        logging.info(
+            f"🔐 {hasher.algorithm} {hasher.hexdigest()[:16]}... "
+            f"({self.mode}): {os.path.basename(dest_path)}"
+        )
+        return True
+
+    async def _readback_matches(
+        self, dest_path: str, tracked_file: TrackedFile, hasher: ContentHasher
+    ) -> bool:
+        if self._readback_executor is None:
+            self._readback_executor = ThreadPoolExecutor(
+                max_workers=self.settings.readback_verify_workers,
+                thread_name_prefix="readback-verify",
+            )
+        loop = asyncio.get_running_loop()
+        dest_digest = await loop.run_in_executor(
+            self._readback_executor, file_digest, dest_path, hasher.algorithm
+        )
+        if dest_digest == hasher.hexdigest():
+            return True
+
+        logging.error(
+            f"❌ CHECKSUM MISMATCH: {os.path.basename(dest_path)} "
+            f"source={hasher.hexdigest()[:16]}... destination={dest_digest[:16]}..."
+        )
+        await aiofiles.os.remove(dest_path)
+        await self.state_manager.update_many(
+            {tracked_file.id: {"copy_checkpoint": None}}
+        )
+        return False
@@ -0,0 +1,108 @@
+"""
+Copy Resume - continues a growing-file copy from a checkpoint.
+
+With `enable_secure_resume` every copy records a CopyCheckpoint (destination
+and bytes written) on its TrackedFile when it starts and when it stops short.
+The next attempt at the same destination asks the ResumeVerifier whether that
+prefix still matches the source, reopens the destination without truncating
+it, drops any unverified tail and appends from there. The kept prefix is not
+streamed again, so a content hasher is fed from the source before the copy.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from typing import AsyncIterator, Optional
+
+import aiofiles
+import aiofiles.os
+
+from app.config import Settings
+from app.models import CopyCheckpoint, TrackedFile
+from app.services.copy.content_hasher import ContentHasher
+from app.services.copy.resume_verifier import ResumeVerifier
+from app.services.state_manager import StateManager
+
+
+# This class is responsible solely for resuming copies from checkpoints, adhering to SRP.
+class CopyResumer:
+    def __init__(self, settings: Settings, state_manager: StateManager) -> None:
+        self.settings = settings
+        self.state_manager = state_manager
+        self._verifier = ResumeVerifier(settings.resume_verify_window_mb * 1024 * 1024)
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.enable_secure_resume
+
+    async def start(
+        self,
+        source_path: str,
+        dest_path: str,
+        tracked_file: TrackedFile,
+        hasher: Optional[ContentHasher] = None,
+    ) -> int:
+        """
+        Offset the copy continues from (0 for a fresh copy), recorded as the
+        file's checkpoint, with the kept prefix already fed to `hasher`.
+        """
+        if not self.enabled:
+            return 0
+
+        offset = await self._resume_offset(source_path, dest_path, tracked_file)
+        await self.record_checkpoint(tracked_file.id, dest_path, offset)
+        if hasher is not None and offset:
+            await asyncio.to_thread(hasher.update_from_file, source_path, offset)
+        return offset
+
+    @contextlib.asynccontextmanager
+    async def open_destination(self, dest_path: str, offset: int) -> AsyncIterator:
+        """Destination opened for writing at `offset`, anything past it dropped."""
+        async with aiofiles.open(dest_path, "r+b" if offset else "wb") as dst:
+            if offset:
+                await dst.truncate(offset)
+                await dst.seek(offset)
+            yield dst
+
+    async def record_checkpoint(
+        self, file_id: str, dest_path: str, bytes_copied: int
+    ) -> None:
+        if not self.enabled:
+            return
+        await self.state_manager.update_many(
+            {
+                file_id: {
+                    "copy_checkpoint": CopyCheckpoint(
+                        destination_path=dest_path, bytes_copied=bytes_copied
+                    )
+                }
+            }
+        )
+
+    async def _resume_offset(
+        self, source_path: str, dest_path: str, tracked_file: TrackedFile
+    ) -> int:
+        """
+        Offset to continue from when this file's checkpoint points at dest_path
+        and the destination prefix still matches the source, otherwise 0.
+        """
+        checkpoint = tracked_file.copy_checkpoint
+        if checkpoint is None or checkpoint.destination_path != dest_path:
+            return 0
+        if not await aiofiles.os.path.exists(dest_path):
+            return 0
+
+        offset = await self._verifier.find_resume_offset(
+            source_path, dest_path, [checkpoint.bytes_copied]
+        )
+        if offset:
+            logging.info(
+                f"🔁 RESUME: {os.path.basename(source_path)} continuing from "
+                f"{offset / (1024 * 1024):.1f}MB (verified prefix)"
+            )
+        else:
+            logging.info(
+                f"Resume not possible for {os.path.basename(source_path)} - copying from start"
+            )
+        return offset
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import datetime
@@ -9,6 +10,11 @@ import aiofiles
 from app.config import Settings
 from app.utils.file_operations import validate_file_sizes, create_temp_file_path
 from app.utils.progress_utils import should_report_progress_with_bytes
+from app.services.copy.kernel_copy import (
+    KernelCopier,
+    KernelCopyUnsupported,
+    file_descriptor,
+)
 from app.services.copy.network_error_detector import NetworkErrorDetector, NetworkError
 
 
@@ -101,6 +107,8 @@ class FileCopyExecutor:
         self.progress_update_interval = getattr(
             settings, "copy_progress_update_interval", 1
         )
+        self.use_kernel_copy = settings.use_kernel_copy
+        self.kernel_range_bytes = settings.kernel_copy_range_mb * 1024 * 1024
 
         logging.debug(
             f"FileCopyExecutor initialized with chunk size: {settings.chunk_size_kb}KB"
@@ -278,12 +286,48 @@ class FileCopyExecutor:
             check_interval_bytes=1024 * 1024,  # Check every 1MB
         )
 
+        def report_progress(bytes_copied: int) -> None:
+            nonlocal last_progress_reported
+            if not progress_callback:
+                return
+            elapsed = (datetime.now() - start_time).total_seconds()
+
+            should_update, current_percent = should_report_progress_with_bytes(
+                bytes_copied,
+                file_size,
+                last_progress_reported,
+                self.progress_update_interval,
+            )
+
+            if should_update:
+                current_rate = bytes_copied / elapsed if elapsed > 0 else 0
+                progress = CopyProgress(
+                    bytes_copied=bytes_copied,
+                    total_bytes=file_size,
+                    elapsed_seconds=elapsed,
+                    current_rate_bytes_per_sec=current_rate,
+                )
+
+                try:
+                    progress_callback(progress)
+                    last_progress_reported = current_percent
+                except Exception as e:
+                    logging.warning(f"Progress callback error: {e}")
+
         try:
             async with (
                 aiofiles.open(source, "rb") as src,
                 aiofiles.open(dest, "wb") as dst,
             ):
-                while True:
+                kernel_copied = None
+                if self.use_kernel_copy:
+                    kernel_copied = await self._kernel_copy(
+                        src, dst, network_detector, report_progress
+                    )
+                if kernel_copied is not None:
+                    bytes_copied = kernel_copied
+
+                while kernel_copied is None:
                     chunk = await src.read(chunk_size)
                     if not chunk:
                         break
@@ -307,33 +351,7 @@ class FileCopyExecutor:
                         logging.error(f"Network connectivity lost during copy: {ne}")
                         raise ne
 
-                    if progress_callback:
-                        current_time = datetime.now()
-                        elapsed = (current_time - start_time).total_seconds()
-
-                        should_update, current_percent = (
-                            should_report_progress_with_bytes(
-                                bytes_copied,
-                                file_size,
-                                last_progress_reported,
-                                self.progress_update_interval,
-                            )
-                        )
-
-                        if should_update:
-                            current_rate = bytes_copied / elapsed if elapsed > 0 else 0
-                            progress = CopyProgress(
-                                bytes_copied=bytes_copied,
-                                total_bytes=file_size,
-                                elapsed_seconds=elapsed,
-                                current_rate_bytes_per_sec=current_rate,
-                            )
-
-                            try:
-                                progress_callback(progress)
-                                last_progress_reported = current_percent
-                            except Exception as e:
-                                logging.warning(f"Progress callback error: {e}")
+                    report_progress(bytes_copied)
 
             end_time = datetime.now()
             elapsed_seconds = (end_time - start_time).total_seconds()
@@ -363,6 +381,59 @@ class FileCopyExecutor:
                 error_message=str(e),
             )
 
+    async def _kernel_copy(
+        self,
+        src,
+        dst,
+        network_detector: NetworkErrorDetector,
+        report_progress: Callable[[int], None],
+    ) -> Optional[int]:
+        """
+        Copy the whole source with copy_file_range/sendfile on a worker thread,
+        one range at a time. Returns None before any byte is copied when the
+        kernel cannot copy between these files, so the caller's read/write loop
+        takes over.
+        """
+        src_fd = file_descriptor(src)
+        dst_fd = file_descriptor(dst)
+        copier = KernelCopier()
+        if src_fd is None or dst_fd is None or copier.method is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        bytes_copied = 0
+
+        while True:
+            try:
+                copied = await loop.run_in_executor(
+                    None,
+                    copier.copy_range,
+                    src_fd,
+                    dst_fd,
+                    bytes_copied,
+                    self.kernel_range_bytes,
+                )
+            except KernelCopyUnsupported:
+                return None
+            except OSError as write_error:
+                network_detector.check_write_error(write_error, "kernel copy range")
+                raise write_error
+
+            if copied == 0:
+                break
+            bytes_copied += copied
+
+            try:
+                await network_detector.check_destination_connectivity(bytes_copied)
+            except NetworkError as ne:
+                logging.error(f"Network connectivity lost during copy: {ne}")
+                raise ne
+
+            report_progress(bytes_copied)
+
+        logging.debug(f"Kernel copy via {copier.method}: {bytes_copied} bytes")
+        return bytes_copied
+
     async def verify_copy(self, source: Path, dest: Path) -> bool:
         """Verify that the file was copied correctly by comparing file sizes."""
         try:
@@ -392,6 +463,7 @@ class FileCopyExecutor:
         """Get information about the executor configuration."""
         return {
             "chunk_size_kb": self.settings.chunk_size_kb,
+            "use_kernel_copy": self.use_kernel_copy,
             "progress_update_interval": self.progress_update_interval,
             "use_temporary_file": self.settings.use_temporary_file,
             "default_strategy": "temp_file"
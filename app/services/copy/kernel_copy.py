@@ -0,0 +1,112 @@
+"""
+Kernel Copy - moves file bytes inside the kernel instead of through Python.
+
+The chunked copy loops read every chunk into a fresh `bytes` object on one
+aiofiles thread hop and write it back out on another. On Linux the same range
+can be handed to `os.copy_file_range` (which filesystems like NFS 4.2 and
+SMB3 can even turn into a server-side copy) or, where that is refused,
+`os.sendfile`: no user-space buffer, no allocation, one thread hop per range.
+
+A KernelCopier is used for one transfer. It starts with the best syscall the
+platform offers and steps down the first time the kernel rejects that call
+for this file pair. When neither works, KernelCopyUnsupported tells the
+caller to carry on with its normal read/write loop.
+"""
+
+import asyncio
+import errno
+import logging
+import os
+from typing import Any, Callable, Optional
+
+# errnos meaning "this syscall cannot do this file pair", not "the copy failed"
+_UNSUPPORTED_ERRNOS = frozenset(
+    {
+        errno.ENOSYS,
+        errno.EXDEV,
+        errno.EOPNOTSUPP,
+        errno.ENOTSUP,
+        errno.EINVAL,
+        errno.EBADF,
+    }
+)
+
+COPY_FILE_RANGE = "copy_file_range"
+SENDFILE = "sendfile"
+
+
+class KernelCopyUnsupported(Exception):
+    """Neither copy_file_range nor sendfile can copy between these two files."""
+
+
+def kernel_copy_methods() -> tuple:
+    """The kernel copy syscalls this platform offers, best first."""
+    methods = []
+    if hasattr(os, "copy_file_range"):
+        methods.append(COPY_FILE_RANGE)
+    if hasattr(os, "sendfile") and os.name == "posix":
+        methods.append(SENDFILE)
+    return tuple(methods)
+
+
+def file_descriptor(handle: Any) -> Optional[int]:
+    """The OS-level fd behind an (aiofiles or plain) file object, if it has one."""
+    fileno = getattr(handle, "fileno", None)
+    if fileno is None or asyncio.iscoroutinefunction(fileno):
+        return None
+    try:
+        fd = fileno()
+    except (OSError, ValueError):
+        return None
+    return fd if isinstance(fd, int) else None
+
+
+# This class is responsible solely for copying byte ranges with kernel-side syscalls, adhering to SRP.
+class KernelCopier:
+    def __init__(self) -> None:
+        self._methods = list(kernel_copy_methods())
+        # Steps down only before the first byte moves; after that an error is a real error
+        self._proven = False
+
+    @property
+    def method(self) -> Optional[str]:
+        return self._methods[0] if self._methods else None
+
+    def copy_range(
+        self,
+        src_fd: int,
+        dst_fd: int,
+        offset: int,
+        count: int,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> int:
+        """
+        Copy up to `count` bytes from `offset` in the source to the destination's
+        current position (which advances). Blocking; run it in a worker thread.
+        `should_stop` is checked between syscalls so a cancelled copy ends early.
+        Returns the number of bytes copied, 0 at end of source.
+        """
+        copied = 0
+        while copied < count and not (should_stop is not None and should_stop()):
+            step = self._copy_once(src_fd, dst_fd, offset + copied, count - copied)
+            if step == 0:
+                break
+            copied += step
+        return copied
+
+    def _copy_once(self, src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+        while self._methods:
+            method = self._methods[0]
+            try:
+                if method == COPY_FILE_RANGE:
+                    step = os.copy_file_range(src_fd, dst_fd, count, offset_src=offset)
+                else:
+                    step = os.sendfile(dst_fd, src_fd, offset, count)
+                self._proven = True
+                return step
+            except OSError as e:
+                if self._proven or e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                logging.debug(f"Kernel copy via {method} not possible here: {e}")
+                self._methods.pop(0)
+        raise KernelCopyUnsupported("No kernel copy syscall works for this file pair")
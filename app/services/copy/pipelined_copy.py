@@ -0,0 +1,110 @@
+"""
+Pipelined Copy - overlaps source reads with destination writes.
+
+The sequential loop reads a chunk, then writes it, so the source disk idles
+while an SMB write is in flight and the share idles while the next chunk is
+read. Here a reader task fills a small ring of preallocated buffers while the
+writer drains it; both hop to worker threads, so one read and one write are in
+flight at the same time and throughput approaches the slower of the two sides
+instead of their harmonic sum. The ring depth bounds how far the reader may run
+ahead, and with it the memory per transfer (depth x chunk size).
+"""
+
+import asyncio
+import contextlib
+from typing import Awaitable, Callable, Optional, Tuple
+
+_END = None
+
+
+# This class is responsible solely for moving a byte range through a ring of reusable buffers, adhering to SRP.
+class PipelinedRangeCopier:
+    def __init__(self, chunk_size: int, depth: int = 4) -> None:
+        self.chunk_size = chunk_size
+        self.depth = max(2, depth)
+        self._buffers = [bytearray(chunk_size) for _ in range(self.depth)]
+
+    async def copy_range(
+        self,
+        src,
+        dst,
+        start_bytes: int,
+        end_bytes: int,
+        on_chunk_written: Callable[[int], Awaitable[None]],
+        on_write_error: Optional[Callable[[Exception], None]] = None,
+        hasher=None,
+    ) -> int:
+        """
+        Copy [start_bytes, end_bytes) from `src` (positioned at start_bytes) to
+        `dst`. `on_chunk_written` gets the running byte position after every
+        write; `on_write_error` may translate a failed write before it is
+        re-raised. A `hasher` (ContentHasher) is fed each chunk in a worker
+        thread while that chunk is being written. Returns the final position,
+        short if the source ended early.
+        """
+        free: asyncio.Queue = asyncio.Queue()
+        filled: "asyncio.Queue[Optional[Tuple[bytearray, int]]]" = asyncio.Queue()
+        for buffer in self._buffers:
+            free.put_nowait(buffer)
+
+        reader = asyncio.create_task(
+            self._read_ahead(src, end_bytes - start_bytes, free, filled)
+        )
+        bytes_copied = start_bytes
+
+        try:
+            while True:
+                item = await filled.get()
+                if item is _END:
+                    break
+                buffer, length = item
+                chunk = memoryview(buffer)[:length]
+                hashing = (
+                    asyncio.ensure_future(asyncio.to_thread(hasher.update, chunk))
+                    if hasher is not None
+                    else None
+                )
+
+                try:
+                    await dst.write(chunk)
+                except Exception as write_error:
+                    if on_write_error is not None:
+                        on_write_error(write_error)
+                    raise write_error
+                finally:
+                    # The buffer goes back to the reader only once both are done
+                    if hashing is not None:
+                        await hashing
+
+                free.put_nowait(buffer)
+                bytes_copied += length
+                await on_chunk_written(bytes_copied)
+
+            # Surfaces read errors; the reader always ends the stream first
+            await reader
+        finally:
+            if not reader.done():
+                reader.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await reader
+
+        return bytes_copied
+
+    async def _read_ahead(
+        self,
+        src,
+        bytes_to_copy: int,
+        free: asyncio.Queue,
+        filled: asyncio.Queue,
+    ) -> None:
+        try:
+            while bytes_to_copy > 0:
+                buffer = await free.get()
+                read_size = min(self.chunk_size, bytes_to_copy)
+                length = await src.readinto(memoryview(buffer)[:read_size])
+                if not length:
+                    break
+                bytes_to_copy -= length
+                filled.put_nowait((buffer, length))
+        finally:
+            filled.put_nowait(_END)
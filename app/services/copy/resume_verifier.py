@@ -0,0 +1,77 @@
+"""
+Resume Verifier - decides how much of a partial destination can be kept.
+
+A retried copy may continue from the end of what is already on the destination
+only if those bytes really are the source's bytes. Re-reading a 100 GB prefix
+would cost as much as copying it again, so the check is size plus a hash of the
+last `window_bytes` before the resume offset, read from both sides. A write
+that died mid-chunk, a truncated file or a different recording with the same
+name all fail that check; the verifier then tries the next candidate offset
+(the recorded checkpoint) before giving up and returning 0.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Iterable
+
+
+def _tail_digest(path: str, offset: int, window_bytes: int) -> bytes:
+    start = max(0, offset - window_bytes)
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = offset - start
+        while remaining > 0:
+            block = f.read(min(remaining, 1024 * 1024))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    if remaining > 0:
+        return b""  # Shorter than expected; never matches
+    return digest.digest()
+
+
+# This class is responsible solely for verifying a destination prefix before a resume, adhering to SRP.
+class ResumeVerifier:
+    def __init__(self, window_bytes: int = 4 * 1024 * 1024) -> None:
+        self.window_bytes = window_bytes
+
+    async def find_resume_offset(
+        self, source_path: str, dest_path: str, candidates: Iterable[int] = ()
+    ) -> int:
+        """
+        Largest verified offset among the destination size and `candidates`,
+        or 0 when nothing on the destination can be trusted.
+        """
+        return await asyncio.to_thread(
+            self._find_resume_offset, source_path, dest_path, list(candidates)
+        )
+
+    def _find_resume_offset(
+        self, source_path: str, dest_path: str, candidates: list
+    ) -> int:
+        try:
+            source_size = os.path.getsize(source_path)
+            dest_size = os.path.getsize(dest_path)
+        except OSError:
+            return 0
+
+        limit = min(source_size, dest_size)
+        for offset in sorted({dest_size, *candidates}, reverse=True):
+            if offset <= 0 or offset > limit:
+                continue
+            try:
+                if _tail_digest(source_path, offset, self.window_bytes) == _tail_digest(
+                    dest_path, offset, self.window_bytes
+                ):
+                    return offset
+            except OSError as e:
+                logging.warning(f"Resume verification failed for {dest_path}: {e}")
+                return 0
+            logging.info(
+                f"Resume prefix mismatch at {offset} bytes: {os.path.basename(dest_path)}"
+            )
+        return 0
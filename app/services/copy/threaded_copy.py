@@ -0,0 +1,203 @@
+"""
+Threaded Copy - runs the whole byte-moving loop inside one OS thread.
+
+The async copy loops pay an executor round-trip per read and per write, plus
+network checks and progress bookkeeping on the event loop, for every chunk.
+A ThreadedTransferCopy instead owns one resident thread for the whole
+transfer. Each growing-copy cycle queues the next byte range to it, and the
+thread copies that range with plain blocking calls (kernel copy first when
+allowed, then readinto/os.write through one reused buffer). The thread touches
+only two pieces of shared state: it advances `bytes_copied` and checks a cancel
+flag. Everything else - progress publishing, connectivity checks, stall
+timeouts - is left to an async supervisor that samples the counter a few times
+per second.
+
+The thread writes through its own duplicate of the destination fd and closes it
+itself on exit, so a thread stuck in a hung write can be abandoned without ever
+touching a descriptor the caller has closed or the process has reused.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+from typing import Optional
+
+from app.services.copy.kernel_copy import KernelCopier, KernelCopyUnsupported
+
+_STOP = object()
+
+
+# This class is responsible solely for copying one transfer's byte ranges on a dedicated thread, adhering to SRP.
+class ThreadedTransferCopy:
+    def __init__(
+        self,
+        source_path: str,
+        dst_fd: int,
+        chunk_size: int,
+        use_kernel_copy: bool = True,
+        kernel_range_bytes: int = 16 * 1024 * 1024,
+        hasher=None,
+    ) -> None:
+        self.source_path = source_path
+        # Written only by the copy thread while a range runs; the supervisor just reads it
+        self.bytes_copied = 0
+        self.error: Optional[BaseException] = None
+        self._caller_dst_fd = dst_fd
+        self._dst_fd: Optional[int] = None
+        self._chunk_size = chunk_size
+        self._kernel_range_bytes = kernel_range_bytes
+        # A ContentHasher is fed each chunk on this thread; needs the buffered path
+        self._hasher = hasher
+        self._buffer: Optional[bytearray] = None  # Allocated on first buffered range
+        self._kernel: Optional[KernelCopier] = (
+            KernelCopier() if use_kernel_copy and hasher is None else None
+        )
+        self._requests: queue.SimpleQueue = queue.SimpleQueue()
+        self._cancelled = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._range_finished: Optional[asyncio.Event] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._range_finished = asyncio.Event()
+        self._stopped = asyncio.Event()
+        self._dst_fd = os.dup(self._caller_dst_fd)
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"copy-{os.path.basename(self.source_path)}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def copy_range(self, start_bytes: int, end_bytes: int, pause_ms: int = 0) -> None:
+        """Queue the next range for the thread; `wait` reports when it is done."""
+        # The thread is idle between ranges, so these are safe to reset here
+        self.bytes_copied = start_bytes
+        self.error = None
+        self._range_finished.clear()
+        self._requests.put((end_bytes, pause_ms / 1000))
+
+    def cancel(self) -> None:
+        """Ask the thread to stop after its current call; it cannot interrupt a hung write."""
+        self._cancelled.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """True once the queued range has finished, False if `timeout` passed first."""
+        try:
+            await asyncio.wait_for(self._range_finished.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def close(self, timeout: float) -> bool:
+        """
+        Stop the thread and wait up to `timeout` for it to exit. False means it
+        is still stuck in a blocking call and has been abandoned; it closes its
+        own destination fd whenever that call returns.
+        """
+        if self._thread is None:
+            return True
+        self._cancelled.set()
+        self._requests.put(_STOP)
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout)
+        except asyncio.TimeoutError:
+            logging.warning(
+                f"Copy thread for {os.path.basename(self.source_path)} did not stop "
+                f"within {timeout:.0f}s - abandoning it"
+            )
+            return False
+        # Its last act was signalling; the join only waits for the thread to return
+        self._thread.join()
+        return True
+
+    def _run(self) -> None:
+        src = None
+        try:
+            while True:
+                request = self._requests.get()
+                if request is _STOP:
+                    break
+                try:
+                    if src is None:
+                        src = open(self.source_path, "rb", buffering=0)
+                    self._copy(src, *request)
+                except BaseException as e:
+                    self.error = e
+                self._signal(self._range_finished)
+        finally:
+            if src is not None:
+                src.close()
+            os.close(self._dst_fd)
+            self._signal(self._stopped)
+
+    def _signal(self, event: asyncio.Event) -> None:
+        try:
+            self._loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # Event loop already closed; nobody is waiting
+
+    def _copy(self, src, end_bytes: int, pause_seconds: float) -> None:
+        if self._kernel is not None and self._copy_with_kernel(
+            src.fileno(), end_bytes, pause_seconds
+        ):
+            return
+        src.seek(self.bytes_copied)
+        self._copy_with_buffer(src, end_bytes, pause_seconds)
+
+    def _copy_with_kernel(
+        self, src_fd: int, end_bytes: int, pause_seconds: float
+    ) -> bool:
+        if self._kernel.method is None:
+            self._kernel = None
+            return False
+        while self.bytes_copied < end_bytes and not self.cancelled:
+            count = min(self._kernel_range_bytes, end_bytes - self.bytes_copied)
+            if pause_seconds > 0:
+                count = min(count, self._chunk_size)
+            try:
+                copied = self._kernel.copy_range(
+                    src_fd,
+                    self._dst_fd,
+                    self.bytes_copied,
+                    count,
+                    should_stop=self._cancelled.is_set,
+                )
+            except KernelCopyUnsupported:
+                logging.debug(f"Kernel copy unavailable for {self.source_path}")
+                self._kernel = None
+                return False
+            if copied == 0:
+                break
+            self.bytes_copied += copied
+            self._pause(pause_seconds)
+        return True
+
+    def _copy_with_buffer(self, src, end_bytes: int, pause_seconds: float) -> None:
+        if self._buffer is None:
+            self._buffer = bytearray(self._chunk_size)
+        view = memoryview(self._buffer)
+        while self.bytes_copied < end_bytes and not self.cancelled:
+            read_size = min(self._chunk_size, end_bytes - self.bytes_copied)
+            length = src.readinto(view[:read_size])
+            if not length:
+                break
+            written = 0
+            while written < length:
+                written += os.write(self._dst_fd, view[written:length])
+            if self._hasher is not None:
+                self._hasher.update(view[:length])
+            self.bytes_copied += length
+            self._pause(pause_seconds)
+
+    def _pause(self, pause_seconds: float) -> None:
+        if pause_seconds > 0:
+            self._cancelled.wait(pause_seconds)
@@ -2,20 +2,29 @@ import asyncio
 import logging
 import os
 from abc import ABC, abstractmethod
-from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 import aiofiles
 import aiofiles.os
 
 from app.config import Settings
 from app.core.events.event_bus import DomainEventBus
+from app.core.transfer_progress import TransferProgress, TransferProgressStore
 from app.models import FileStatus, TrackedFile
+from app.services.copy.content_hasher import ContentHasher
+from app.services.copy.content_verifier import ContentVerifier
+from app.services.copy.copy_resume import CopyResumer
 from app.services.copy.file_copy_executor import FileCopyExecutor
+from app.services.copy.kernel_copy import (
+    KernelCopier,
+    KernelCopyUnsupported,
+    file_descriptor,
+)
 from app.services.copy.network_error_detector import NetworkErrorDetector, NetworkError
+from app.services.copy.pipelined_copy import PipelinedRangeCopier
+from app.services.copy.threaded_copy import ThreadedTransferCopy
 from app.services.state_manager import StateManager
-from app.utils.progress_utils import calculate_transfer_rate
 
 
 async def _verify_file_integrity(source_path: str, dest_path: str) -> bool:
@@ -41,11 +50,20 @@ class FileCopyStrategy(ABC):
         state_manager: StateManager,
         file_copy_executor: FileCopyExecutor,
         event_bus: Optional[DomainEventBus] = None,
+        progress_store: Optional[TransferProgressStore] = None,
     ):
         self.settings = settings
         self.state_manager = state_manager
         self.file_copy_executor = file_copy_executor
         self._event_bus = event_bus
+        # Live byte counters; published at a fixed rate by TransferProgressSampler
+        self._progress_store = (
+            progress_store if progress_store is not None else TransferProgressStore()
+        )
+        self._use_kernel_copy = settings.use_kernel_copy
+        self._kernel_range_bytes = settings.kernel_copy_range_mb * 1024 * 1024
+        self._resumer = CopyResumer(settings, state_manager)
+        self._verifier = ContentVerifier(settings, state_manager)
 
     @abstractmethod
     async def copy_file(
@@ -148,12 +166,15 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
                 logging.error(f"Directory creation failed for: {dest_dir}: {e}")
                 return False
 
+            hasher = self._verifier.create_hasher()
             success = await self._copy_growing_file(
-                source_path, dest_path, tracked_file
+                source_path, dest_path, tracked_file, hasher=hasher
             )
 
             if success:
-                if await _verify_file_integrity(source_path, dest_path):
+                if await _verify_file_integrity(
+                    source_path, dest_path
+                ) and await self._verifier.verify(dest_path, tracked_file, hasher):
                     try:
                         await aiofiles.os.remove(source_path)
                         logging.debug(
@@ -169,6 +190,9 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
                         FileStatus.COMPLETED,
                         copy_progress=100.0,
                         destination_path=dest_path,
+                        copy_checkpoint=None,
+                        content_hash=hasher.hexdigest() if hasher else None,
+                        content_hash_algorithm=hasher.algorithm if hasher else None,
                     )
 
                     logging.info(
@@ -221,8 +245,14 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
                     )
 
     async def _copy_growing_file(
-        self, source_path: str, dest_path: str, tracked_file: TrackedFile
+        self,
+        source_path: str,
+        dest_path: str,
+        tracked_file: TrackedFile,
+        hasher: Optional[ContentHasher] = None,
     ) -> bool:
+        progress = None
+        completed = False
         try:
             # Check if this is a static or growing file
             is_growing_file = self._is_file_currently_growing(tracked_file)
@@ -234,7 +264,9 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
             poll_interval = self.settings.growing_file_poll_interval_seconds
             pause_ms = self.settings.growing_copy_pause_ms
 
-            bytes_copied = 0
+            bytes_copied = await self._resumer.start(
+                source_path, dest_path, tracked_file, hasher
+            )
             last_file_size = 0
             no_growth_cycles = 0
             max_no_growth_cycles = (
@@ -259,8 +291,9 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
             network_detector = NetworkErrorDetector(
                 destination_path=dest_path, check_interval_bytes=chunk_size * 10
             )
+            progress = self._progress_store.start(tracked_file.id, start_bytes=bytes_copied)
 
-            async with aiofiles.open(dest_path, "wb") as dst:
+            async with self._resumer.open_destination(dest_path, bytes_copied) as dst:
                 bytes_copied = await self._growing_copy_loop(
                     source_path,
                     dst,
@@ -274,8 +307,13 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
                     poll_interval,
                     pause_ms,
                     network_detector,
+                    progress,
+                    hasher=hasher,
                 )
 
+            # Final sample so the stored counters match what was written
+            await self.state_manager.apply_transfer_progress(progress)
+            completed = True
             return True
 
         except NetworkError:
@@ -306,6 +344,12 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
 
             logging.error(f"Error in growing file copy: {e}")
             return False
+        finally:
+            self._progress_store.finish(tracked_file.id)
+            if progress is not None and not completed:
+                await self._resumer.record_checkpoint(
+                    tracked_file.id, dest_path, progress.bytes_copied
+                )
 
     async def _growing_copy_loop(
         self,
@@ -321,11 +365,15 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
         poll_interval: float,
         pause_ms: int,
         network_detector: NetworkErrorDetector,
+        progress: TransferProgress,
+        hasher: Optional[ContentHasher] = None,
     ) -> int:
         """
         Intelligent growing copy loop that adapts behavior based on file growth.
         Phase 1: Growing phase - uses safety margin and delays
         Phase 2: Finished growing - copies at full speed without delays/margin
+        Status and file size go through StateManager once per cycle; byte counters
+        only go to the TransferProgress record.
         Returns the final bytes_copied count.
         """
         # Static files start as "finished growing" to skip safety margins
@@ -385,6 +433,11 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
                         f"🐌 THROTTLED: Only {distance_from_write_head / 1024 / 1024:.1f}MB from write head"
                     )
 
+            progress.total_bytes = current_file_size
+            await self.state_manager.update_file_status_by_id(
+                tracked_file.id, status, file_size=current_file_size
+            )
+
             if safe_copy_to > bytes_copied:
                 speed_mode = "🚀 FULL" if not use_pause else "🐌 THROTTLED"
                 phase = "FINISH" if file_finished_growing else "GROWING"
@@ -398,25 +451,10 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
                     bytes_copied,
                     safe_copy_to,
                     chunk_size,
-                    tracked_file,
-                    current_file_size,
+                    progress,
                     pause_ms if use_pause else 0,
                     network_detector,
-                    status,
-                )
-            elif not file_finished_growing:
-                copy_ratio = (
-                    (bytes_copied / current_file_size) * 100
-                    if current_file_size > 0
-                    else 0
-                )
-
-                await self.state_manager.update_file_status_by_id(
-                    tracked_file.id,
-                    FileStatus.GROWING_COPY,
-                    copy_progress=copy_ratio,
-                    bytes_copied=bytes_copied,
-                    file_size=current_file_size,
+                    hasher=hasher,
                 )
 
             if file_finished_growing and bytes_copied >= current_file_size:
@@ -437,91 +475,161 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
         start_bytes: int,
         end_bytes: int,
         chunk_size: int,
-        tracked_file: TrackedFile,
-        current_file_size: int,
+        progress: TransferProgress,
         pause_ms: int,
         network_detector: NetworkErrorDetector,
-        status: FileStatus = FileStatus.GROWING_COPY,
+        hasher: Optional[ContentHasher] = None,
     ) -> int:
         """
         Copy a range of bytes from source to destination with network error detection.
-        Args:
-            status: FileStatus to use for progress updates (GROWING_COPY or COPYING)
+        Progress is recorded on the TransferProgress record only (no lock, no event).
+        With a hasher every copied byte is hashed in order, which needs the bytes in
+        user space, so the kernel copy path is skipped.
         Returns the final bytes copied count.
         """
+        async with aiofiles.open(source_path, "rb") as src:
+            if self._use_kernel_copy and hasher is None:
+                kernel_copied = await self._kernel_copy_range(
+                    src,
+                    dst,
+                    start_bytes,
+                    end_bytes,
+                    chunk_size if pause_ms > 0 else self._kernel_range_bytes,
+                    progress,
+                    pause_ms,
+                    network_detector,
+                )
+                if kernel_copied is not None:
+                    return kernel_copied
+
+            await src.seek(start_bytes)
+            return await self._copy_user_space_range(
+                src,
+                dst,
+                start_bytes,
+                end_bytes,
+                chunk_size,
+                progress,
+                pause_ms,
+                network_detector,
+                hasher,
+            )
+
+    async def _copy_user_space_range(
+        self,
+        src,
+        dst,
+        start_bytes: int,
+        end_bytes: int,
+        chunk_size: int,
+        progress: TransferProgress,
+        pause_ms: int,
+        network_detector: NetworkErrorDetector,
+        hasher: Optional[ContentHasher] = None,
+    ) -> int:
+        """
+        Sequential read-then-write loop over an already positioned source.
+        Each chunk is hashed on a worker thread while its write is in flight.
+        """
         bytes_copied = start_bytes
         bytes_to_copy = end_bytes - start_bytes
 
-        async with aiofiles.open(source_path, "rb") as src:
-            await src.seek(bytes_copied)
+        while bytes_to_copy > 0:
+            read_size = min(chunk_size, bytes_to_copy)
+            chunk = await src.read(read_size)
+
+            if not chunk:
+                break
 
-            while bytes_to_copy > 0:
-                read_size = min(chunk_size, bytes_to_copy)
-                chunk = await src.read(read_size)
+            # Hash on a worker thread while the write is in flight
+            hashing = (
+                asyncio.ensure_future(asyncio.to_thread(hasher.update, chunk))
+                if hasher is not None
+                else None
+            )
 
-                if not chunk:
-                    break
+            try:
+                await dst.write(chunk)
+            except Exception as write_error:
+                network_detector.check_write_error(
+                    write_error, "growing copy chunk write"
+                )
+                raise write_error
+            finally:
+                if hashing is not None:
+                    await hashing
 
-                try:
-                    await dst.write(chunk)
-                except Exception as write_error:
-                    network_detector.check_write_error(
-                        write_error, "growing copy chunk write"
-                    )
-                    raise write_error
+            chunk_len = len(chunk)
+            bytes_copied += chunk_len
+            bytes_to_copy -= chunk_len
 
-                chunk_len = len(chunk)
-                bytes_copied += chunk_len
-                bytes_to_copy -= chunk_len
+            try:
+                await network_detector.check_destination_connectivity(bytes_copied)
+            except NetworkError as ne:
+                logging.error(f"Network connectivity lost during growing copy: {ne}")
+                raise ne
 
-                try:
-                    await network_detector.check_destination_connectivity(bytes_copied)
-                except NetworkError as ne:
-                    logging.error(
-                        f"Network connectivity lost during growing copy: {ne}"
-                    )
-                    raise ne
+            progress.bytes_copied = bytes_copied
 
-                copy_ratio = (
-                    (bytes_copied / current_file_size) * 100
-                    if current_file_size > 0
-                    else 0
-                )
+            if pause_ms > 0:
+                await asyncio.sleep(pause_ms / 1000)
 
-                current_time = datetime.now()
-                if not hasattr(self, "_copy_start_time"):
-                    self._copy_start_time = current_time
-                    self._copy_start_bytes = bytes_copied
+        return bytes_copied
 
-                elapsed_seconds = (current_time - self._copy_start_time).total_seconds()
-                transfer_rate = calculate_transfer_rate(
-                    bytes_copied - self._copy_start_bytes,
-                    elapsed_seconds,
+    async def _kernel_copy_range(
+        self,
+        src,
+        dst,
+        start_bytes: int,
+        end_bytes: int,
+        range_bytes: int,
+        progress: TransferProgress,
+        pause_ms: int,
+        network_detector: NetworkErrorDetector,
+    ) -> Optional[int]:
+        """
+        Copy the range with copy_file_range/sendfile on a worker thread, one
+        `range_bytes` slice per hop, with the usual network check, progress
+        update and pause between slices. Returns None (nothing copied) when the
+        kernel cannot copy between these files, so the caller falls back.
+        """
+        src_fd = file_descriptor(src)
+        dst_fd = file_descriptor(dst)
+        copier = KernelCopier()
+        if src_fd is None or dst_fd is None or copier.method is None:
+            return None
+
+        # Earlier user-space writes may still sit in the destination's buffer
+        await dst.flush()
+        loop = asyncio.get_running_loop()
+        bytes_copied = start_bytes
+
+        while bytes_copied < end_bytes:
+            count = min(range_bytes, end_bytes - bytes_copied)
+            try:
+                copied = await loop.run_in_executor(
+                    None, copier.copy_range, src_fd, dst_fd, bytes_copied, count
                 )
-                copy_speed_mbps = transfer_rate / (1024 * 1024)
+            except KernelCopyUnsupported:
+                return None
+            except OSError as write_error:
+                network_detector.check_write_error(write_error, "kernel copy range")
+                raise write_error
 
-                if self._event_bus:
-                    from app.core.events.file_events import FileCopyProgressEvent
+            if copied == 0:
+                break
+            bytes_copied += copied
 
-                    progress_event = FileCopyProgressEvent(
-                        file_id=tracked_file.id,
-                        bytes_copied=bytes_copied,
-                        total_bytes=current_file_size,
-                        copy_speed_mbps=copy_speed_mbps,
-                    )
-                    asyncio.create_task(self._event_bus.publish(progress_event))
-
-                await self.state_manager.update_file_status_by_id(
-                    tracked_file.id,
-                    status,
-                    copy_progress=copy_ratio,
-                    bytes_copied=bytes_copied,
-                    file_size=current_file_size,
-                    copy_speed_mbps=copy_speed_mbps,
-                )
+            try:
+                await network_detector.check_destination_connectivity(bytes_copied)
+            except NetworkError as ne:
+                logging.error(f"Network connectivity lost during kernel copy: {ne}")
+                raise ne
 
-                if pause_ms > 0:
-                    await asyncio.sleep(pause_ms / 1000)
+            progress.bytes_copied = bytes_copied
+
+            if pause_ms > 0:
+                await asyncio.sleep(pause_ms / 1000)
 
         return bytes_copied
 
@@ -581,3 +689,237 @@ class GrowingFileCopyStrategy(FileCopyStrategy):
         # - No recent size changes
         # This indicates a static file that went through normal stability detection
         return False
+
+
+class PipelinedFileCopyStrategy(GrowingFileCopyStrategy):
+    """
+    Growing-file copy whose user-space byte loop overlaps reads and writes
+    through a ring of `copy_pipeline_depth` buffers. Everything else (size
+    waits, growth tracking, verification, kernel copy) is inherited unchanged.
+    """
+
+    async def _copy_user_space_range(
+        self,
+        src,
+        dst,
+        start_bytes: int,
+        end_bytes: int,
+        chunk_size: int,
+        progress: TransferProgress,
+        pause_ms: int,
+        network_detector: NetworkErrorDetector,
+        hasher: Optional[ContentHasher] = None,
+    ) -> int:
+        copier = PipelinedRangeCopier(chunk_size, self.settings.copy_pipeline_depth)
+
+        async def after_write(bytes_copied: int) -> None:
+            try:
+                await network_detector.check_destination_connectivity(bytes_copied)
+            except NetworkError as ne:
+                logging.error(f"Network connectivity lost during pipelined copy: {ne}")
+                raise ne
+
+            progress.bytes_copied = bytes_copied
+
+            if pause_ms > 0:
+                await asyncio.sleep(pause_ms / 1000)
+
+        def on_write_error(write_error: Exception) -> None:
+            network_detector.check_write_error(write_error, "pipelined chunk write")
+
+        return await copier.copy_range(
+            src, dst, start_bytes, end_bytes, after_write, on_write_error, hasher
+        )
+
+
+class ThreadedFileCopyStrategy(GrowingFileCopyStrategy):
+    """
+    Growing-file copy whose byte ranges are moved by one resident thread per
+    transfer (ThreadedTransferCopy). The event loop only supervises: it samples
+    the thread's counter every `progress_sample_interval_seconds`, runs the
+    connectivity check, and gives up when no byte has moved for
+    `copy_stall_timeout_seconds`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Resident copy thread of each running transfer, by file id
+        self._transfers: Dict[str, ThreadedTransferCopy] = {}
+
+    async def _growing_copy_loop(
+        self,
+        source_path: str,
+        dst,
+        tracked_file: TrackedFile,
+        bytes_copied: int,
+        last_file_size: int,
+        no_growth_cycles: int,
+        max_no_growth_cycles: int,
+        safety_margin_bytes: int,
+        chunk_size: int,
+        poll_interval: float,
+        pause_ms: int,
+        network_detector: NetworkErrorDetector,
+        progress: TransferProgress,
+        hasher: Optional[ContentHasher] = None,
+    ) -> int:
+        copy = self._start_transfer(source_path, dst, chunk_size, hasher)
+        if copy is not None:
+            self._transfers[tracked_file.id] = copy
+        try:
+            return await super()._growing_copy_loop(
+                source_path,
+                dst,
+                tracked_file,
+                bytes_copied,
+                last_file_size,
+                no_growth_cycles,
+                max_no_growth_cycles,
+                safety_margin_bytes,
+                chunk_size,
+                poll_interval,
+                pause_ms,
+                network_detector,
+                progress,
+                hasher=hasher,
+            )
+        finally:
+            if copy is not None:
+                del self._transfers[tracked_file.id]
+                # The thread must be gone (or abandoned with its own fd) before dst closes
+                await copy.close(self.settings.copy_stall_timeout_seconds)
+
+    def _start_transfer(
+        self, source_path: str, dst, chunk_size: int, hasher: Optional[ContentHasher]
+    ) -> Optional[ThreadedTransferCopy]:
+        dst_fd = file_descriptor(dst)
+        if dst_fd is None:
+            return None
+        copy = ThreadedTransferCopy(
+            source_path,
+            dst_fd,
+            chunk_size,
+            use_kernel_copy=self._use_kernel_copy and hasher is None,
+            kernel_range_bytes=self._kernel_range_bytes,
+            hasher=hasher,
+        )
+        copy.start()
+        return copy
+
+    async def _copy_chunk_range(
+        self,
+        source_path: str,
+        dst,
+        start_bytes: int,
+        end_bytes: int,
+        chunk_size: int,
+        progress: TransferProgress,
+        pause_ms: int,
+        network_detector: NetworkErrorDetector,
+        hasher: Optional[ContentHasher] = None,
+    ) -> int:
+        copy = self._transfers.get(progress.file_id)
+        if copy is not None:
+            return await self._supervise_range(
+                copy, source_path, dst, start_bytes, end_bytes, progress, pause_ms,
+                network_detector,
+            )
+
+        # Not inside a transfer loop: a thread just for this range
+        copy = self._start_transfer(source_path, dst, chunk_size, hasher)
+        if copy is None:
+            return await super()._copy_chunk_range(
+                source_path,
+                dst,
+                start_bytes,
+                end_bytes,
+                chunk_size,
+                progress,
+                pause_ms,
+                network_detector,
+                hasher=hasher,
+            )
+        try:
+            return await self._supervise_range(
+                copy, source_path, dst, start_bytes, end_bytes, progress, pause_ms,
+                network_detector,
+            )
+        finally:
+            await copy.close(self.settings.copy_stall_timeout_seconds)
+
+    async def _supervise_range(
+        self,
+        copy: ThreadedTransferCopy,
+        source_path: str,
+        dst,
+        start_bytes: int,
+        end_bytes: int,
+        progress: TransferProgress,
+        pause_ms: int,
+        network_detector: NetworkErrorDetector,
+    ) -> int:
+        # The thread writes straight to the fd, behind any buffered bytes
+        await dst.flush()
+        sample_interval = self.settings.progress_sample_interval_seconds
+        stall_timeout = self.settings.copy_stall_timeout_seconds
+        loop = asyncio.get_running_loop()
+        last_bytes = start_bytes
+        last_moved_at = loop.time()
+
+        copy.copy_range(start_bytes, end_bytes, pause_ms)
+        try:
+            while not await copy.wait(sample_interval):
+                bytes_copied = copy.bytes_copied
+                progress.bytes_copied = bytes_copied
+
+                if bytes_copied != last_bytes:
+                    last_bytes = bytes_copied
+                    last_moved_at = loop.time()
+                    await network_detector.check_destination_connectivity(bytes_copied)
+                elif loop.time() - last_moved_at > stall_timeout:
+                    raise NetworkError(
+                        f"Copy stalled: no progress for {stall_timeout:.0f}s "
+                        f"at {bytes_copied} bytes ({os.path.basename(source_path)})"
+                    )
+        except BaseException:
+            # Stop the thread after its current call; whoever started it joins it
+            copy.cancel()
+            raise
+
+        if copy.error is not None:
+            if isinstance(copy.error, OSError):
+                network_detector.check_write_error(copy.error, "threaded copy")
+            raise copy.error
+
+        progress.bytes_copied = copy.bytes_copied
+        return copy.bytes_copied
+
+
+COPY_STRATEGIES = {
+    "sequential": GrowingFileCopyStrategy,
+    "pipelined": PipelinedFileCopyStrategy,
+    "threaded": ThreadedFileCopyStrategy,
+}
+
+
+def create_copy_strategy(
+    settings: Settings,
+    state_manager: StateManager,
+    file_copy_executor: FileCopyExecutor,
+    event_bus: Optional[DomainEventBus] = None,
+    progress_store: Optional[TransferProgressStore] = None,
+) -> GrowingFileCopyStrategy:
+    """Build the copy strategy selected by `settings.copy_mode`."""
+    strategy_class = COPY_STRATEGIES.get(settings.copy_mode)
+    if strategy_class is None:
+        raise ValueError(
+            f"Unknown copy_mode '{settings.copy_mode}', "
+            f"expected one of: {', '.join(COPY_STRATEGIES)}"
+        )
+    return strategy_class(
+        settings,
+        state_manager,
+        file_copy_executor,
+        event_bus=event_bus,
+        progress_store=progress_store,
+    )
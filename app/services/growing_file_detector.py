@@ -1,17 +1,24 @@
 import asyncio
 import logging
 from datetime import datetime
-from typing import Optional, Tuple
-
-import aiofiles.os
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
 
 from app.config import Settings
 from app.models import FileStatus, TrackedFile
 from app.services.state_manager import StateManager
 
+if TYPE_CHECKING:
+    from app.services.scanner.domain_objects import FileObservation
+    from app.services.scanner.observation_stage import FileObservationStage
+
 
 class GrowingFileDetector:
-    def __init__(self, settings: Settings, state_manager: StateManager):
+    def __init__(
+        self,
+        settings: Settings,
+        state_manager: StateManager,
+        observation_stage: "FileObservationStage",
+    ):
         self.settings = settings
         self.state_manager = state_manager
 
@@ -20,6 +27,8 @@ class GrowingFileDetector:
         self.min_size_bytes = settings.growing_file_min_size_mb * 1024 * 1024
         self.poll_interval = settings.growing_file_poll_interval_seconds
         self.growth_timeout = settings.growing_file_growth_timeout_seconds
+        # Shared with the scanner's walk, so a file is stat'ed once per interval
+        self._observation_stage = observation_stage
 
         logging.info(
             f"GrowingFileDetector initialized - min_size: {settings.growing_file_min_size_mb}MB, "
@@ -41,11 +50,46 @@ class GrowingFileDetector:
         logging.info("Stopping growing file monitoring")
 
     async def check_file_growth_status(
-        self, tracked_file: TrackedFile
+        self,
+        tracked_file: TrackedFile,
+        observation: Optional["FileObservation"] = None,
     ) -> Tuple[FileStatus, Optional[TrackedFile]]:
         """
         Check file growth status using TrackedFile state instead of separate tracking.
-        Returns updated TrackedFile with growth information.
+        Returns updated TrackedFile with growth information. Without an
+        observation the shared observation stage is asked for one.
+        """
+        if observation is None:
+            observations = await self._observe_many([tracked_file.file_path])
+            if tracked_file.file_path not in observations:
+                # Source did not answer; decide on the next tick
+                return tracked_file.status, tracked_file
+            observation = observations[tracked_file.file_path]
+
+        recommended_status, growth_changes = await self._evaluate_growth(
+            tracked_file, observation
+        )
+        if growth_changes is None:
+            return recommended_status, (
+                tracked_file if recommended_status == tracked_file.status else None
+            )
+        await self.state_manager.update_many({tracked_file.id: growth_changes})
+        return recommended_status, await self.state_manager.get_file_by_id(
+            tracked_file.id
+        )
+
+    async def _observe_many(
+        self, paths: Iterable[str]
+    ) -> Dict[str, Optional["FileObservation"]]:
+        return await self._observation_stage.observe_many(paths)
+
+    async def _evaluate_growth(
+        self, tracked_file: TrackedFile, observation: Optional["FileObservation"]
+    ) -> Tuple[FileStatus, Optional[Dict[str, Any]]]:
+        """
+        Work out the recommended status and the growth fields to store, without writing.
+        `observation` is the file's current stat, or None if it no longer exists.
+        Growth fields are None when there is nothing to store (file gone, error, skipped).
         """
         # CRITICAL: Don't modify files that are waiting for network
         # This prevents the bounce loop between READY and WAITING_FOR_NETWORK
@@ -53,55 +97,45 @@ class GrowingFileDetector:
             logging.debug(
                 f"Skipping growth check for {tracked_file.file_path} - waiting for network"
             )
-            return tracked_file.status, tracked_file
+            return tracked_file.status, None
 
         try:
-            # Get current file info
-            if not await aiofiles.os.path.exists(tracked_file.file_path):
+            # Current file info comes from the shared observation stage
+            if observation is None:
                 logging.info(
                     f"File no longer exists during growth check: {tracked_file.file_path}"
                 )
                 return FileStatus.REMOVED, None
 
-            current_size = await aiofiles.os.path.getsize(tracked_file.file_path)
-            current_time = datetime.now()
+            current_size = observation.size
+            current_time = observation.observed_time
 
             # Initialize growth tracking fields if this is first check
             if tracked_file.last_growth_check is None:
                 # First time seeing this file - initialize growth tracking
-                await self.state_manager.update_file_status_by_id(
-                    tracked_file.id,
-                    tracked_file.status,  # Keep current status
-                    file_size=current_size,
-                    previous_file_size=current_size,
-                    first_seen_size=current_size,
-                    last_growth_check=current_time,
-                    growth_stable_since=current_time,
-                )
-
-                # Get updated file
-                updated_file = await self.state_manager.get_file_by_id(tracked_file.id)
-
                 logging.debug(
                     f"Started tracking growth for {tracked_file.file_path} (size: {current_size / 1024 / 1024:.1f}MB)"
                 )
-                return FileStatus.DISCOVERED, updated_file
+                return FileStatus.DISCOVERED, {
+                    "file_size": current_size,
+                    "previous_file_size": current_size,
+                    "first_seen_size": current_size,
+                    "last_growth_check": current_time,
+                    "growth_stable_since": current_time,
+                }
 
             # Update file with current size and time
             previous_size = tracked_file.file_size
+            is_currently_growing = current_size > previous_size
+            has_grown = current_size > tracked_file.first_seen_size
 
-            # Calculate growth rate
+            # Calculate growth rate; a file that did not grow keeps its last rate,
+            # so an unchanged file produces no changes at all
+            growth_rate = tracked_file.growth_rate_mbps
             time_diff = (current_time - tracked_file.last_growth_check).total_seconds()
-            if time_diff > 0:
+            if is_currently_growing and time_diff > 0:
                 size_diff = current_size - tracked_file.first_seen_size
-                growth_rate = (
-                    (size_diff / (1024 * 1024)) / time_diff if time_diff > 0 else 0.0
-                )
-            else:
-                growth_rate = tracked_file.growth_rate_mbps
-
-            is_currently_growing = current_size > previous_size
-            has_grown = current_size > tracked_file.first_seen_size
+                growth_rate = (size_diff / (1024 * 1024)) / time_diff
 
             # Update growth stable timestamp
             growth_stable_since = tracked_file.growth_stable_since
@@ -120,19 +154,14 @@ class GrowingFileDetector:
                 )
                 return FileStatus.REMOVED, None
 
-            # Update TrackedFile with new information
-            await self.state_manager.update_file_status_by_id(
-                tracked_file.id,
-                tracked_file.status,  # Keep current status for now
-                file_size=current_size,
-                previous_file_size=previous_size,
-                last_growth_check=current_time,
-                growth_rate_mbps=growth_rate,
-                growth_stable_since=growth_stable_since,
-            )
-
-            # Get updated file for decision logic
-            updated_file = await self.state_manager.get_file_by_id(tracked_file.id)
+            # New growth information - stored by the caller, status untouched
+            growth_changes = {
+                "file_size": current_size,
+                "previous_file_size": previous_size,
+                "last_growth_check": current_time,
+                "growth_rate_mbps": growth_rate,
+                "growth_stable_since": growth_stable_since,
+            }
 
             # Decision logic based on growth status
             if is_currently_growing:
@@ -141,13 +170,13 @@ class GrowingFileDetector:
                         f"File {tracked_file.file_path} ready for growing copy "
                         f"(size: {current_size / 1024 / 1024:.1f}MB, rate: {growth_rate:.2f}MB/s)"
                     )
-                    return FileStatus.READY_TO_START_GROWING, updated_file
+                    return FileStatus.READY_TO_START_GROWING, growth_changes
                 else:
                     logging.debug(
                         f"File {tracked_file.file_path} still growing but too small "
                         f"(size: {current_size / 1024 / 1024:.1f}MB < {self.settings.growing_file_min_size_mb}MB)"
                     )
-                    return FileStatus.GROWING, updated_file
+                    return FileStatus.GROWING, growth_changes
             else:
                 # File is not currently growing
                 if not has_grown and current_size < self.min_size_bytes:
@@ -163,13 +192,13 @@ class GrowingFileDetector:
                             f"File {tracked_file.file_path} is static and stable, ready for normal copy "
                             f"(size: {current_size / 1024 / 1024:.1f}MB)"
                         )
-                        return FileStatus.READY, updated_file
+                        return FileStatus.READY, growth_changes
                     else:
                         logging.debug(
                             f"File {tracked_file.file_path} checking stability for normal copy "
                             f"({stable_duration:.1f}s/{self.growth_timeout}s)"
                         )
-                        return FileStatus.DISCOVERED, updated_file
+                        return FileStatus.DISCOVERED, growth_changes
 
                 # File has grown or is large enough
                 stable_duration = (
@@ -184,26 +213,26 @@ class GrowingFileDetector:
                             f"File {tracked_file.file_path} finished growing, ready for growing copy "
                             f"(size: {current_size / 1024 / 1024:.1f}MB)"
                         )
-                        return FileStatus.READY_TO_START_GROWING, updated_file
+                        return FileStatus.READY_TO_START_GROWING, growth_changes
                     else:
                         logging.debug(
                             f"File {tracked_file.file_path} is stable, ready for normal copy "
                             f"(size: {current_size / 1024 / 1024:.1f}MB)"
                         )
-                        return FileStatus.READY, updated_file
+                        return FileStatus.READY, growth_changes
                 else:
                     if has_grown:
                         logging.debug(
                             f"File {tracked_file.file_path} previously grew, checking post-growth stability "
                             f"({stable_duration:.1f}s/{self.growth_timeout}s)"
                         )
-                        return FileStatus.GROWING, updated_file
+                        return FileStatus.GROWING, growth_changes
                     else:
                         logging.debug(
                             f"File {tracked_file.file_path} checking initial stability "
                             f"({stable_duration:.1f}s/{self.growth_timeout}s)"
                         )
-                        return FileStatus.DISCOVERED, updated_file
+                        return FileStatus.DISCOVERED, growth_changes
 
         except Exception as e:
             logging.error(
@@ -211,6 +240,37 @@ class GrowingFileDetector:
             )
             return FileStatus.FAILED, None
 
+    async def complete_on_write_close(
+        self, tracked_file: TrackedFile, current_size: int
+    ) -> Optional[FileStatus]:
+        """
+        The writer closed the file and its size held through the settle window, so
+        there is no need to wait out the growth timeout. Applies the usual
+        normal-copy vs growing-copy choice and returns it, or None when the file
+        is not waiting for a stability decision.
+        """
+        if tracked_file.status not in (FileStatus.DISCOVERED, FileStatus.GROWING):
+            return None
+
+        current_time = datetime.now()
+        first_seen_size = tracked_file.first_seen_size or current_size
+        await self.state_manager.update_many(
+            {
+                tracked_file.id: {
+                    "file_size": current_size,
+                    "previous_file_size": tracked_file.file_size,
+                    "first_seen_size": first_seen_size,
+                    "last_growth_check": current_time,
+                    "growth_stable_since": tracked_file.growth_stable_since
+                    or current_time,
+                }
+            }
+        )
+
+        if current_size > first_seen_size and current_size >= self.min_size_bytes:
+            return FileStatus.READY_TO_START_GROWING
+        return FileStatus.READY
+
     async def update_file_growth_info(
         self, tracked_file: TrackedFile, new_size: int
     ) -> None:
@@ -219,7 +279,11 @@ class GrowingFileDetector:
 
         # Calculate growth rate if we have previous data
         growth_rate = tracked_file.growth_rate_mbps
-        if tracked_file.last_growth_check and tracked_file.first_seen_size > 0:
+        if (
+            new_size > tracked_file.file_size
+            and tracked_file.last_growth_check
+            and tracked_file.first_seen_size > 0
+        ):
             time_diff = (current_time - tracked_file.last_growth_check).total_seconds()
             if time_diff > 0:
                 size_diff = new_size - tracked_file.first_seen_size
@@ -244,17 +308,19 @@ class GrowingFileDetector:
             )
             return
 
-        # Update TrackedFile with new growth information
-        await self.state_manager.update_file_status_by_id(
-            tracked_file.id,
-            tracked_file.status,  # Keep current status
-            file_size=new_size,
-            previous_file_size=tracked_file.file_size,
-            last_growth_check=current_time,
-            growth_rate_mbps=growth_rate,
-            growth_stable_since=growth_stable_since,
-            first_seen_size=tracked_file.first_seen_size
-            or new_size,  # Initialize if not set
+        # Update TrackedFile with new growth information (unchanged values are not rewritten)
+        await self.state_manager.update_many(
+            {
+                tracked_file.id: {
+                    "file_size": new_size,
+                    "previous_file_size": tracked_file.file_size,
+                    "last_growth_check": current_time,
+                    "growth_rate_mbps": growth_rate,
+                    "growth_stable_since": growth_stable_since,
+                    "first_seen_size": tracked_file.first_seen_size
+                    or new_size,  # Initialize if not set
+                }
+            }
         )
 
     async def _monitor_growing_files_loop(self):
@@ -263,7 +329,7 @@ class GrowingFileDetector:
         while self._monitoring_active:
             try:
                 # Get all files that are being tracked for growth (have last_growth_check set)
-                all_files = await self.state_manager.get_all_files()
+                all_files = await self.state_manager.get_active_files()
                 growing_files = [
                     f
                     for f in all_files
@@ -281,33 +347,44 @@ class GrowingFileDetector:
                     ]
                 ]
 
+                # One batched observation for every file this tick, then one batched write
+                observations = await self._observe_many(
+                    tracked_file.file_path for tracked_file in growing_files
+                )
+                batch: Dict[str, Dict[str, Any]] = {}
                 for tracked_file in growing_files:
                     if not self._monitoring_active:
                         break
+                    if tracked_file.file_path not in observations:
+                        continue  # Source did not answer this tick
 
                     try:
                         (
                             recommended_status,
-                            updated_file,
-                        ) = await self.check_file_growth_status(tracked_file)
+                            growth_changes,
+                        ) = await self._evaluate_growth(
+                            tracked_file, observations[tracked_file.file_path]
+                        )
 
+                        changes = dict(growth_changes or {})
                         if recommended_status != tracked_file.status:
                             # NOTE: PAUSED file checks removed in fail-and-rediscover strategy
                             # Files now fail immediately instead of pausing during network issues
-
-                            await self.state_manager.update_file_status_by_id(
-                                file_id=tracked_file.id,
-                                status=recommended_status,
-                            )
+                            changes["status"] = recommended_status
                             logging.debug(
                                 f"GROWING UPDATE: {tracked_file.file_path} -> {recommended_status} [UUID: {tracked_file.id[:8]}...]"
                             )
+                        if changes:
+                            batch[tracked_file.id] = changes
 
                     except Exception as e:
                         logging.error(
                             f"Error monitoring growth for {tracked_file.id}: {e}"
                         )
 
+                if batch:
+                    await self.state_manager.update_many(batch)
+
                 await asyncio.sleep(self.poll_interval)
 
             except Exception as e:
@@ -57,6 +57,8 @@ class JobQueueService:
                 "DomainEventBus not injected, JobQueueService will not be able to queue new files!"
             )
 
+        await self._queue_ready_files()
+
         logging.info("Job Queue Producer startet")
 
         try:
@@ -73,6 +75,21 @@ class JobQueueService:
             self._running = False
             logging.info("Job Queue Producer stoppet")
 
+    async def _queue_ready_files(self) -> None:
+        """Queue files that are already READY at startup (e.g. restored after a restart)."""
+        try:
+            ready_files = await self.state_manager.get_files_by_status(FileStatus.READY)
+            for tracked_file in ready_files:
+                await self.handle_file_ready(
+                    FileReadyEvent(
+                        file_id=tracked_file.id, file_path=tracked_file.file_path
+                    )
+                )
+            if ready_files:
+                logging.info(f"Queued {len(ready_files)} READY files at startup")
+        except Exception as e:
+            logging.error(f"Error queuing READY files at startup: {e}")
+
     def stop_producer(self) -> None:
         self._running = False
         logging.info("Job Queue Producer stop request")
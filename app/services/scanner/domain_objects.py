@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
 
 
 @dataclass
@@ -9,9 +11,32 @@ class ScanConfiguration:
     polling_interval_seconds: int
     file_stable_time_seconds: int
     keep_files_hours: int  # Renamed: now applies to ALL file types, not just completed
+    retention_interval_seconds: int = 300  # Retention runs on its own, slower cadence
+    include_patterns: str = "*.mxf"  # Comma-separated globs, or "re:<regex>"
+    exclude_patterns: str = ".*,*test_file*"
+    inotify_enabled: bool = False  # Event-driven discovery on Linux; polling still reconciles
+    inotify_close_settle_seconds: float = 1.0
 
     # Add missing growing file settings
     growing_file_poll_interval_seconds: int = 5
     growing_file_safety_margin_mb: int = 50
     growing_file_growth_timeout_seconds: int = 300
     growing_file_chunk_size_kb: int = 2048
+
+
+@dataclass(frozen=True, slots=True)
+class FileObservation:
+    """Size and mtime of one source file, and when that stat was taken."""
+
+    path: str
+    size: int
+    mtime: float
+    observed_at: float = field(default_factory=time.time, compare=False)
+
+    @property
+    def observed_time(self) -> datetime:
+        return datetime.fromtimestamp(self.observed_at)
+
+    @property
+    def last_write_time(self) -> datetime:
+        return datetime.fromtimestamp(self.mtime)
@@ -0,0 +1,73 @@
+"""
+File Matcher - decides from a file name alone whether the scanner wants it.
+
+Include and exclude rules come from Settings as comma-separated lists. Plain
+globs are matched case-insensitively against the file name; a rule starting
+with "re:" is a regular expression (also case-insensitive, matched with
+re.search). Extension-only includes such as "*.mxf" go into a hash set, and
+every other rule on a side is folded into one combined regex, so a name costs
+at most one set lookup and two regex scans, and never a stat.
+"""
+
+import fnmatch
+import os
+import re
+from typing import FrozenSet, Iterable, List, Optional, Pattern
+
+DEFAULT_INCLUDE_PATTERNS = "*.mxf"
+DEFAULT_EXCLUDE_PATTERNS = ".*,*test_file*"
+
+_REGEX_PREFIX = "re:"
+_EXTENSION_GLOB = re.compile(r"^\*(\.[^*?\[\]]+)$")
+
+
+def parse_patterns(patterns: str) -> List[str]:
+    return [pattern.strip() for pattern in patterns.split(",") if pattern.strip()]
+
+
+def _to_regex(pattern: str) -> str:
+    if pattern.startswith(_REGEX_PREFIX):
+        return f"(?:{pattern[len(_REGEX_PREFIX):]})"
+    return f"(?:^{fnmatch.translate(pattern)})"
+
+
+def _compile(patterns: Iterable[str]) -> Optional[Pattern[str]]:
+    parts = [_to_regex(pattern) for pattern in patterns]
+    if not parts:
+        return None
+    try:
+        return re.compile("|".join(parts), re.IGNORECASE)
+    except re.error as e:
+        raise ValueError(f"Invalid scanner file pattern in {list(patterns)}: {e}") from e
+
+
+# This class is responsible solely for matching file names against include/exclude rules, adhering to SRP.
+class FileNameMatcher:
+    def __init__(self, include: Iterable[str], exclude: Iterable[str] = ()):
+        extensions = set()
+        include_rules = []
+        for pattern in include:
+            extension = _EXTENSION_GLOB.match(pattern)
+            if extension:
+                extensions.add(extension.group(1).lower())
+            else:
+                include_rules.append(pattern)
+
+        self.include_extensions: FrozenSet[str] = frozenset(extensions)
+        self._include_regex = _compile(include_rules)
+        self._exclude_regex = _compile(list(exclude))
+
+    @classmethod
+    def from_patterns(
+        cls,
+        include_patterns: str = DEFAULT_INCLUDE_PATTERNS,
+        exclude_patterns: str = DEFAULT_EXCLUDE_PATTERNS,
+    ) -> "FileNameMatcher":
+        return cls(parse_patterns(include_patterns), parse_patterns(exclude_patterns))
+
+    def matches(self, name: str) -> bool:
+        if self._exclude_regex is not None and self._exclude_regex.search(name):
+            return False
+        if os.path.splitext(name)[1].lower() in self.include_extensions:
+            return True
+        return self._include_regex is not None and bool(self._include_regex.search(name))
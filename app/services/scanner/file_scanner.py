@@ -2,11 +2,9 @@ import asyncio
 import logging
 import os
 from datetime import datetime
-from pathlib import Path
-from typing import Optional, Set, Dict, Any
+from typing import Awaitable, Callable, Dict, Optional
 from typing import TYPE_CHECKING
 
-import aiofiles.os
 
 from app.config import Settings
 from app.core.events.event_bus import DomainEventBus
@@ -18,44 +16,20 @@ from app.core.events.file_events import (
 from app.models import FileStatus, TrackedFile
 from app.services.growing_file_detector import GrowingFileDetector
 from app.services.state_manager import StateManager
-from .domain_objects import ScanConfiguration
+from .domain_objects import FileObservation, ScanConfiguration
+from .observation_stage import FileObservationStage
+from .watch_event_handler import WatchEventHandler
 
 if TYPE_CHECKING:
     from app.services.storage_monitor import StorageMonitorService
 
 
-async def get_file_metadata(file_path: str) -> Optional[Dict[str, Any]]:
-    """Get file metadata including size and modification time."""
-    try:
-        path = Path(file_path)
-        if not await aiofiles.os.path.exists(path):
-            return None
-
-        stat_result = await aiofiles.os.stat(file_path)
-        return {
-            "path": path,
-            "size": stat_result.st_size,
-            "last_write_time": datetime.fromtimestamp(stat_result.st_mtime),
-        }
-    except (OSError, IOError):
-        return None
-
-
-def is_mxf_file(path: Path) -> bool:
-    """Check if file is an MXF file."""
-    return path.suffix.lower() == ".mxf"
-
-
-def should_ignore_file(path: Path) -> bool:
-    """Check if file should be ignored (test files, etc.)"""
-    return "test_file" in path.name.lower() or path.name.startswith(".")
-
-
 class FileScanner:
     def __init__(
         self,
         config: ScanConfiguration,
         state_manager: StateManager,
+        observation_stage: FileObservationStage,
         storage_monitor: Optional["StorageMonitorService"] = None,
         settings: Optional[Settings] = None,
         event_bus: Optional[DomainEventBus] = None,
@@ -67,14 +41,43 @@ class FileScanner:
         self._event_bus = event_bus
         self._running = False
         self._scan_task: Optional[asyncio.Task] = None
-
-        self.growing_file_detector = GrowingFileDetector(settings, state_manager)
+        self._retention_task: Optional[asyncio.Task] = None
+        self._rescan_requested = asyncio.Event()
+        # Walk, stability check and growth monitor all read sizes from this stage
+        self._observation_stage = observation_stage
+        self._tree_walker = observation_stage.walker
+
+        self.growing_file_detector = GrowingFileDetector(
+            settings, state_manager, self._observation_stage
+        )
         logging.info("Growing file support enabled")
 
+        self._watch_handler: Optional[WatchEventHandler] = None
+        if config.inotify_enabled:
+            self._watch_handler = WatchEventHandler(
+                config.source_directory,
+                config.inotify_close_settle_seconds,
+                state_manager,
+                self.growing_file_detector,
+                self._tree_walker,
+                self._tree_walker.matcher,
+                process_discovered_files=self._process_discovered_files,
+                publish_recommended_status=self._publish_recommended_status,
+                request_rescan=self._rescan_requested.set,
+            )
+
+
         logging.info("FileScanOrchestrator initialized")
         logging.info(f"Monitoring: {config.source_directory}")
         logging.info(f"File stability: {config.file_stable_time_seconds}s")
         logging.info(f"Polling interval: {config.polling_interval_seconds}s")
+        logging.info(f"Retention interval: {config.retention_interval_seconds}s")
+        logging.info(
+            f"File patterns: include={config.include_patterns!r} exclude={config.exclude_patterns!r}"
+        )
+        logging.info(
+            f"Full rescan interval: {self._tree_walker.full_rescan_interval_seconds}s"
+        )
 
     async def start_scanning(self) -> None:
         if self._running:
@@ -88,6 +91,9 @@ class FileScanner:
 
         # Start scanning loop as background task instead of blocking
         self._scan_task = asyncio.create_task(self._scan_folder_loop())
+        self._retention_task = asyncio.create_task(self._retention_loop())
+        if self._watch_handler is not None:
+            self._watch_handler.start()
 
         # Return immediately - don't wait for the task to complete
         logging.info("Scanner task started in background")
@@ -110,10 +116,22 @@ class FileScanner:
             except Exception as e:
                 logging.error(f"Error during scanner task cancellation: {e}")
 
+        if self._retention_task and not self._retention_task.done():
+            self._retention_task.cancel()
+            try:
+                await self._retention_task
+            except asyncio.CancelledError:
+                logging.debug("Retention task cancelled successfully")
+
+        if self._watch_handler is not None:
+            await self._watch_handler.stop()
+        self._tree_walker.close()
+
         # Stop growing file detector
         await self.growing_file_detector.stop_monitoring()
 
         self._scan_task = None
+        self._retention_task = None
         logging.info("File Scanner stopped")
 
     async def _scan_folder_loop(self) -> None:
@@ -121,7 +139,7 @@ class FileScanner:
             while self._running:
                 try:
                     await self._execute_scan_iteration()
-                    await asyncio.sleep(self.config.polling_interval_seconds)
+                    await self._wait_for_next_scan()
                 except asyncio.CancelledError:
                     logging.info("Scanner loop cancelled")
                     break
@@ -134,29 +152,46 @@ class FileScanner:
             self._running = False
             logging.info("Scanner loop completed")
 
-    async def _execute_scan_iteration(self) -> None:
-        scan_start = datetime.now()
+    async def _wait_for_next_scan(self) -> None:
+        """Sleep one polling interval, or less if the watcher asks for a rescan."""
+        try:
+            await asyncio.wait_for(
+                self._rescan_requested.wait(),
+                timeout=self.config.polling_interval_seconds,
+            )
+        except asyncio.TimeoutError:
+            pass
+        self._rescan_requested.clear()
 
-        current_files = await self._discover_all_files()
-        await self._cleanup_missing_files(current_files)
+    async def _retention_loop(self) -> None:
+        # Age-based cleanup only needs minute resolution, so it is decoupled from the scan poll
+        while self._running:
+            await self._cleanup_old_files()
+            await asyncio.sleep(self.config.retention_interval_seconds)
 
-        # StateManager handles its own cleanup - no need for separate tracking cleanup
-        await self._cleanup_old_files()
+    async def _execute_scan_iteration(self) -> None:
+        scan_start = datetime.now()
 
-        current_files = await self._discover_all_files()
-        await self._process_discovered_files(current_files)
-        await self._check_file_stability()
+        # One walk per iteration. New files are processed as each directory
+        # streams in; cleanup and stability then work from the complete snapshot.
+        snapshot = await self._discover_all_files(
+            on_batch=self._process_discovered_files
+        )
+        await self._cleanup_missing_files(snapshot)
+        await self._check_file_stability(snapshot)
 
         scan_duration = (datetime.now() - scan_start).total_seconds()
         logging.debug(f"Scan iteration completed in {scan_duration:.2f}s")
 
-    async def _cleanup_missing_files(self, current_files: Set[Path]) -> int:
+    async def _cleanup_missing_files(
+        self, snapshot: Dict[str, FileObservation]
+    ) -> int:
         """Clean up files that no longer exist in the source directory."""
         try:
-            current_file_paths = {str(path) for path in current_files}
-
+            # Files under a directory that timed out are not missing, just unseen
             removed_count = await self.state_manager.cleanup_missing_files(
-                current_file_paths
+                snapshot.keys(),
+                unreachable_directories=self._tree_walker.unreachable_directories,
             )
 
             if removed_count > 0:
@@ -189,43 +224,45 @@ class FileScanner:
             logging.error(f"Error cleaning up old files: {e}")
             return 0
 
-    async def _discover_all_files(self) -> Set[Path]:
-        """Discover all MXF files in the source directory."""
-        discovered_files: Set[Path] = set()
-
+    async def _discover_all_files(
+        self,
+        on_batch: Optional[
+            Callable[[Dict[str, FileObservation]], Awaitable[None]]
+        ] = None,
+    ) -> Dict[str, FileObservation]:
+        """
+        Walk the source directory once and observe every matching file in it.
+        `on_batch` is awaited with each directory's files as the walk streams them.
+        """
         try:
-            source_path = Path(self.config.source_directory)
-
-            if not await aiofiles.os.path.exists(source_path):
-                logging.debug(f"Source directory does not exist: {source_path}")
-                return discovered_files
-
-            if not await aiofiles.os.path.isdir(source_path):
-                logging.debug(f"Source path is not a directory: {source_path}")
-                return discovered_files
-
-            # Scan recursively for .mxf files
-            for root, _, files in os.walk(source_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    abs_file_path = os.path.abspath(file_path)
-                    path_obj = Path(abs_file_path)
-
-                    if is_mxf_file(path_obj) and not should_ignore_file(path_obj):
-                        discovered_files.add(path_obj)
-
-            logging.debug(f"Discovered {len(discovered_files)} MXF files")
-
+            # Files still in the pipeline need fresh sizes even in unchanged directories
+            refresh_paths = {
+                tracked_file.file_path
+                for tracked_file in await self.state_manager.get_active_files()
+            }
+            snapshot: Dict[str, FileObservation] = {}
+            async for batch in self._tree_walker.walk_stream(
+                self.config.source_directory, refresh_paths
+            ):
+                snapshot.update(batch)
+                self._observation_stage.publish(batch)
+                if on_batch is not None:
+                    await on_batch(batch)
+            logging.debug(
+                f"Discovered {len(snapshot)} matching files "
+                f"({self._tree_walker.directories_listed} directories listed, "
+                f"{self._tree_walker.directories_reused} unchanged)"
+            )
+            return snapshot
         except Exception as e:
             logging.error(f"Error discovering files: {e}")
+            return {}
 
-        return discovered_files
-
-    async def _process_discovered_files(self, current_files: Set[Path]) -> None:
-        for path_obj in current_files:
+    async def _process_discovered_files(
+        self, snapshot: Dict[str, FileObservation]
+    ) -> None:
+        for file_path, observation in snapshot.items():
             try:
-                file_path = str(path_obj)
-
                 should_skip = await self.state_manager.should_skip_file_processing(
                     file_path
                 )
@@ -236,59 +273,55 @@ class FileScanner:
                     file_path
                 )
                 if existing_file is not None:
-                    await self._check_existing_file_changes(existing_file, file_path)
+                    await self._check_existing_file_changes(existing_file, observation)
                     continue
 
-                metadata = await get_file_metadata(file_path)
-                if metadata is None:
-                    continue
-
-                if metadata["size"] == 0:  # Check if empty
-                    logging.debug(f"Skipping empty file: {path_obj.name}")
+                if observation.size == 0:  # Check if empty
+                    logging.debug(f"Skipping empty file: {os.path.basename(file_path)}")
                     continue
 
                 # Publish event instead of calling state_manager directly
                 if self._event_bus:
                     event = FileDiscoveredEvent(
                         file_path=file_path,
-                        file_size=metadata["size"],
-                        last_write_time=metadata["last_write_time"].timestamp(),
+                        file_size=observation.size,
+                        last_write_time=observation.mtime,
                     )
                     await self._event_bus.publish(event)
                     logging.info(
-                        f"NEW FILE EVENT: {path_obj.name} ({metadata['size']} bytes)"
+                        f"NEW FILE EVENT: {os.path.basename(file_path)} ({observation.size} bytes)"
                     )
                 else:
                     # Fallback to old method if event bus is not available
                     await self.state_manager.add_file(
                         file_path=file_path,
-                        file_size=metadata["size"],
-                        last_write_time=metadata["last_write_time"],
+                        file_size=observation.size,
+                        last_write_time=observation.last_write_time,
                     )
 
             except Exception as e:
-                logging.error(f"Error processing file {path_obj}: {e}")
-
-    async def _check_existing_file_changes(self, tracked_file, file_path: str) -> None:
-        metadata = await get_file_metadata(file_path)
-        if metadata is None:
-            return
+                logging.error(f"Error processing file {file_path}: {e}")
 
-        if metadata["size"] != tracked_file.file_size:
+    async def _check_existing_file_changes(
+        self, tracked_file, observation: FileObservation
+    ) -> None:
+        if observation.size != tracked_file.file_size:
             logging.info(
                 f"SIZE CHANGE: {tracked_file.file_path} "
-                f"({tracked_file.file_size} → {metadata['size']} bytes) "
+                f"({tracked_file.file_size} → {observation.size} bytes) "
                 f"[UUID: {tracked_file.id[:8]}...]"
             )
 
             await self.state_manager.update_file_status_by_id(
                 file_id=tracked_file.id,
                 status=tracked_file.status,
-                file_size=metadata["size"],
-                last_write_time=metadata["last_write_time"],
+                file_size=observation.size,
+                last_write_time=observation.last_write_time,
             )
 
-    async def _check_file_stability(self) -> None:
+    async def _check_file_stability(
+        self, snapshot: Dict[str, FileObservation]
+    ) -> None:
         try:
             discovered_files = await self.state_manager.get_files_by_status(
                 FileStatus.DISCOVERED
@@ -300,59 +333,66 @@ class FileScanner:
             all_files_to_check = discovered_files + growing_files
 
             for tracked_file in all_files_to_check:
-                file_path = tracked_file.file_path
-
-                metadata = await get_file_metadata(file_path)
-                if metadata is None:
+                observation = snapshot.get(tracked_file.file_path)
+                if observation is None:
                     continue
 
-                await self._handle_growing_file_logic(metadata, tracked_file)
+                await self._handle_growing_file_logic(observation, tracked_file)
 
         except Exception as e:
             logging.error(f"Error in stability check: {e}")
 
     async def _handle_growing_file_logic(
-        self, metadata: Dict[str, Any], tracked_file: TrackedFile
+        self, observation: FileObservation, tracked_file: TrackedFile
     ) -> None:
-        file_path = str(metadata["path"])
+        file_path = observation.path
 
         await self.growing_file_detector.update_file_growth_info(
-            tracked_file, metadata["size"]
+            tracked_file, observation.size
         )
 
         (
             recommended_status,
             growth_info,
-        ) = await self.growing_file_detector.check_file_growth_status(tracked_file)
+        ) = await self.growing_file_detector.check_file_growth_status(
+            tracked_file, observation
+        )
 
         if recommended_status != tracked_file.status:
             if tracked_file.status == FileStatus.WAITING_FOR_NETWORK:
                 logging.debug(f"Preserving WAITING_FOR_NETWORK status for {file_path}")
                 return
 
-            # Publish event instead of calling state_manager directly
-            if self._event_bus:
-                event = FileStatusChangedEvent(
-                    file_id=tracked_file.id,
-                    file_path=file_path,
-                    old_status=tracked_file.status,
-                    new_status=recommended_status,
-                )
-                await self._event_bus.publish(event)
+            await self._publish_recommended_status(
+                tracked_file, recommended_status, observation.size
+            )
+            logging.info(
+                f"GROWTH UPDATE: {file_path} -> {recommended_status} [UUID: {tracked_file.id[:8]}...]"
+            )
+
+    async def _publish_recommended_status(
+        self, tracked_file: TrackedFile, recommended_status: FileStatus, file_size: int
+    ) -> None:
+        # Publish event instead of calling state_manager directly
+        if self._event_bus:
+            event = FileStatusChangedEvent(
+                file_id=tracked_file.id,
+                file_path=tracked_file.file_path,
+                old_status=tracked_file.status,
+                new_status=recommended_status,
+            )
+            await self._event_bus.publish(event)
 
-                if recommended_status == FileStatus.READY:
-                    await self._event_bus.publish(
-                        FileReadyEvent(
-                            file_id=tracked_file.id, file_path=tracked_file.file_path
-                        )
+            if recommended_status == FileStatus.READY:
+                await self._event_bus.publish(
+                    FileReadyEvent(
+                        file_id=tracked_file.id, file_path=tracked_file.file_path
                     )
-            else:
-                # Fallback to old method
-                await self.state_manager.update_file_status_by_id(
-                    file_id=tracked_file.id,
-                    status=recommended_status,
-                    file_size=metadata["size"],
                 )
-            logging.info(
-                f"GROWTH UPDATE: {file_path} -> {recommended_status} [UUID: {tracked_file.id[:8]}...]"
+        else:
+            # Fallback to old method
+            await self.state_manager.update_file_status_by_id(
+                file_id=tracked_file.id,
+                status=recommended_status,
+                file_size=file_size,
             )
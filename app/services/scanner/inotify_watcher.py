@@ -0,0 +1,226 @@
+"""
+Inotify Watcher - event-driven discovery for the scanner on Linux.
+
+Talks to the kernel's inotify API through ctypes, so no extra dependency is
+needed. Every directory under the source gets a watch; file events are turned
+into WatchEvents on an asyncio queue that the scanner consumes. Registering
+watches means walking the tree, so like the scanner's own walk it runs on a
+worker thread, never on the event loop. Inotify is a latency optimisation
+only: events can be lost (queue overflow, watch limits, network mounts that
+never report remote writes), so the polling scan keeps running as the
+reconciliation pass.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+from typing import Dict, NamedTuple, Optional, Set
+
+from .file_matcher import FileNameMatcher
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+# IN_IGNORED is always delivered, so removed directories clean up their own watch
+_WATCH_MASK = IN_CREATE | IN_MOVED_TO | IN_CLOSE_WRITE | IN_ONLYDIR
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+_READ_SIZE = 64 * 1024
+
+
+class WatchEvent(NamedTuple):
+    kind: str  # "appeared", "closed" or "overflow"
+    path: Optional[str] = None
+
+
+APPEARED = "appeared"
+CLOSED = "closed"
+OVERFLOW = "overflow"
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+# This class is responsible solely for translating inotify events on the source tree, adhering to SRP.
+class InotifyWatcher:
+    _libc = None
+    _libc_loaded = False
+
+    def __init__(
+        self, source_directory: str, matcher: Optional[FileNameMatcher] = None
+    ):
+        self.source_directory = os.path.abspath(source_directory)
+        self._matcher = matcher or FileNameMatcher.from_patterns()
+        self.events: "asyncio.Queue[WatchEvent]" = asyncio.Queue()
+        self._fd: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._watches: Dict[int, str] = {}
+        # Tree registrations for directories created while watching
+        self._registrations: Set[asyncio.Future] = set()
+
+    @classmethod
+    def is_supported(cls) -> bool:
+        return cls._get_libc() is not None
+
+    @classmethod
+    def _get_libc(cls):
+        if not cls._libc_loaded:
+            cls._libc = _load_libc()
+            cls._libc_loaded = True
+        return cls._libc
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._watches)
+
+    async def start(self) -> bool:
+        """Watch the whole source tree. Returns False when inotify is unavailable."""
+        libc = self._get_libc()
+        if libc is None:
+            return False
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            logging.warning(f"inotify_init1 fejlede: {os.strerror(errno)}")
+            return False
+
+        self._fd = fd
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(fd, self._read_events)
+        await asyncio.to_thread(self._watch_tree, self.source_directory, False)
+        if not self._watches:
+            # Source missing or unwatchable; the polling scan carries on alone
+            self.stop()
+            return False
+        logging.info(
+            f"Inotify watcher started on {self.source_directory} ({self.watch_count} directories)"
+        )
+        return True
+
+    def stop(self) -> None:
+        if self._fd is None:
+            return
+        for registration in self._registrations:
+            registration.cancel()
+        self._registrations.clear()
+        fd, self._fd = self._fd, None  # Registration threads see None and stop adding
+        if self._loop is not None:
+            self._loop.remove_reader(fd)
+        os.close(fd)
+        self._watches.clear()
+        logging.info("Inotify watcher stopped")
+
+    def _watch_tree(self, root: str, report_files: bool) -> None:
+        """
+        Add watches for `root` and every directory below it. When the tree is new
+        (created or moved in while we were watching), files that landed in it
+        before its watch existed are reported as appeared. Runs on a worker thread.
+        """
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            if not self._add_watch(directory):
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif report_files and self._matcher.matches(entry.name):
+                            self._emit_threadsafe(WatchEvent(APPEARED, entry.path))
+            except OSError as e:
+                logging.debug(f"Cannot list directory for inotify: {directory}: {e}")
+
+    def _add_watch(self, directory: str) -> bool:
+        fd = self._fd
+        if fd is None:
+            return False  # Stopped while the tree was being registered
+        wd = self._libc.inotify_add_watch(fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            # ENOSPC means fs.inotify.max_user_watches is exhausted; polling still covers it
+            logging.warning(
+                f"Kunne ikke tilføje inotify watch på {directory}: {os.strerror(errno)}"
+            )
+            return False
+        self._watches[wd] = directory
+        return True
+
+    def _read_events(self) -> None:
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logging.error(f"Error reading inotify events: {e}")
+            return
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            self._handle_event(wd, mask, name)
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            logging.warning("Inotify queue overflow - requesting full rescan")
+            self._emit(WatchEvent(OVERFLOW))
+            return
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+
+        directory = self._watches.get(wd)
+        if directory is None or not name:
+            return
+        path = os.path.join(directory, name)
+
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                registration = asyncio.ensure_future(
+                    asyncio.to_thread(self._watch_tree, path, True)
+                )
+                self._registrations.add(registration)
+                registration.add_done_callback(self._registrations.discard)
+            return
+
+        if not self._matcher.matches(name):
+            return
+        if mask & (IN_CREATE | IN_MOVED_TO):
+            self._emit(WatchEvent(APPEARED, path))
+        if mask & IN_CLOSE_WRITE:
+            self._emit(WatchEvent(CLOSED, path))
+        elif mask & IN_MOVED_TO:
+            # A file renamed into place is complete; treat it like a close
+            self._emit(WatchEvent(CLOSED, path))
+
+    def _emit(self, event: WatchEvent) -> None:
+        self.events.put_nowait(event)
+
+    def _emit_threadsafe(self, event: WatchEvent) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._emit, event)
+        except RuntimeError:
+            pass  # Event loop already closed; nobody is listening
@@ -0,0 +1,76 @@
+"""
+Observation Stage - the one place source files are stat'ed for growth tracking.
+
+The scanner's walk, its stability check and the growing-file monitor all need
+the current size of the same handful of in-flight files, each on its own
+timer. They now share this stage: the walk publishes what it stat'ed, and any
+consumer asking within `max_age_seconds` of that gets the same observation
+back. Whatever is missing or older is stat'ed in a single batched call on the
+walker's thread pool and published for the next consumer.
+"""
+
+import time
+from typing import Dict, Iterable, Mapping, Optional
+
+from .domain_objects import FileObservation
+from .tree_walker import SourceTreeWalker
+
+
+# This class is responsible solely for sharing fresh file observations between consumers, adhering to SRP.
+class FileObservationStage:
+    def __init__(self, walker: SourceTreeWalker, max_age_seconds: float):
+        self._walker = walker
+        self.max_age_seconds = max_age_seconds
+        self._observations: Dict[str, FileObservation] = {}
+        self.stat_calls = 0
+        self.reused = 0
+
+    @property
+    def walker(self) -> SourceTreeWalker:
+        return self._walker
+
+    def publish(self, observations: Mapping[str, FileObservation]) -> None:
+        """Offer observations taken elsewhere (e.g. by the walk) to later consumers."""
+        cutoff = time.time() - self.max_age_seconds
+        for path, observation in observations.items():
+            if observation.observed_at >= cutoff:
+                self._observations[path] = observation
+
+    async def observe_many(
+        self, paths: Iterable[str]
+    ) -> Dict[str, Optional[FileObservation]]:
+        """
+        Current observation per path: None if the file is gone, and absent if
+        the source did not answer, so callers can tell "removed" from "unknown".
+        """
+        cutoff = time.time() - self.max_age_seconds
+        self._prune(cutoff)
+        result: Dict[str, Optional[FileObservation]] = {}
+        to_stat = []
+        for path in paths:
+            observation = self._observations.get(path)
+            if observation is not None:
+                result[path] = observation
+            else:
+                to_stat.append(path)
+        self.reused += len(result)
+
+        if to_stat:
+            self.stat_calls += len(to_stat)
+            fresh = await self._walker.observe_many(to_stat)
+            for path, observation in fresh.items():
+                result[path] = observation
+                if observation is None:
+                    self._observations.pop(path, None)
+                else:
+                    self._observations[path] = observation
+        return result
+
+    def _prune(self, cutoff: float) -> None:
+        stale = [
+            path
+            for path, observation in self._observations.items()
+            if observation.observed_at < cutoff
+        ]
+        for path in stale:
+            del self._observations[path]
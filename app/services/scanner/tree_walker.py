@@ -0,0 +1,375 @@
+"""
+Tree Walker - one os.scandir pass over the source tree per scan iteration.
+
+os.walk already uses scandir internally but throws the DirEntry objects away,
+so every file used to be stat'ed again (exists + stat) by discovery, then by
+the stability check. Here each candidate is stat'ed once through its DirEntry,
+and the resulting snapshot is shared by every stage of the scan. Directories
+that have not changed since the previous pass are not listed again at all,
+and the walk itself runs on worker threads, never on the event loop.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+from .domain_objects import FileObservation
+from .file_matcher import FileNameMatcher
+
+_RACY_WINDOW_NS = 2_000_000_000  # Coarsest common mtime granularity (FAT/SMB) is 2 s
+
+
+def observe_file(path: str) -> Optional[FileObservation]:
+    """Stat a single file outside a walk; None when it is gone or unreadable."""
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return None
+    return FileObservation(path=path, size=stat_result.st_size, mtime=stat_result.st_mtime)
+
+
+class _Heartbeat:
+    """When a worker last finished a filesystem call; None while the work is still queued."""
+
+    __slots__ = ("last_beat",)
+
+    def __init__(self) -> None:
+        self.last_beat: Optional[float] = None
+
+    def beat(self) -> None:
+        self.last_beat = time.monotonic()
+
+
+def _observe_batch(
+    heartbeat: _Heartbeat, paths: List[str]
+) -> Dict[str, Optional[FileObservation]]:
+    observations = {}
+    for path in paths:
+        observations[path] = observe_file(path)
+        heartbeat.beat()
+    return observations
+
+
+def _observe_one(heartbeat: _Heartbeat, path: str) -> Optional[FileObservation]:
+    return observe_file(path)
+
+
+def _started(heartbeat: _Heartbeat, func, args):
+    # The stall clock starts when a thread picks the call up, not when it is queued
+    heartbeat.beat()
+    return func(heartbeat, *args)
+
+
+@dataclass(slots=True)
+class DirectoryListing:
+    """What one directory held the last time it was listed."""
+
+    mtime_ns: int
+    subdirectories: List[str]
+    files: Dict[str, FileObservation]
+    trusted: bool  # False if listed so soon after a change that the mtime may repeat
+
+
+# This class is responsible solely for walking the source tree incrementally, adhering to SRP.
+class SourceTreeWalker:
+    """
+    A directory's mtime only changes when entries are added, removed or renamed,
+    so a directory whose mtime is unchanged since the last pass keeps its cached
+    listing and costs one stat instead of a scandir plus a stat per file.
+
+    File sizes inside an unchanged directory are not re-read either, except for
+    `refresh_paths` (the files the pipeline is still watching grow) and files
+    that were empty when listed, which discovery skips until they get data. A
+    full re-listing runs every `full_rescan_interval_seconds` as a safety net
+    for filesystems with coarse or unreliable directory mtimes.
+
+    All filesystem calls run on the walker's own thread pool, up to
+    `max_workers` directories at a time, so a slow or hung source mount never
+    blocks the event loop. The timeout applies to each filesystem call, not to
+    the whole directory: a visit is abandoned once a single stat or scandir
+    step has not returned within `directory_timeout_seconds` (time spent queued
+    does not count), so a large but slow directory is still listed. An
+    abandoned directory is reported in `unreachable_directories`, keeps its
+    previous listing, and is not visited again until its stuck call returns.
+
+    The pool has `max_workers` spare threads for stuck calls. If that many are
+    stuck at once the pool is abandoned to them and a fresh one takes over.
+
+    Only files accepted by `matcher` are stat'ed or kept; the rest are judged
+    on their DirEntry name alone.
+    """
+
+    def __init__(
+        self,
+        full_rescan_interval_seconds: float = 300.0,
+        max_workers: int = 4,
+        directory_timeout_seconds: float = 10.0,
+        matcher: Optional[FileNameMatcher] = None,
+    ):
+        self.matcher = matcher or FileNameMatcher.from_patterns()
+        self.full_rescan_interval_seconds = full_rescan_interval_seconds
+        self.max_workers = max(1, max_workers)
+        self.directory_timeout_seconds = directory_timeout_seconds
+        self._cache: Dict[str, DirectoryListing] = {}
+        self._last_full_walk: Optional[float] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stuck_calls: Set[asyncio.Future] = set()  # Abandoned, still running in the pool
+        self._stuck_visits: Dict[str, asyncio.Future] = {}
+        self.directories_listed = 0
+        self.directories_reused = 0
+        self.unreachable_directories: List[str] = []
+
+    def invalidate(self) -> None:
+        """Forget every cached listing so the next walk re-lists the whole tree."""
+        self._cache.clear()
+        self._last_full_walk = None
+
+    def close(self) -> None:
+        """Release the worker threads; a later walk starts a fresh pool."""
+        if self._executor is not None:
+            # Threads stuck on a hung mount cannot be joined, so do not wait for them
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._stuck_calls.clear()
+
+    async def observe(self, path: str) -> Optional[FileObservation]:
+        """observe_file on the walker's threads, None if the source does not answer."""
+        try:
+            return await self._run(_observe_one, path)
+        except asyncio.TimeoutError:
+            logging.warning(f"Stat timed out for {path}")
+            return None
+
+    async def observe_many(
+        self, paths: Iterable[str]
+    ) -> Dict[str, Optional[FileObservation]]:
+        """
+        Stat a batch of files in one worker-thread call. Gone files map to None;
+        if the source does not answer in time the result is empty (unknown).
+        """
+        paths = list(paths)
+        if not paths:
+            return {}
+        try:
+            return await self._run(_observe_batch, paths)
+        except asyncio.TimeoutError:
+            logging.warning(f"Batch stat of {len(paths)} files timed out")
+            return {}
+
+    async def walk(
+        self, source_directory: str, refresh_paths: Iterable[str] = ()
+    ) -> Dict[str, FileObservation]:
+        """The whole snapshot at once: absolute path -> FileObservation."""
+        snapshot: Dict[str, FileObservation] = {}
+        async for batch in self.walk_stream(source_directory, refresh_paths):
+            snapshot.update(batch)
+        return snapshot
+
+    async def walk_stream(
+        self, source_directory: str, refresh_paths: Iterable[str] = ()
+    ) -> AsyncIterator[Dict[str, FileObservation]]:
+        """
+        Yield each directory's candidate files as soon as that directory is done.
+
+        Mirrors os.walk semantics: symlinked files are followed, symlinked
+        directories are not descended into, and unreadable directories are skipped.
+        A missing or non-directory source yields nothing. The listing cache and
+        the counters are only updated once the stream has been fully consumed.
+        """
+        now = time.monotonic()
+        full = (
+            self._last_full_walk is None
+            or now - self._last_full_walk >= self.full_rescan_interval_seconds
+        )
+
+        refresh_by_directory: Dict[str, List[str]] = {}
+        for path in refresh_paths:
+            refresh_by_directory.setdefault(os.path.dirname(path), []).append(path)
+
+        cache: Dict[str, DirectoryListing] = {}
+        unreachable: List[str] = []
+        listed = reused = 0
+        to_visit = deque([os.path.abspath(source_directory)])
+        in_flight: Dict[asyncio.Future, Tuple[str, asyncio.Future]] = {}
+
+        try:
+            while to_visit or in_flight:
+                while to_visit and len(in_flight) < self.max_workers:
+                    directory = to_visit.popleft()
+                    stuck = self._stuck_visits.get(directory)
+                    if stuck is not None:
+                        if not stuck.done():
+                            # Its last visit is still hanging; do not stack another on it
+                            unreachable.append(directory)
+                            continue
+                        del self._stuck_visits[directory]
+                    call, heartbeat = self._submit(
+                        self._visit, directory, full, refresh_by_directory.get(directory, ())
+                    )
+                    visit = asyncio.ensure_future(self._wait(call, heartbeat))
+                    in_flight[visit] = (directory, call)
+
+                if not in_flight:
+                    break
+                done, _ = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
+                )
+                for visit in done:
+                    directory, call = in_flight.pop(visit)
+                    try:
+                        listing, was_listed = visit.result()
+                    except asyncio.TimeoutError:
+                        logging.warning(
+                            f"Directory scan stalled for {self.directory_timeout_seconds}s: "
+                            f"{directory} - skipping it until the stuck call returns"
+                        )
+                        self._stuck_visits[directory] = call
+                        unreachable.append(directory)
+                        continue
+                    if listing is None:
+                        continue
+                    if was_listed:
+                        listed += 1
+                    else:
+                        reused += 1
+                    cache[directory] = listing
+                    to_visit.extend(listing.subdirectories)
+                    if listing.files:
+                        yield listing.files
+        finally:
+            for visit in in_flight:
+                visit.cancel()
+
+        for directory in unreachable:
+            # Keep what we knew about the unreachable subtree for the next pass
+            prefix = directory + os.sep
+            for path, listing in self._cache.items():
+                if path == directory or path.startswith(prefix):
+                    cache.setdefault(path, listing)
+
+        if full:
+            self._last_full_walk = now
+        self._cache = cache
+        self.directories_listed = listed
+        self.directories_reused = reused
+        self.unreachable_directories = unreachable
+
+    async def _run(self, func, *args):
+        return await self._wait(*self._submit(func, *args))
+
+    def _submit(self, func, *args) -> Tuple[asyncio.Future, _Heartbeat]:
+        """Start func(heartbeat, *args) on the pool; it beats after each filesystem call."""
+        if self._executor is None:
+            # Room for max_workers live calls next to as many stuck ones
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers * 2, thread_name_prefix="source-walker"
+            )
+        heartbeat = _Heartbeat()
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, _started, heartbeat, func, args), heartbeat
+
+    async def _wait(self, call: asyncio.Future, heartbeat: _Heartbeat):
+        """
+        The call's result, or TimeoutError once it has gone `directory_timeout_seconds`
+        without finishing a filesystem call. The stuck call keeps its thread.
+        """
+        timeout = self.directory_timeout_seconds
+        while True:
+            last_beat = heartbeat.last_beat
+            remaining = timeout if last_beat is None else last_beat + timeout - time.monotonic()
+            if remaining <= 0:
+                self._abandon(call)
+                raise asyncio.TimeoutError
+            done, _ = await asyncio.wait({call}, timeout=remaining)
+            if done:
+                return call.result()
+
+    def _abandon(self, call: asyncio.Future) -> None:
+        self._stuck_calls = {stuck for stuck in self._stuck_calls if not stuck.done()}
+        self._stuck_calls.add(call)
+        if len(self._stuck_calls) >= self.max_workers and self._executor is not None:
+            logging.error(
+                f"{len(self._stuck_calls)} source walker threads are stuck - "
+                f"leaving them behind and starting a fresh pool"
+            )
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._stuck_calls.clear()
+
+    def _visit(
+        self,
+        heartbeat: _Heartbeat,
+        directory: str,
+        full: bool,
+        refresh_paths: Iterable[str],
+    ) -> Tuple[Optional[DirectoryListing], bool]:
+        """
+        Runs on a worker thread. Returns the directory's listing (None if it is
+        unreadable) and whether it had to be listed rather than reused.
+        """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError as e:
+            logging.debug(f"Cannot scan directory {directory}: {e}")
+            return None, False
+        heartbeat.beat()
+
+        listing = None if full else self._cache.get(directory)
+        if listing is not None and listing.trusted and listing.mtime_ns == mtime_ns:
+            # Empty files are not tracked yet, so nothing else would notice them fill up
+            empty_paths = [
+                path for path, observation in listing.files.items() if observation.size == 0
+            ]
+            for path in {*refresh_paths, *empty_paths}:
+                if path not in listing.files:
+                    continue
+                observation = observe_file(path)
+                heartbeat.beat()
+                if observation is None:
+                    del listing.files[path]
+                else:
+                    listing.files[path] = observation
+            return listing, False
+
+        return self._list_directory(heartbeat, directory, mtime_ns), True
+
+    def _list_directory(
+        self, heartbeat: _Heartbeat, directory: str, mtime_ns: int
+    ) -> Optional[DirectoryListing]:
+        matches = self.matcher.matches
+        subdirectories: List[str] = []
+        files: Dict[str, FileObservation] = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    heartbeat.beat()
+                    try:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirectories.append(entry.path)
+                            continue
+                        # Filter on the name first so non-candidates are never stat'ed
+                        if not matches(entry.name):
+                            continue
+                        stat_result = entry.stat()
+                        heartbeat.beat()
+                    except OSError:
+                        # Vanished between listing and stat, or a dangling symlink
+                        continue
+                    files[entry.path] = FileObservation(
+                        path=entry.path,
+                        size=stat_result.st_size,
+                        mtime=stat_result.st_mtime,
+                    )
+        except OSError as e:
+            logging.debug(f"Cannot scan directory {directory}: {e}")
+            return None
+
+        # A change landing in the same mtime tick as this listing would go unseen
+        trusted = time.time_ns() - mtime_ns > _RACY_WINDOW_NS
+        return DirectoryListing(mtime_ns, subdirectories, files, trusted)
@@ -0,0 +1,154 @@
+"""
+Watch Event Handler - turns inotify events into scanner work.
+
+The InotifyWatcher only reports what the kernel saw. This handler owns the
+watcher's lifetime and reacts to its events: an appeared file is observed and
+handed to discovery at once, a closed file gets a short settle window and is
+then fast-tracked to READY, and a queue overflow asks the scanner for an early
+full poll. Polling keeps running next to it and reconciles anything missed.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.models import FileStatus, TrackedFile
+from app.services.growing_file_detector import GrowingFileDetector
+from app.services.state_manager import StateManager
+from .domain_objects import FileObservation
+from .file_matcher import FileNameMatcher
+from .inotify_watcher import APPEARED, CLOSED, OVERFLOW, InotifyWatcher
+from .tree_walker import SourceTreeWalker
+
+DiscoveryCallback = Callable[[Dict[str, FileObservation]], Awaitable[None]]
+StatusCallback = Callable[[TrackedFile, FileStatus, int], Awaitable[None]]
+
+
+# This class is responsible solely for reacting to inotify events on the source tree, adhering to SRP.
+class WatchEventHandler:
+    def __init__(
+        self,
+        source_directory: str,
+        close_settle_seconds: float,
+        state_manager: StateManager,
+        growing_file_detector: GrowingFileDetector,
+        tree_walker: SourceTreeWalker,
+        matcher: FileNameMatcher,
+        process_discovered_files: DiscoveryCallback,
+        publish_recommended_status: StatusCallback,
+        request_rescan: Callable[[], None],
+    ):
+        self.source_directory = source_directory
+        self.close_settle_seconds = close_settle_seconds
+        self.state_manager = state_manager
+        self.growing_file_detector = growing_file_detector
+        self._tree_walker = tree_walker
+        self._matcher = matcher
+        self._process_discovered_files = process_discovered_files
+        self._publish_recommended_status = publish_recommended_status
+        self._request_rescan = request_rescan
+        self._watcher: Optional[InotifyWatcher] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self._close_checks: Dict[str, asyncio.Task] = {}
+
+    def start(self) -> None:
+        """Start watching in the background; registering the tree does not hold up the caller."""
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_loop())
+
+    async def stop(self) -> None:
+        for task in list(self._close_checks.values()):
+            task.cancel()
+        self._close_checks.clear()
+        if self._watch_task and not self._watch_task.done():
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                logging.debug("Watch task cancelled successfully")
+        if self._watcher is not None:
+            self._watcher.stop()
+        self._watcher = None
+        self._watch_task = None
+
+    async def _start_watcher(self) -> bool:
+        if not InotifyWatcher.is_supported():
+            logging.info("Inotify not available on this platform - polling only")
+            return False
+        watcher = InotifyWatcher(self.source_directory, self._matcher)
+        # Set before start so a stop during tree registration still closes it
+        self._watcher = watcher
+        if not await watcher.start():
+            logging.warning("Inotify watcher could not start - polling only")
+            self._watcher = None
+            return False
+        return True
+
+    async def _watch_loop(self) -> None:
+        if not await self._start_watcher():
+            return
+        while True:
+            event = await self._watcher.events.get()
+            try:
+                if event.kind == APPEARED:
+                    await self._on_file_appeared(event.path)
+                elif event.kind == CLOSED:
+                    self._schedule_close_check(event.path)
+                elif event.kind == OVERFLOW:
+                    self._request_rescan()
+            except Exception as e:
+                logging.error(f"Error handling watch event {event}: {e}")
+
+    async def _on_file_appeared(self, file_path: str) -> None:
+        observation = await self._tree_walker.observe(file_path)
+        if observation is not None:
+            await self._process_discovered_files({file_path: observation})
+
+    def _schedule_close_check(self, file_path: str) -> None:
+        # A new close restarts the settle window for that file
+        previous = self._close_checks.pop(file_path, None)
+        if previous is not None:
+            previous.cancel()
+        self._close_checks[file_path] = asyncio.create_task(
+            self._settle_closed_file(file_path)
+        )
+
+    async def _settle_closed_file(self, file_path: str) -> None:
+        """
+        Fast-track a file whose writer closed it: if its size and mtime hold for
+        the settle window, decide readiness now instead of after the growth timeout.
+        """
+        try:
+            at_close = await self._tree_walker.observe(file_path)
+            if at_close is None:
+                return
+            await asyncio.sleep(self.close_settle_seconds)
+            settled = await self._tree_walker.observe(file_path)
+            if settled != at_close:
+                # Written again (or gone); the next close or the poll decides
+                return
+
+            await self._process_discovered_files({file_path: settled})
+            tracked_file = await self.state_manager.get_active_file_by_path(file_path)
+            if tracked_file is None:
+                return
+
+            recommended_status = (
+                await self.growing_file_detector.complete_on_write_close(
+                    tracked_file, settled.size
+                )
+            )
+            if recommended_status is not None and recommended_status != tracked_file.status:
+                logging.info(
+                    f"CLOSE-WRITE: {file_path} -> {recommended_status} [UUID: {tracked_file.id[:8]}...]"
+                )
+                await self._publish_recommended_status(
+                    tracked_file, recommended_status, settled.size
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error settling closed file {file_path}: {e}")
+        finally:
+            if self._close_checks.get(file_path) is asyncio.current_task():
+                del self._close_checks[file_path]
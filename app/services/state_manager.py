@@ -1,16 +1,31 @@
 import asyncio
 import logging
+import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set, Callable, Awaitable
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple, Callable, Awaitable
 
 from app.core.events.event_bus import DomainEventBus
 from app.core.events.file_events import (
     FileDiscoveredEvent,
     FileStatusChangedEvent,
     FileReadyEvent,
+    FilesBatchUpdatedEvent,
 )
+from app.core.file_history import HISTORY_STATUSES
 from app.core.file_repository import FileRepository
-from app.models import TrackedFile, FileStatus, FileStateUpdate, RetryInfo
+from app.core.file_statistics import GROWING_STATUSES
+from app.core.retry_scheduler import RetryScheduler
+from app.core.sharded_lock import ShardedLock
+from app.core.transfer_progress import TransferProgress
+from app.models import CopyCheckpoint, TrackedFile, FileStatus, FileStateUpdate, RetryInfo
+
+TERMINAL_STATUSES = frozenset(
+    {FileStatus.FAILED, FileStatus.COMPLETED, FileStatus.REMOVED}
+)
+
+# Refreshed on every growth poll: set in place, but never on their own a reason
+# to write a file or announce it to clients
+BOOKKEEPING_FIELDS = frozenset({"last_growth_check"})
 
 
 class StateManager:
@@ -18,16 +33,19 @@ class StateManager:
         self,
         file_repository: FileRepository,
         cooldown_minutes: int = 60,
-        event_bus: Optional[DomainEventBus] = None
+        event_bus: Optional[DomainEventBus] = None,
+        lock_shards: int = 64,
     ):
         self._file_repository = file_repository
-        self._lock = asyncio.Lock()
+        # Single-file mutations lock only their own shard; reads take no lock at
+        # all (repository calls never yield, and full reads use its snapshots).
+        self._locks = ShardedLock(lock_shards)
         self._subscribers: List[Callable[[FileStateUpdate], Awaitable[None]]] = []
         self._cooldown_minutes = cooldown_minutes
         self._event_bus = event_bus  # Event bus for decoupled communication
 
-        # Retry task tracking - only tasks, state is in TrackedFile.retry_info
-        self._retry_tasks: Dict[str, asyncio.Task] = {}
+        # One timer for all pending retries - state is in TrackedFile.retry_info
+        self._retry_scheduler = RetryScheduler(self._execute_due_retries)
 
         if self._event_bus:
             asyncio.create_task(self._subscribe_to_events())
@@ -59,82 +77,70 @@ class StateManager:
             file_id=event.file_id, status=event.new_status
         )
 
-    async def _get_current_file_for_path(self, file_path: str) -> Optional[TrackedFile]:
-        all_files = await self._file_repository.get_all()
-        candidates = [f for f in all_files if f.file_path == file_path]
-        if not candidates:
-            return None
+    async def restore_persisted_state(self) -> int:
+        """
+        Warm restart: load the persisted files and put interrupted work back in the pipeline.
 
-        def sort_key(f: TrackedFile):
-            active_statuses = {
-                FileStatus.COPYING: 1,
-                FileStatus.IN_QUEUE: 2,
-                FileStatus.GROWING_COPY: 3,
-                FileStatus.READY_TO_START_GROWING: 4,
-                FileStatus.READY: 5,
-                FileStatus.GROWING: 6,
-                FileStatus.DISCOVERED: 7,
-                FileStatus.WAITING_FOR_SPACE: 8,
-                FileStatus.WAITING_FOR_NETWORK: 9,
-                FileStatus.COMPLETED: 10,
-                FileStatus.FAILED: 11,
-                FileStatus.REMOVED: 12,
-                FileStatus.SPACE_ERROR: 13,
-            }
-
-            priority = active_statuses.get(f.status, 99)
-            time_priority = -(f.discovered_at.timestamp() if f.discovered_at else 0)
-            return (priority, time_priority)
-
-        return min(candidates, key=sort_key)
+        Files that were queued or mid-copy go straight back to READY (their stability
+        was already proven) and pending space retries are re-armed for their remaining
+        delay. Everything else resumes in the status it had before the restart.
+        """
+        loaded_count = await self._file_repository.load()
+        if loaded_count == 0:
+            return 0
 
-    async def _get_active_file_for_path_internal(
-        self, file_path: str
-    ) -> Optional[TrackedFile]:
-        active_statuses = {
-            FileStatus.DISCOVERED,
-            FileStatus.READY,
-            FileStatus.GROWING,
-            FileStatus.READY_TO_START_GROWING,
+        in_flight_statuses = {
             FileStatus.IN_QUEUE,
             FileStatus.COPYING,
             FileStatus.GROWING_COPY,
-            FileStatus.WAITING_FOR_SPACE,
-            FileStatus.SPACE_ERROR,
-            FileStatus.WAITING_FOR_NETWORK,
         }
-        all_files = await self._file_repository.get_all()
-        candidates = [
-            f
-            for f in all_files
-            if f.file_path == file_path and f.status in active_statuses
-        ]
-        if not candidates:
-            return None
+        retries_to_restore = []
+        requeued_count = 0
+        async with self._locks.exclusive():
+            for status in in_flight_statuses:
+                for tracked_file in await self._file_repository.get_by_status(status):
+                    # copy_checkpoint is kept so the re-queued copy can resume
+                    tracked_file.status = FileStatus.READY
+                    tracked_file.copy_progress = 0.0
+                    tracked_file.bytes_copied = 0
+                    tracked_file.copy_speed_mbps = 0.0
+                    await self._file_repository.update(tracked_file)
+                    requeued_count += 1
+            waiting_files = await self._file_repository.get_by_status(
+                FileStatus.WAITING_FOR_SPACE
+            )
+            retries_to_restore = [f for f in waiting_files if f.retry_info]
+
+        now = datetime.now()
+        for tracked_file in retries_to_restore:
+            retry_info = tracked_file.retry_info
+            remaining_seconds = max(0.0, (retry_info.retry_at - now).total_seconds())
+            await self.schedule_retry(
+                tracked_file.id,
+                remaining_seconds,
+                retry_info.reason,
+                retry_info.retry_type,
+            )
+
+        logging.info(
+            f"Restored {loaded_count} persisted files "
+            f"({requeued_count} interrupted jobs reset to READY, "
+            f"{len(retries_to_restore)} retries re-armed)"
+        )
+        return loaded_count
 
-        def sort_key(f: TrackedFile):
-            active_priority = {
-                FileStatus.COPYING: 1,
-                FileStatus.IN_QUEUE: 2,
-                FileStatus.GROWING_COPY: 3,
-                FileStatus.READY_TO_START_GROWING: 4,
-                FileStatus.READY: 5,
-                FileStatus.GROWING: 6,
-                FileStatus.DISCOVERED: 7,
-                FileStatus.WAITING_FOR_SPACE: 8,
-                FileStatus.WAITING_FOR_NETWORK: 8,
-                FileStatus.SPACE_ERROR: 9,
-            }
-            priority = active_priority.get(f.status, 99)
-            time_priority = -(f.discovered_at.timestamp() if f.discovered_at else 0)
-            return (priority, time_priority)
-
-        return min(candidates, key=sort_key)
+    async def _get_current_file_for_path(self, file_path: str) -> Optional[TrackedFile]:
+        return await self._file_repository.get_current_for_path(file_path)
+
+    async def _get_active_file_for_path_internal(
+        self, file_path: str
+    ) -> Optional[TrackedFile]:
+        return await self._file_repository.get_active_for_path(file_path)
 
     async def add_file(
         self, file_path: str, file_size: int, last_write_time: Optional[datetime] = None
     ) -> TrackedFile:
-        async with self._lock:
+        async with self._locks.for_key(file_path):
             existing_active = await self._get_active_file_for_path_internal(file_path)
             if existing_active:
                 logging.debug(f"Fil allerede tracked som aktiv: {file_path}")
@@ -177,11 +183,10 @@ class StateManager:
         return tracked_file
 
     async def get_file_by_path(self, file_path: str) -> Optional[TrackedFile]:
-        async with self._lock:
-            current_file = await self._get_current_file_for_path(file_path)
-            if current_file and current_file.status == FileStatus.REMOVED:
-                return None
-            return current_file
+        current_file = await self._get_current_file_for_path(file_path)
+        if current_file and current_file.status == FileStatus.REMOVED:
+            return None
+        return current_file
 
     def _is_space_error_in_cooldown(
         self, tracked_file: TrackedFile, cooldown_minutes: int = 60
@@ -206,108 +211,77 @@ class StateManager:
     async def should_skip_file_processing(
         self, file_path: str, cooldown_minutes: int = None
     ) -> bool:
-        async with self._lock:
-            existing_file = await self._get_current_file_for_path(file_path)
-            if not existing_file:
-                return False
-            if cooldown_minutes is None:
-                cooldown_minutes = self._cooldown_minutes
-            if existing_file.status == FileStatus.SPACE_ERROR:
-                return self._is_space_error_in_cooldown(existing_file, cooldown_minutes)
+        existing_file = await self._get_current_file_for_path(file_path)
+        if not existing_file:
             return False
+        if cooldown_minutes is None:
+            cooldown_minutes = self._cooldown_minutes
+        if existing_file.status == FileStatus.SPACE_ERROR:
+            return self._is_space_error_in_cooldown(existing_file, cooldown_minutes)
+        return False
+
+    async def get_resume_checkpoint(
+        self, tracked_file: TrackedFile
+    ) -> Optional[CopyCheckpoint]:
+        """
+        The checkpoint a new copy of this file may resume from: its own, or that
+        of the entry it replaced if that one FAILED. Anything newer (a completed
+        or removed entry) means the old destination is not ours to continue.
+        """
+        if tracked_file.copy_checkpoint is not None:
+            return tracked_file.copy_checkpoint
+        # get_by_path orders by currency, not age; the decision needs the newest entry
+        previous = [
+            entry
+            for entry in await self._file_repository.get_by_path(tracked_file.file_path)
+            if entry.id != tracked_file.id
+        ]
+        if not previous:
+            return None
+        latest = max(previous, key=lambda entry: entry.discovered_at)
+        if latest.status == FileStatus.FAILED:
+            return latest.copy_checkpoint
+        return None
 
     async def get_active_file_by_path(self, file_path: str) -> Optional[TrackedFile]:
-        async with self._lock:
-            active_statuses = {
-                FileStatus.DISCOVERED,
-                FileStatus.READY,
-                FileStatus.GROWING,
-                FileStatus.READY_TO_START_GROWING,
-                FileStatus.IN_QUEUE,
-                FileStatus.COPYING,
-                FileStatus.GROWING_COPY,
-                FileStatus.WAITING_FOR_SPACE,
-                FileStatus.WAITING_FOR_NETWORK,
-                FileStatus.SPACE_ERROR,
-            }
-            all_files = await self._file_repository.get_all()
-            candidates = [
-                f
-                for f in all_files
-                if f.file_path == file_path and f.status in active_statuses
-            ]
-            if not candidates:
-                return None
-
-            def sort_key(f: TrackedFile):
-                active_priority = {
-                    FileStatus.COPYING: 1,
-                    FileStatus.IN_QUEUE: 2,
-                    FileStatus.GROWING_COPY: 3,
-                    FileStatus.READY_TO_START_GROWING: 4,
-                    FileStatus.READY: 5,
-                    FileStatus.GROWING: 6,
-                    FileStatus.DISCOVERED: 7,
-                    FileStatus.WAITING_FOR_SPACE: 8,
-                    FileStatus.WAITING_FOR_NETWORK: 8,
-                    FileStatus.SPACE_ERROR: 9,
-                }
-                priority = active_priority.get(f.status, 99)
-                time_priority = -(f.discovered_at.timestamp() if f.discovered_at else 0)
-                return (priority, time_priority)
-
-            return min(candidates, key=sort_key)
+        return await self._get_active_file_for_path_internal(file_path)
 
     async def get_all_files(self) -> List[TrackedFile]:
-        async with self._lock:
-            return await self._file_repository.get_all()
-
-    def _is_more_current(self, file1: TrackedFile, file2: TrackedFile) -> bool:
-        active_statuses = {
-            FileStatus.COPYING: 1,
-            FileStatus.IN_QUEUE: 2,
-            FileStatus.GROWING_COPY: 3,
-            FileStatus.READY_TO_START_GROWING: 4,
-            FileStatus.READY: 5,
-            FileStatus.GROWING: 6,
-            FileStatus.DISCOVERED: 7,
-            FileStatus.WAITING_FOR_SPACE: 8,
-            FileStatus.WAITING_FOR_NETWORK: 8,
-            FileStatus.COMPLETED: 9,
-            FileStatus.FAILED: 10,
-            FileStatus.REMOVED: 11,
-            FileStatus.SPACE_ERROR: 12,
-        }
-        priority1 = active_statuses.get(file1.status, 99)
-        priority2 = active_statuses.get(file2.status, 99)
-        if priority1 != priority2:
-            return priority1 < priority2
-        time1 = file1.discovered_at.timestamp() if file1.discovered_at else 0
-        time2 = file2.discovered_at.timestamp() if file2.discovered_at else 0
-        return time1 > time2
+        """Every file including the full history - prefer get_active_files/get_history_page."""
+        return await self._file_repository.get_all()
+
+    async def get_active_files(self) -> List[TrackedFile]:
+        """Files that have not finished yet (no history entries)."""
+        return list(self._file_repository.snapshot())
+
+    async def get_history_page(
+        self, offset: int = 0, limit: int = 100, status: Optional[FileStatus] = None
+    ) -> Tuple[List[TrackedFile], int]:
+        """Newest-first page of COMPLETED/FAILED/REMOVED files and the total count."""
+        return await self._file_repository.get_history_page(offset, limit, status)
 
     async def get_files_by_status(self, status: FileStatus) -> List[TrackedFile]:
-        async with self._lock:
-            current_files = {}
-            all_files = await self._file_repository.get_all()
-            for tracked_file in all_files:
-                if tracked_file.status == status:
-                    current = current_files.get(tracked_file.file_path)
-                    if not current or self._is_more_current(tracked_file, current):
-                        current_files[tracked_file.file_path] = tracked_file
-            return list(current_files.values())
-
-    async def cleanup_missing_files(self, existing_paths: Set[str]) -> int:
+        return await self._file_repository.get_current_by_status(status)
+
+    async def cleanup_missing_files(
+        self, existing_paths: Set[str], unreachable_directories: Iterable[str] = ()
+    ) -> int:
         removed_count = 0
-        async with self._lock:
-            current_files = {}
-            all_files = await self._file_repository.get_all()
-            for tracked_file in all_files:
-                current = current_files.get(tracked_file.file_path)
-                if not current or self._is_more_current(tracked_file, current):
-                    current_files[tracked_file.file_path] = tracked_file
-            for file_path, tracked_file in current_files.items():
+        unreachable_prefixes = tuple(
+            os.path.join(directory, "") for directory in unreachable_directories
+        )
+        async with self._locks.exclusive():
+            # History entries only need attention while FAILED (they become REMOVED)
+            current_files = await self._file_repository.get_current_files()
+            current_files += await self._file_repository.get_current_by_status(
+                FileStatus.FAILED
+            )
+            for tracked_file in current_files:
+                file_path = tracked_file.file_path
                 if file_path not in existing_paths:
+                    if unreachable_prefixes and file_path.startswith(unreachable_prefixes):
+                        logging.debug(f"Bevarer fil i utilgængelig mappe: {file_path}")
+                        continue
                     if tracked_file.status == FileStatus.COMPLETED:
                         logging.debug(f"Bevarer completed fil i memory: {file_path}")
                         continue
@@ -322,7 +296,11 @@ class StateManager:
                         continue
                     if tracked_file.status != FileStatus.REMOVED:
                         old_status = tracked_file.status
+                        tracked_file = await self._file_repository.get_for_update(
+                            tracked_file.id
+                        )
                         tracked_file.status = FileStatus.REMOVED
+                        await self._file_repository.update(tracked_file)
                         removed_count += 1
                         logging.info(
                             f"Marked missing file as REMOVED: {file_path} (was {old_status})"
@@ -334,29 +312,16 @@ class StateManager:
         return removed_count
 
     async def cleanup_old_files(self, max_age_hours: int) -> int:
-        removed_count = 0
-        now = datetime.now()
-        cutoff_time = now - timedelta(hours=max_age_hours)
-        async with self._lock:
-            to_remove_ids = []
-            all_files = await self._file_repository.get_all()
-            for tracked_file in all_files:
-                file_age_timestamp = (
-                    tracked_file.completed_at
-                    or tracked_file.failed_at
-                    or tracked_file.discovered_at
-                )
-                if file_age_timestamp and file_age_timestamp < cutoff_time:
-                    to_remove_ids.append(tracked_file.id)
-            for file_id in to_remove_ids:
-                removed_file = await self._file_repository.get_by_id(file_id)
-                if removed_file:
-                    await self._file_repository.remove(file_id)
-                    removed_count += 1
-                    logging.debug(
-                        f"Cleanup: Removed old file: {removed_file.file_path} "
-                        f"(status: {removed_file.status})"
-                    )
+        cutoff_time = datetime.now() - timedelta(hours=max_age_hours)
+        async with self._locks.exclusive():
+            # The repository keeps entries age-ordered, so only expired ones are visited
+            removed_files = await self._file_repository.remove_older_than(cutoff_time)
+        for removed_file in removed_files:
+            logging.debug(
+                f"Cleanup: Removed old file: {removed_file.file_path} "
+                f"(status: {removed_file.status})"
+            )
+        removed_count = len(removed_files)
         if removed_count > 0:
             logging.info(
                 f"Cleanup: Fjernede {removed_count} gamle filer fra memory "
@@ -365,117 +330,178 @@ class StateManager:
         return removed_count
 
     async def get_file_by_id(self, file_id: str) -> Optional[TrackedFile]:
-        async with self._lock:
-            result = await self._file_repository.get_by_id(file_id)
-            if not result:
-                all_files_count = await self._file_repository.count()
-                logging.debug(
-                    f"🔍 get_file_by_id: UUID {file_id[:8]}... not found in {all_files_count} files"
-                )
-            return result
+        result = await self._file_repository.get_by_id(file_id)
+        if not result:
+            all_files_count = await self._file_repository.count()
+            logging.debug(
+                f"🔍 get_file_by_id: UUID {file_id[:8]}... not found in {all_files_count} files"
+            )
+        return result
 
     async def update_file_status_by_id(
         self, file_id: str, status: FileStatus, **kwargs
     ) -> Optional[TrackedFile]:
-        event_to_publish = None
-        async with self._lock:
-            tracked_file = await self._file_repository.get_by_id(file_id)
+        async with self._locks.for_key(file_id):
+            tracked_file = await self._file_repository.get_for_update(file_id)
             if not tracked_file:
                 logging.warning(f"Forsøg på at opdatere ukendt fil ID: {file_id}")
                 return None
             old_status = tracked_file.status
-            if old_status != status:
-                logging.info(
-                    f"Status opdateret (ID): {tracked_file.file_path} {old_status} -> {status}"
+            if await self._apply_update_unlocked(tracked_file, status, kwargs):
+                await self._file_repository.update(tracked_file)
+
+        if old_status != status and self._event_bus:
+            if status == FileStatus.READY:
+                asyncio.create_task(self._publish_ready(tracked_file))
+            await self._event_bus.publish(
+                FileStatusChangedEvent(
+                    file_id=tracked_file.id,
+                    file_path=tracked_file.file_path,
+                    old_status=old_status,
+                    new_status=status,
                 )
-                if self._event_bus:
-                    event_to_publish = FileStatusChangedEvent(
-                        file_id=tracked_file.id,
-                        file_path=tracked_file.file_path,
-                        old_status=old_status,
-                        new_status=status,
-                    )
-                    if status == FileStatus.READY:
-                        ready_event = FileReadyEvent(
-                            file_id=tracked_file.id, file_path=tracked_file.file_path
+            )
+        return tracked_file
+
+    async def update_many(
+        self, changes: Mapping[str, Dict[str, Any]]
+    ) -> List[TrackedFile]:
+        """
+        Apply field changes to several files as one unit of work.
+
+        `changes` maps file id -> {field: value}; a "status" key performs a status
+        transition exactly like update_file_status_by_id. The shards involved are
+        locked once for the whole batch, values that are already current are not
+        written, and a single FilesBatchUpdatedEvent describes everything that
+        changed. BOOKKEEPING_FIELDS are applied but do not count as a change.
+        READY transitions still publish their own FileReadyEvent.
+
+        Returns the files that actually changed.
+        """
+        changed_files: List[TrackedFile] = []
+        status_changes: List[FileStatusChangedEvent] = []
+        ready_files: List[TrackedFile] = []
+        async with self._locks.for_keys(changes.keys()):
+            for file_id, fields in changes.items():
+                tracked_file = await self._file_repository.get_for_update(file_id)
+                if not tracked_file:
+                    logging.warning(f"Forsøg på at opdatere ukendt fil ID: {file_id}")
+                    continue
+                fields = dict(fields)
+                old_status = tracked_file.status
+                status = fields.pop("status", old_status)
+                if not await self._apply_update_unlocked(tracked_file, status, fields):
+                    continue
+                await self._file_repository.update(tracked_file)
+                changed_files.append(tracked_file)
+                if status == FileStatus.READY and old_status != status:
+                    ready_files.append(tracked_file)
+                if old_status != status:
+                    status_changes.append(
+                        FileStatusChangedEvent(
+                            file_id=tracked_file.id,
+                            file_path=tracked_file.file_path,
+                            old_status=old_status,
+                            new_status=status,
                         )
-                        asyncio.create_task(self._event_bus.publish(ready_event))
+                    )
+
+        if changed_files and self._event_bus:
+            for tracked_file in ready_files:
+                asyncio.create_task(self._publish_ready(tracked_file))
+            await self._event_bus.publish(
+                FilesBatchUpdatedEvent(
+                    file_ids=tuple(f.id for f in changed_files),
+                    status_changes=tuple(status_changes),
+                )
+            )
+        if changed_files:
+            logging.debug(
+                f"Batch update: {len(changed_files)}/{len(changes)} files changed, "
+                f"{len(status_changes)} status transitions"
+            )
+        return changed_files
+
+    async def _apply_update_unlocked(
+        self, tracked_file: TrackedFile, status: FileStatus, fields: Dict[str, Any]
+    ) -> bool:
+        """Apply a status and field changes in place. Returns True if anything but bookkeeping changed."""
+        changed = False
+        old_status = tracked_file.status
+        if old_status != status:
+            logging.info(
+                f"Status opdateret (ID): {tracked_file.file_path} {old_status} -> {status}"
+            )
             tracked_file.status = status
-            terminal_statuses = {
-                FileStatus.FAILED,
-                FileStatus.COMPLETED,
-                FileStatus.REMOVED,
-            }
-            if status in terminal_statuses:
-                await self._cancel_existing_retry_unlocked(file_id)
+            changed = True
+            if status in TERMINAL_STATUSES:
+                await self._cancel_existing_retry_unlocked(tracked_file.id)
                 logging.debug(
                     f"RETRY CANCELLED: File {tracked_file.file_path} reached terminal status {status.value} - "
-                    f"cancelled scheduled retry [UUID: {file_id[:8]}...]"
+                    f"cancelled scheduled retry [UUID: {tracked_file.id[:8]}...]"
                 )
-            for key, value in kwargs.items():
-                if hasattr(tracked_file, key):
-                    setattr(tracked_file, key, value)
-                else:
-                    logging.warning(f"Ukendt attribut ignored: {key}")
-            if status == FileStatus.COPYING and not tracked_file.started_copying_at:
-                tracked_file.started_copying_at = datetime.now()
-            elif status == FileStatus.COMPLETED and not tracked_file.completed_at:
-                tracked_file.completed_at = datetime.now()
-            elif status == FileStatus.FAILED and not getattr(
-                tracked_file, "failed_at", None
-            ):
-                tracked_file.failed_at = datetime.now()
-            
-            # Save the updated file back to repository
-            await self._file_repository.add(tracked_file)
-
-        if event_to_publish:
-            await self._event_bus.publish(event_to_publish)
+        for key, value in fields.items():
+            if not hasattr(tracked_file, key):
+                logging.warning(f"Ukendt attribut ignored: {key}")
+            elif getattr(tracked_file, key) != value:
+                setattr(tracked_file, key, value)
+                if key not in BOOKKEEPING_FIELDS:
+                    changed = True
+        if status == FileStatus.COPYING and not tracked_file.started_copying_at:
+            tracked_file.started_copying_at = datetime.now()
+            changed = True
+        elif status == FileStatus.COMPLETED and not tracked_file.completed_at:
+            tracked_file.completed_at = datetime.now()
+            changed = True
+        elif status == FileStatus.FAILED and not tracked_file.failed_at:
+            tracked_file.failed_at = datetime.now()
+            changed = True
+        return changed
+
+    async def apply_transfer_progress(
+        self, progress: TransferProgress
+    ) -> Optional[TrackedFile]:
+        """
+        Copy a sample of live transfer counters onto the TrackedFile.
+
+        Progress is volatile: it is neither persisted nor indexed and never changes
+        status, so it is written in place without a lock or repository round-trip.
+        That only reaches active files; a sample arriving after the file finished
+        is dropped rather than written to a read-only history copy.
+        """
+        tracked_file = await self._file_repository.get_by_id(progress.file_id)
+        if tracked_file is None or tracked_file.status in HISTORY_STATUSES:
+            return None
+        tracked_file.bytes_copied = progress.bytes_copied
+        tracked_file.copy_progress = progress.copy_progress
+        tracked_file.copy_speed_mbps = progress.copy_speed_mbps
         return tracked_file
 
+    async def _publish_ready(self, tracked_file: TrackedFile) -> None:
+        await self._event_bus.publish(
+            FileReadyEvent(file_id=tracked_file.id, file_path=tracked_file.file_path)
+        )
+
     async def get_statistics(self) -> Dict:
-        async with self._lock:
-            current_files = {}
-            all_files = await self._file_repository.get_all()
-            for tracked_file in all_files:
-                current = current_files.get(tracked_file.file_path)
-                if not current or self._is_more_current(tracked_file, current):
-                    current_files[tracked_file.file_path] = tracked_file
-            current_files_list = list(current_files.values())
-            total_files = len(current_files_list)
-            status_counts = {}
-            for status in FileStatus:
-                status_counts[status.value] = len(
-                    [f for f in current_files_list if f.status == status]
-                )
-            total_size = sum(f.file_size for f in current_files_list)
-            copying_files = [
-                f for f in current_files_list if f.status == FileStatus.COPYING
-            ]
-            growing_files = [
-                f
-                for f in current_files_list
-                if f.status
-                in [
-                    FileStatus.GROWING,
-                    FileStatus.READY_TO_START_GROWING,
-                    FileStatus.GROWING_COPY,
-                ]
-            ]
-            return {
-                "total_files": total_files,
-                "status_counts": status_counts,
-                "total_size_bytes": total_size,
-                "active_copies": len(copying_files),
-                "growing_files": len(growing_files),
-                "subscribers": len(self._subscribers),
-            }
+        # O(1): counters are maintained by the repository on every change
+        statistics = self._file_repository.statistics
+        return {
+            "total_files": statistics.total_files,
+            "status_counts": statistics.status_counts(),
+            "total_size_bytes": statistics.total_size,
+            "active_copies": statistics.count(FileStatus.COPYING),
+            "growing_files": sum(
+                statistics.count(status) for status in GROWING_STATUSES
+            ),
+            "subscribers": len(self._subscribers),
+            **statistics.rates(),
+        }
 
     async def schedule_retry(
         self, file_id: str, delay_seconds: int, reason: str, retry_type: str = "space"
     ) -> bool:
-        async with self._lock:
-            tracked_file = await self._file_repository.get_by_id(file_id)
+        async with self._locks.for_key(file_id):
+            tracked_file = await self._file_repository.get_for_update(file_id)
             if not tracked_file:
                 logging.warning(f"Cannot schedule retry for unknown file ID: {file_id}")
                 return False
@@ -487,13 +513,10 @@ class StateManager:
                 reason=reason,
                 retry_type=retry_type,
             )
-            retry_task = asyncio.create_task(
-                self._execute_retry_task(file_id, delay_seconds)
-            )
-            self._retry_tasks[file_id] = retry_task
-            
+            self._retry_scheduler.schedule(file_id, delay_seconds)
+
             # Save the updated file with retry info
-            await self._file_repository.add(tracked_file)
+            await self._file_repository.update(tracked_file)
             
             logging.info(
                 f"Scheduled {retry_type} retry for {tracked_file.file_path} in {delay_seconds}s: {reason}"
@@ -501,76 +524,54 @@ class StateManager:
             return True
 
     async def cancel_retry(self, file_id: str) -> bool:
-        async with self._lock:
+        async with self._locks.for_key(file_id):
             return await self._cancel_existing_retry_unlocked(file_id)
 
     async def _cancel_existing_retry_unlocked(self, file_id: str) -> bool:
-        retry_cancelled = False
-        if file_id in self._retry_tasks:
-            task = self._retry_tasks.pop(file_id)
-            task.cancel()
-            retry_cancelled = True
-            try:
-                await asyncio.wait_for(task, timeout=0.1)
-            except (asyncio.CancelledError, asyncio.TimeoutError):
-                pass
-            except Exception as e:
-                logging.warning(f"Error while cancelling task for {file_id}: {e}")
-        tracked_file = await self._file_repository.get_by_id(file_id)
+        retry_cancelled = self._retry_scheduler.cancel(file_id)
+        tracked_file = await self._file_repository.get_for_update(file_id)
         if tracked_file and tracked_file.retry_info:
             tracked_file.retry_info = None
-            await self._file_repository.add(tracked_file)
+            await self._file_repository.update(tracked_file)
             retry_cancelled = True
         if retry_cancelled:
             logging.debug(f"Cancelled retry for file ID: {file_id}")
         return retry_cancelled
 
-    async def _execute_retry_task(self, file_id: str, delay_seconds: int) -> None:
-        try:
-            await asyncio.sleep(delay_seconds)
-            async with self._lock:
-                tracked_file = await self._file_repository.get_by_id(file_id)
+    async def _execute_due_retries(self, file_ids: List[str]) -> None:
+        """Reset every due WAITING_FOR_SPACE file to READY in one locked batch."""
+        async with self._locks.for_keys(file_ids):
+            for file_id in file_ids:
+                tracked_file = await self._file_repository.get_for_update(file_id)
                 if not tracked_file or not tracked_file.retry_info:
                     logging.debug(
                         f"Retry cancelled - file or retry info missing: {file_id}"
                     )
-                    return
+                    continue
                 if tracked_file.status != FileStatus.WAITING_FOR_SPACE:
                     logging.debug(
                         f"Retry cancelled - file status changed: {tracked_file.file_path} (status: {tracked_file.status.value})"
                     )
-                    return
+                    tracked_file.retry_info = None
+                    await self._file_repository.update(tracked_file)
+                    continue
                 tracked_file.status = FileStatus.READY
                 tracked_file.error_message = None
                 tracked_file.retry_info = None  # Clear retry info
+                await self._file_repository.update(tracked_file)
                 logging.info(
                     f"Retry executed for {tracked_file.file_path} - reset to READY"
                 )
-                self._retry_tasks.pop(file_id, None)
 
-        except asyncio.CancelledError:
-            async with self._lock:
-                tracked_file = self._files_by_id.get(file_id)
-                if tracked_file:
-                    tracked_file.retry_info = None
-                self._retry_tasks.pop(file_id, None)
-            raise
-        except Exception as e:
-            logging.error(f"Error in retry task for file ID {file_id}: {e}")
-            async with self._lock:
-                tracked_file = await self._file_repository.get_by_id(file_id)
-                if tracked_file:
-                    tracked_file.retry_info = None
-                    await self._file_repository.add(tracked_file)
-                self._retry_tasks.pop(file_id, None)
+    async def stop_retry_scheduler(self) -> None:
+        await self._retry_scheduler.stop()
 
     async def cancel_all_retries(self) -> int:
-        async with self._lock:
+        async with self._locks.exclusive():
             cancelled_count = 0
-            all_files = await self._file_repository.get_all()
             files_with_retries = [
                 tracked_file.id
-                for tracked_file in all_files
+                for tracked_file in self._file_repository.snapshot()
                 if tracked_file.retry_info is not None
             ]
             for file_id in files_with_retries:
@@ -580,15 +581,15 @@ class StateManager:
             return cancelled_count
 
     async def increment_retry_count(self, file_id: str) -> int:
-        async with self._lock:
-            tracked_file = await self._file_repository.get_by_id(file_id)
+        async with self._locks.for_key(file_id):
+            tracked_file = await self._file_repository.get_for_update(file_id)
             if not tracked_file:
                 logging.warning(
                     f"Cannot increment retry count for unknown file ID: {file_id}"
                 )
                 return 0
             tracked_file.retry_count += 1
-            await self._file_repository.add(tracked_file)
+            await self._file_repository.update(tracked_file)
             logging.debug(
                 f"Incremented retry count for {tracked_file.file_path} to {tracked_file.retry_count}"
             )
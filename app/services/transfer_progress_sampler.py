@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.core.events.event_bus import DomainEventBus
+from app.core.events.file_events import FileCopyProgressEvent
+from app.core.transfer_progress import TransferProgressStore
+from app.services.state_manager import StateManager
+
+
+# This class is responsible solely for publishing live transfer progress at a fixed rate, adhering to SRP.
+class TransferProgressSampler:
+    """
+    Reads the volatile TransferProgress counters every `interval_seconds` and,
+    for transfers that moved since the last sample, copies the values onto the
+    TrackedFile and publishes one FileCopyProgressEvent.
+    """
+
+    def __init__(
+        self,
+        progress_store: TransferProgressStore,
+        state_manager: StateManager,
+        event_bus: Optional[DomainEventBus] = None,
+        interval_seconds: float = 0.5,
+    ):
+        self._progress_store = progress_store
+        self._state_manager = state_manager
+        self._event_bus = event_bus
+        self._interval_seconds = interval_seconds
+
+        self._is_running = False
+        self._sampler_task: Optional[asyncio.Task] = None
+
+        logging.info(f"TransferProgressSampler initialized (interval: {interval_seconds}s)")
+
+    async def start_sampling(self) -> None:
+        if self._is_running:
+            logging.warning("Transfer progress sampling already running")
+            return
+
+        self._is_running = True
+        self._sampler_task = asyncio.create_task(self._sampling_loop())
+        logging.info("Transfer progress sampling started")
+
+    async def stop_sampling(self) -> None:
+        if not self._is_running:
+            return
+
+        self._is_running = False
+        if self._sampler_task:
+            self._sampler_task.cancel()
+            try:
+                await self._sampler_task
+            except asyncio.CancelledError:
+                pass
+            self._sampler_task = None
+        logging.info("Transfer progress sampling stopped")
+
+    async def sample_once(self) -> int:
+        """Publish every transfer that moved since the previous sample."""
+        published = 0
+        for progress in self._progress_store.active():
+            if progress.bytes_copied == progress.sampled_bytes:
+                continue
+            progress.sampled_bytes = progress.bytes_copied
+
+            await self._state_manager.apply_transfer_progress(progress)
+            if self._event_bus:
+                await self._event_bus.publish(
+                    FileCopyProgressEvent(
+                        file_id=progress.file_id,
+                        bytes_copied=progress.bytes_copied,
+                        total_bytes=progress.total_bytes,
+                        copy_speed_mbps=progress.copy_speed_mbps,
+                    )
+                )
+            published += 1
+        return published
+
+    async def _sampling_loop(self) -> None:
+        while self._is_running:
+            try:
+                await self.sample_once()
+            except Exception as e:
+                logging.error(f"Error sampling transfer progress: {e}")
+            await asyncio.sleep(self._interval_seconds)
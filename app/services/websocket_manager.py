@@ -2,12 +2,17 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from fastapi import WebSocket, WebSocketDisconnect
 
-from app.core.events.event_bus import DomainEventBus
-from app.core.events.file_events import FileStatusChangedEvent, FileCopyProgressEvent
+from app.core.change_buffer import SequencedChangeBuffer
+from app.core.events.event_bus import DomainEventBus, OverflowPolicy
+from app.core.events.file_events import (
+    FileCopyProgressEvent,
+    FilesBatchUpdatedEvent,
+    FileStatusChangedEvent,
+)
 from app.core.events.scanner_events import ScannerStatusChangedEvent
 from app.core.events.storage_events import MountStatusChangedEvent, StorageStatusChangedEvent
 from app.services.state_manager import StateManager
@@ -29,7 +34,7 @@ def _serialize_storage_info(storage_info) -> dict:
     }
 
 
-def _serialize_tracked_file(tracked_file) -> Dict[str, Any]:
+def serialize_tracked_file(tracked_file) -> Dict[str, Any]:
     """
     Serialize TrackedFile using Pydantic's built-in JSON serialization.
 
@@ -50,8 +55,16 @@ class WebSocketManager:
         state_manager: StateManager,
         event_bus: DomainEventBus = None,
         storage_monitor=None,
+        history_page_size: int = 500,
+        event_queue_size: Optional[int] = None,
+        change_buffer_size: int = 5000,
     ):
         self.state_manager = state_manager
+        self._history_page_size = history_page_size
+        self._event_queue_size = event_queue_size
+        # File changes are numbered and retained so a reconnecting client can
+        # catch up with deltas instead of a full snapshot
+        self._changes = SequencedChangeBuffer(change_buffer_size)
         self._storage_monitor = storage_monitor
         self._event_bus = event_bus
         self._connections: List[WebSocket] = []
@@ -66,32 +79,55 @@ class WebSocketManager:
         logging.info("WebSocketManager initialiseret")
 
     async def _subscribe_to_events(self):
+        # Broadcasting waits on every client socket, so each subscription gets its
+        # own bounded queue (when configured) instead of running in the publisher.
+        queued = {"queue_size": self._event_queue_size}
         await self._event_bus.subscribe(
-            FileStatusChangedEvent, self.handle_file_status_changed_event
+            FileStatusChangedEvent, self.handle_file_status_changed_event, **queued
         )
         await self._event_bus.subscribe(
-            FileCopyProgressEvent, self.handle_file_copy_progress
+            FilesBatchUpdatedEvent, self.handle_files_batch_updated_event, **queued
         )
         await self._event_bus.subscribe(
-            StorageStatusChangedEvent, self.handle_storage_status_event
+            FileCopyProgressEvent,
+            self.handle_file_copy_progress,
+            overflow=OverflowPolicy.COALESCE,  # Only the newest progress per file matters
+            **queued,
         )
         await self._event_bus.subscribe(
-            MountStatusChangedEvent, self.handle_mount_status_event
+            StorageStatusChangedEvent, self.handle_storage_status_event, **queued
         )
         await self._event_bus.subscribe(
-            ScannerStatusChangedEvent, self.handle_scanner_status_event
+            MountStatusChangedEvent, self.handle_mount_status_event, **queued
+        )
+        await self._event_bus.subscribe(
+            ScannerStatusChangedEvent, self.handle_scanner_status_event, **queued
         )
 
         logging.info("Subscribed to DomainEventBus for real-time event updates")
 
-    async def connect(self, websocket: WebSocket) -> None:
+    async def connect(
+        self,
+        websocket: WebSocket,
+        last_seq: Optional[int] = None,
+        epoch: Optional[str] = None,
+    ) -> None:
         await websocket.accept()
-        self._connections.append(websocket)
 
-        await self._send_initial_state(websocket)
+        missed = self._changes.since(last_seq, epoch) if last_seq is not None else None
+        if missed is None:
+            sent_seq = await self._send_initial_state(websocket)
+        else:
+            sent_seq = await self._send_resync(websocket, missed)
+
+        # Changes recorded while we were sending are flushed before the client joins
+        # the live broadcast, so it never sees a gap or an out-of-order change.
+        await self._send_changes_after(websocket, sent_seq)
+        self._connections.append(websocket)
 
         logging.info(
-            f"WebSocket client connected. Total connections: {len(self._connections)}"
+            f"WebSocket client connected ({'delta resync' if missed is not None else 'full state'}). "
+            f"Total connections: {len(self._connections)}"
         )
 
     def disconnect(self, websocket: WebSocket) -> None:
@@ -102,58 +138,105 @@ class WebSocketManager:
             f"WebSocket client disconnected. Total connections: {len(self._connections)}"
         )
 
-    async def _send_initial_state(self, websocket: WebSocket) -> None:
+    async def _send_resync(self, websocket: WebSocket, missed: List[str]) -> int:
+        seq = self._changes.latest_seq
         try:
-            all_files = await self.state_manager.get_all_files()
-            statistics = await self.state_manager.get_statistics()
-
-            storage_data = None
-            if self._storage_monitor:
-                source_info = self._storage_monitor.get_source_info()
-                destination_info = self._storage_monitor.get_destination_info()
-                overall_status = self._storage_monitor.get_overall_status()
-
-                storage_data = {
-                    "source": _serialize_storage_info(source_info)
-                    if source_info
-                    else None,
-                    "destination": _serialize_storage_info(destination_info)
-                    if destination_info
-                    else None,
-                    "overall_status": overall_status.value,
-                    "monitoring_active": self._storage_monitor.get_monitoring_status()[
-                        "is_running"
-                    ],
-                }
+            for message_json in missed:
+                await websocket.send_text(message_json)
+            resync_data = {
+                "type": "resync_complete",
+                "data": {
+                    **await self._current_status_data(),
+                    "seq": seq,
+                    "epoch": self._changes.epoch,
+                    "replayed": len(missed),
+                },
+            }
+            await websocket.send_text(json.dumps(resync_data))
+            logging.debug(f"Resynced client with {len(missed)} missed changes")
+        except Exception as e:
+            logging.error(f"Fejl ved delta resync: {e}")
+        return seq
+
+    async def _send_changes_after(self, websocket: WebSocket, sent_seq: int) -> None:
+        while sent_seq < self._changes.latest_seq:
+            missed = self._changes.since(sent_seq)
+            if missed is None:
+                logging.warning("Client fell behind the change buffer during connect")
+                return
+            sent_seq = self._changes.latest_seq
+            try:
+                for message_json in missed:
+                    await websocket.send_text(message_json)
+            except Exception as e:
+                logging.warning(f"Fejl ved sending til client: {e}")
+                return
+
+    async def _current_status_data(self) -> Dict[str, Any]:
+        storage_data = None
+        if self._storage_monitor:
+            source_info = self._storage_monitor.get_source_info()
+            destination_info = self._storage_monitor.get_destination_info()
+            overall_status = self._storage_monitor.get_overall_status()
+
+            storage_data = {
+                "source": _serialize_storage_info(source_info)
+                if source_info
+                else None,
+                "destination": _serialize_storage_info(destination_info)
+                if destination_info
+                else None,
+                "overall_status": overall_status.value,
+                "monitoring_active": self._storage_monitor.get_monitoring_status()[
+                    "is_running"
+                ],
+            }
+
+        return {
+            "statistics": await self.state_manager.get_statistics(),
+            "storage": storage_data,
+            "scanner": self._scanner_status,
+            "timestamp": self._get_timestamp(),
+        }
+
+    async def _send_initial_state(self, websocket: WebSocket) -> int:
+        seq = self._changes.latest_seq
+        try:
+            # Active files plus the newest history page; older history is paged via /api/history
+            active_files = await self.state_manager.get_active_files()
+            history_files, history_total = await self.state_manager.get_history_page(
+                0, self._history_page_size
+            )
+            all_files = active_files + history_files
+            status_data = await self._current_status_data()
 
             initial_data = {
                 "type": "initial_state",
                 "data": {
-                    "files": [_serialize_tracked_file(f) for f in all_files],
-                    "statistics": statistics,
-                    "storage": storage_data,
-                    "scanner": self._scanner_status,
-                    "timestamp": self._get_timestamp(),
+                    "files": [serialize_tracked_file(f) for f in all_files],
+                    "history_total": history_total,
+                    **status_data,
+                    "seq": seq,
+                    "epoch": self._changes.epoch,
                 },
             }
 
             await websocket.send_text(json.dumps(initial_data))
             logging.debug(
-                f"Sent initial state to client: {len(all_files)} files, storage: {storage_data is not None}"
+                f"Sent initial state to client: {len(all_files)} files, "
+                f"storage: {status_data['storage'] is not None}"
             )
 
         except Exception as e:
             logging.error(f"Fejl ved sending af initial state: {e}")
-
+        return seq
 
     async def handle_file_status_changed_event(
         self, update: FileStatusChangedEvent
     ) -> None:
         """Handles the FileStatusChangedEvent from the new event bus."""
         logging.info(f"Received event: {update.file_path} -> {update.new_status.value}")
-        if not self._connections:
-            return
-
+        # No early return without clients: the change must still be recorded for resync
         tracked_file = await self.state_manager.get_file_by_id(update.file_id)
         if not tracked_file:
             logging.warning(
@@ -170,12 +253,12 @@ class WebSocketManager:
                     if update.old_status
                     else None,
                     "new_status": update.new_status.value,
-                    "file": _serialize_tracked_file(tracked_file),
+                    "file": serialize_tracked_file(tracked_file),
                     "timestamp": update.timestamp.isoformat(),
                 },
             }
 
-            await self._broadcast_message(message_data)
+            await self._record_and_broadcast(message_data)
 
             logging.debug(
                 f"Broadcasted state change (legacy): {update.file_path} -> {update.new_status}"
@@ -185,6 +268,40 @@ class WebSocketManager:
             logging.error(f"Fejl ved broadcasting af state change: {e}")
 
 
+    async def handle_files_batch_updated_event(
+        self, event: FilesBatchUpdatedEvent
+    ) -> None:
+        """Broadcasts one message for a whole StateManager.update_many batch."""
+        try:
+            files = []
+            for file_id in event.file_ids:
+                tracked_file = await self.state_manager.get_file_by_id(file_id)
+                if tracked_file:
+                    files.append(serialize_tracked_file(tracked_file))
+
+            message_data = {
+                "type": "file_batch_update",
+                "data": {
+                    "files": files,
+                    "status_changes": [
+                        {
+                            "file_id": change.file_id,
+                            "file_path": change.file_path,
+                            "old_status": change.old_status.value
+                            if change.old_status
+                            else None,
+                            "new_status": change.new_status.value,
+                        }
+                        for change in event.status_changes
+                    ],
+                    "timestamp": event.timestamp.isoformat(),
+                },
+            }
+            await self._record_and_broadcast(message_data)
+
+        except Exception as e:
+            logging.error(f"Fejl ved broadcasting af batch update: {e}")
+
     async def handle_file_copy_progress(self, event: FileCopyProgressEvent) -> None:
         """Handles the FileCopyProgressEvent from the event bus."""
         if not self._connections:
@@ -211,11 +328,20 @@ class WebSocketManager:
         except Exception as e:
             logging.error(f"Error broadcasting progress update: {e}")
 
+    async def _record_and_broadcast(self, message_data: Dict[str, Any]) -> None:
+        """Number and retain a file change for resync, then broadcast it."""
+        message_json = self._changes.append(message_data)
+        await self._broadcast_text(message_json)
+
     async def _broadcast_message(self, message_data: Dict[str, Any]) -> None:
+        if not self._connections:
+            return
+        await self._broadcast_text(json.dumps(message_data))
+
+    async def _broadcast_text(self, message_json: str) -> None:
         if not self._connections:
             return
 
-        message_json = json.dumps(message_data)
         disconnected_clients = []
 
         for websocket in self._connections:
@@ -11,6 +11,10 @@ class MessageHandler {
         this.storageStore = null;
         this.connectionStore = null;
 
+        // Last file change seen - sent on reconnect to get only the missed changes
+        this.lastSeq = null;
+        this.epoch = null;
+
         // Initialize after Alpine is ready
         document.addEventListener('alpine:init', () => {
             // Wait for stores to be available
@@ -34,16 +38,28 @@ class MessageHandler {
 
         console.log('Processing WebSocket message:', message.type);
 
+        if (typeof message.seq === 'number') {
+            this.lastSeq = message.seq;
+        }
+
         try {
             switch (message.type) {
                 case 'initial_state':
                     this.handleInitialState(message.data);
                     break;
 
+                case 'resync_complete':
+                    this.handleResyncComplete(message.data);
+                    break;
+
                 case 'file_update':
                     this.handleFileUpdate(message.data);
                     break;
 
+                case 'file_batch_update':
+                    this.handleFileBatchUpdate(message.data);
+                    break;
+
                 case 'file_progress_update':
                     this.handleFileProgressUpdate(message.data);
                     break;
@@ -91,7 +107,38 @@ class MessageHandler {
         if (data.files && Array.isArray(data.files)) {
             this.fileStore.setInitialFiles(data.files);
         }
+        this.fileStore.setHistoryInfo(data.history_total);
+        this.lastSeq = data.seq ?? null;
+        this.epoch = data.epoch ?? null;
+
+        this.applyStatusData(data);
+        console.log(`Initial state loaded: ${data.files?.length || 0} files`);
+    }
+
+    /**
+     * Handle the end of a delta resync - missed file changes were replayed before it
+     */
+    handleResyncComplete(data) {
+        this.lastSeq = data.seq;
+        this.epoch = data.epoch;
+        this.applyStatusData(data);
+        console.log(`Resync complete: ${data.replayed} missed changes replayed`);
+    }
 
+    /**
+     * Query string that lets the server resume this client with deltas
+     */
+    resumeQuery() {
+        if (this.lastSeq === null || this.epoch === null) {
+            return '';
+        }
+        return `?last_seq=${this.lastSeq}&epoch=${encodeURIComponent(this.epoch)}`;
+    }
+
+    /**
+     * Apply statistics, storage and scanner status from initial state or resync
+     */
+    applyStatusData(data) {
         // Update statistics
         if (data.statistics) {
             this.fileStore.updateStatistics(data.statistics);
@@ -119,8 +166,6 @@ class MessageHandler {
             }
             console.log('Scanner status loaded from initial state:', data.scanner);
         }
-
-        console.log(`Initial state loaded: ${data.files?.length || 0} files`);
     }
 
     /**
@@ -148,6 +193,26 @@ class MessageHandler {
         }
     }
 
+    /**
+     * Handle a batch of file updates (one message per StateManager batch)
+     */
+    handleFileBatchUpdate(data) {
+        if (!this.fileStore) {
+            console.error('FileStore not available for batch update');
+            return;
+        }
+
+        for (const file of data.files || []) {
+            if (file && file.id) {
+                this.fileStore.updateFile(file.id, file);
+            }
+        }
+
+        for (const change of data.status_changes || []) {
+            console.log(`File ${change.file_path} (ID: ${change.file_id}) status: ${change.new_status}`);
+        }
+    }
+
     /**
      * Handle file progress updates
      */
@@ -22,7 +22,8 @@ document.addEventListener('alpine:init', () => {
         connect() {
             try {
                 const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-                const wsUrl = `${protocol}//${window.location.host}/api/ws/live`;
+                const resumeQuery = window.messageHandler?.resumeQuery() || '';
+                const wsUrl = `${protocol}//${window.location.host}/api/ws/live${resumeQuery}`;
 
                 console.log(`Connecting to WebSocket: ${wsUrl}`);
                 this.socket = new WebSocket(wsUrl);
@@ -11,6 +11,11 @@ document.addEventListener('alpine:init', () => {
         items: new Map(),               // Map<fileId, TrackedFile> - bruger ID i stedet for path!
         sortBy: 'discovered',          // Current sort method
 
+        // History paging - the initial state only carries the newest history page
+        historyTotal: 0,
+        historyOffset: 0,
+        historyLoading: false,
+
         // Statistics State
         statistics: {
             totalFiles: 0,
@@ -85,6 +90,43 @@ document.addEventListener('alpine:init', () => {
             this.updateStatisticsFromFiles();
         },
 
+        setHistoryInfo(historyTotal) {
+            const historyStatuses = ['Completed', 'Failed', 'Removed'];
+            this.historyTotal = historyTotal || 0;
+            this.historyOffset = Array.from(this.items.values())
+                .filter(file => historyStatuses.includes(file.status)).length;
+        },
+
+        get hasMoreHistory() {
+            return this.historyOffset < this.historyTotal;
+        },
+
+        async loadMoreHistory(limit = 500) {
+            if (this.historyLoading || !this.hasMoreHistory) {
+                return;
+            }
+            this.historyLoading = true;
+            try {
+                const response = await fetch(`/api/history?offset=${this.historyOffset}&limit=${limit}`);
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                const page = await response.json();
+                page.files.forEach(file => {
+                    if (!this.items.has(file.id)) {
+                        this.items.set(file.id, file);
+                    }
+                });
+                this.historyOffset += page.files.length;
+                this.historyTotal = page.total;
+                this.updateStatisticsFromFiles();
+            } catch (error) {
+                console.error('Failed to load history page:', error);
+            } finally {
+                this.historyLoading = false;
+            }
+        },
+
         // Sorting Management
         setSortBy(sortMethod) {
             this.sortBy = sortMethod;
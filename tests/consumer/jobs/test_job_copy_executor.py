@@ -19,7 +19,7 @@ from app.services.copy_strategies import GrowingFileCopyStrategy
 @pytest.fixture
 def executor():
     """Simple copy executor for testing."""
-    settings = MagicMock()
+    settings = MagicMock(enable_secure_resume=False)
     state_manager = AsyncMock()
     copy_strategy = AsyncMock(spec=GrowingFileCopyStrategy)
 
@@ -92,6 +92,20 @@ class TestJobCopyExecutor:
             error_message="Failed: Copy operation failed",
         )
 
+    @pytest.mark.asyncio
+    async def test_handle_copy_failure_keeps_progress_for_resume(
+        self, executor, prepared_file
+    ):
+        """Test that resume keeps the copied bytes on failure."""
+        executor.settings.enable_secure_resume = True
+        await executor.handle_copy_failure(prepared_file, "Test error")
+
+        executor.state_manager.update_file_status_by_id.assert_called_once_with(
+            prepared_file.tracked_file.id,
+            FileStatus.FAILED,
+            error_message="Failed: Copy operation failed",
+        )
+
     def test_get_copy_executor_info(self, executor):
         """Test configuration info retrieval."""
         info = executor.get_copy_executor_info()
@@ -19,7 +19,9 @@ from app.services.copy_strategies import GrowingFileCopyStrategy
 @pytest.fixture
 def preparer():
     """Simple file preparer for testing."""
-    settings = MagicMock(source_directory="/src", destination_directory="/dst")
+    settings = MagicMock(
+        source_directory="/src", destination_directory="/dst", enable_secure_resume=False
+    )
     state_manager = AsyncMock()
     copy_strategy = AsyncMock(spec=GrowingFileCopyStrategy)
     copy_strategy.__class__.__name__ = "GrowingFileCopyStrategy"
@@ -3,12 +3,14 @@ Tests for the DomainEventBus.
 """
 
 import asyncio
+from dataclasses import dataclass
+from typing import ClassVar, Optional
 from unittest.mock import Mock, patch
 
 import pytest
 
 from app.core.events.domain_event import DomainEvent
-from app.core.events.event_bus import DomainEventBus
+from app.core.events.event_bus import DomainEventBus, OverflowPolicy
 
 
 # Define some simple test events
@@ -140,3 +142,180 @@ async def test_failing_handler_does_not_stop_others(caplog):
         log_args, _ = mock_log_error.call_args
         assert "Unhandled exception in handler 'failing_handler'" in log_args[0]
         assert "Handler failed intentionally" in log_args[0]
+
+
+@dataclass(frozen=True, kw_only=True)
+class _ProgressEvent(DomainEvent):
+    coalesce_by: ClassVar[Optional[str]] = "file_id"
+
+    file_id: str
+    value: int
+
+
+@dataclass(frozen=True, kw_only=True)
+class _StatusEvent(DomainEvent):
+    file_id: str
+    value: int
+
+
+@pytest.mark.asyncio
+async def test_queued_subscriber_is_drained_by_its_dispatcher():
+    bus = DomainEventBus()
+    received = []
+
+    async def handler(event: DomainEvent):
+        received.append(event.value)
+
+    await bus.subscribe(_ProgressEvent, handler, queue_size=10)
+    for value in range(3):
+        await bus.publish(_ProgressEvent(file_id="a", value=value))
+    await asyncio.sleep(0.01)
+
+    assert received == [0, 1, 2]
+    assert bus.queue_metrics()[0]["delivered"] == 3
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies_bound_the_queue():
+    bus = DomainEventBus()
+    gate = asyncio.Event()
+    received = {"drop": [], "coalesce": []}
+
+    def make_handler(name):
+        async def handler(event: DomainEvent):
+            await gate.wait()
+            received[name].append((event.file_id, event.value))
+
+        handler.__name__ = name
+        return handler
+
+    await bus.subscribe(
+        _ProgressEvent, make_handler("drop"), queue_size=2, overflow=OverflowPolicy.DROP_OLDEST
+    )
+    await bus.subscribe(
+        _ProgressEvent, make_handler("coalesce"), queue_size=2, overflow=OverflowPolicy.COALESCE
+    )
+    await bus.publish(_ProgressEvent(file_id="a", value=0))
+    await asyncio.sleep(0)  # Both dispatchers take the first event and wait on the gate
+    for value in range(1, 5):
+        await bus.publish(_ProgressEvent(file_id="a", value=value))
+    await bus.publish(_ProgressEvent(file_id="b", value=9))
+
+    metrics = {m["handler"]: m for m in bus.queue_metrics()}
+    assert metrics["drop"]["depth"] == 2
+    assert metrics["drop"]["dropped"] == 3
+    assert metrics["coalesce"]["coalesced"] == 3
+
+    gate.set()
+    await asyncio.sleep(0.01)
+    assert received["drop"] == [("a", 0), ("a", 4), ("b", 9)]
+    assert received["coalesce"] == [("a", 0), ("a", 4), ("b", 9)]
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure():
+    bus = DomainEventBus()
+    gate = asyncio.Event()
+
+    async def slow_handler(event: DomainEvent):
+        await gate.wait()
+
+    await bus.subscribe(_ProgressEvent, slow_handler, queue_size=1)
+    await bus.publish(_ProgressEvent(file_id="a", value=0))
+    await asyncio.sleep(0)
+    await bus.publish(_ProgressEvent(file_id="a", value=1))
+
+    blocked = asyncio.create_task(bus.publish(_ProgressEvent(file_id="a", value=2)))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    gate.set()
+    await asyncio.wait_for(blocked, timeout=1)
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_coalescible_events_are_rate_limited_per_key_latest_wins():
+    bus = DomainEventBus(coalesce_interval_seconds=0.05)
+    received = []
+
+    async def handler(event: DomainEvent):
+        received.append((type(event).__name__, event.file_id, event.value))
+
+    await bus.subscribe(_ProgressEvent, handler)
+    await bus.subscribe(_StatusEvent, handler)
+
+    for value in range(5):
+        await bus.publish(_ProgressEvent(file_id="a", value=value))
+        await bus.publish(_StatusEvent(file_id="c", value=value))
+    await bus.publish(_ProgressEvent(file_id="b", value=0))
+
+    # First progress per key goes through at once; status events are never held back
+    assert [r for r in received if r[0] == "_ProgressEvent"] == [
+        ("_ProgressEvent", "a", 0),
+        ("_ProgressEvent", "b", 0),
+    ]
+    assert [r[2] for r in received if r[0] == "_StatusEvent"] == [0, 1, 2, 3, 4]
+
+    await asyncio.sleep(0.1)
+    assert received[-1] == ("_ProgressEvent", "a", 4)
+    assert bus.coalesced_count == 3
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_status_event_flushes_parked_progress_for_its_file_first():
+    bus = DomainEventBus(coalesce_interval_seconds=0.05)
+    received = []
+
+    async def handler(event: DomainEvent):
+        received.append((type(event).__name__, event.file_id, event.value))
+
+    await bus.subscribe(_ProgressEvent, handler)
+    await bus.subscribe(_StatusEvent, handler)
+
+    await bus.publish(_ProgressEvent(file_id="a", value=1))
+    await bus.publish(_ProgressEvent(file_id="b", value=1))
+    await bus.publish(_ProgressEvent(file_id="a", value=2))  # Parked
+    await bus.publish(_ProgressEvent(file_id="b", value=2))  # Parked, other file
+    await bus.publish(_StatusEvent(file_id="a", value=99))
+
+    assert received == [
+        ("_ProgressEvent", "a", 1),
+        ("_ProgressEvent", "b", 1),
+        ("_ProgressEvent", "a", 2),
+        ("_StatusEvent", "a", 99),
+    ]
+
+    await asyncio.sleep(0.1)
+    # Nothing about "a" arrives after its status; "b" is still rate limited
+    assert received[-1] == ("_ProgressEvent", "b", 2)
+    assert [r for r in received if r[1] == "a"][-1] == ("_StatusEvent", "a", 99)
+    await bus.close()
+
+
+@pytest.mark.asyncio
+async def test_handler_calls_errors_and_latency_are_recorded():
+    bus = DomainEventBus()
+
+    async def slow_handler(event: DomainEvent):
+        await asyncio.sleep(0.01)
+
+    async def failing_handler(event: DomainEvent):
+        raise ValueError("boom")
+
+    await bus.subscribe(_StatusEvent, slow_handler)
+    await bus.subscribe(_StatusEvent, failing_handler)
+    with patch("logging.error"):
+        for value in range(3):
+            await bus.publish(_StatusEvent(file_id="a", value=value))
+
+    metrics = {row["handler"].rsplit(".", 1)[-1]: row for row in bus.handler_metrics()}
+    slow = metrics["slow_handler"]
+    assert slow["event_type"] == "_StatusEvent"
+    assert (slow["calls"], slow["errors"], slow["in_flight"]) == (3, 0, 0)
+    assert 8 <= slow["latency_ms"]["p50"] <= slow["latency_ms"]["p99"] <= slow["latency_ms"]["max"]
+    assert metrics["failing_handler"]["errors"] == 3
+    assert bus.handler_metrics()[0]["handler"].endswith("slow_handler")  # Busiest first
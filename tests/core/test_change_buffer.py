@@ -0,0 +1,28 @@
+"""
+Tests for SequencedChangeBuffer.
+"""
+
+import json
+
+from app.core.change_buffer import SequencedChangeBuffer
+
+
+def test_messages_are_numbered_and_replayed_after_a_seq():
+    buffer = SequencedChangeBuffer(capacity=10)
+    texts = [buffer.append({"type": "file_update", "n": n}) for n in range(3)]
+
+    assert [json.loads(text)["seq"] for text in texts] == [1, 2, 3]
+    assert buffer.since(1) == texts[1:]
+    assert buffer.since(3) == []
+    assert buffer.since(0, epoch=buffer.epoch) == texts
+
+
+def test_gaps_that_cannot_be_bridged_return_none():
+    buffer = SequencedChangeBuffer(capacity=2)
+    for n in range(5):
+        buffer.append({"n": n})
+
+    assert buffer.since(2) is None  # Seq 3 was evicted
+    assert [json.loads(text)["n"] for text in buffer.since(3)] == [3, 4]
+    assert buffer.since(9) is None  # From the future, e.g. before a restart
+    assert buffer.since(3, epoch="other-process") is None
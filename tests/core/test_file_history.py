@@ -0,0 +1,78 @@
+"""
+Tests for the compact history tier.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.file_history import FileHistory, HistoryRecord
+from app.core.file_repository import FileRepository
+from app.models import FileStatus, TrackedFile
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _finished(path: str, status: FileStatus = FileStatus.COMPLETED) -> TrackedFile:
+    return TrackedFile(
+        file_path=path,
+        status=status,
+        file_size=1024,
+        completed_at=datetime.now(),
+        destination_path=f"/dst{path}",
+    )
+
+
+async def test_record_round_trips_the_fields_the_ui_shows():
+    tracked = _finished("/src/a.mxf")
+    tracked.error_message = "none"
+
+    restored = HistoryRecord.from_tracked_file(tracked).to_tracked_file()
+
+    assert restored.model_dump() == tracked.model_dump()
+
+
+async def test_pages_are_newest_first_and_filterable():
+    history = FileHistory()
+    files = [_finished(f"/src/{i}.mxf") for i in range(5)]
+    files.append(_finished("/src/failed.mxf", FileStatus.FAILED))
+    for tracked in files:
+        history.put(tracked)
+
+    page, total = history.page(offset=1, limit=2)
+    assert total == 6
+    assert [record.id for record in page] == [files[4].id, files[3].id]
+
+    page, total = history.page(offset=0, limit=10, status=FileStatus.FAILED)
+    assert total == 1
+    assert page[0].id == files[5].id
+
+
+async def test_repository_moves_finished_files_out_of_the_hot_tier():
+    repo = FileRepository()
+    tracked = TrackedFile(file_path="/src/a.mxf", status=FileStatus.COPYING)
+    await repo.add(tracked)
+
+    tracked.status = FileStatus.COMPLETED
+    tracked.completed_at = datetime.now() - timedelta(minutes=1)
+    await repo.update(tracked)
+
+    assert repo.snapshot() == ()
+    assert await repo.history_count() == 1
+    assert repo.statistics.count(FileStatus.COMPLETED) == 1
+
+    stored = await repo.get_by_id(tracked.id)
+    assert stored is not tracked
+    assert stored.completed_at == tracked.completed_at
+    assert (await repo.get_current_for_path("/src/a.mxf")).id == tracked.id
+
+    # History reads are read-only; an editable copy is saved back like any other update
+    with pytest.raises(ValidationError):
+        stored.status = FileStatus.REMOVED
+    editable = await repo.get_for_update(tracked.id)
+    editable.status = FileStatus.REMOVED
+    await repo.update(editable)
+    assert (await repo.get_by_id(tracked.id)).status == FileStatus.REMOVED
+    assert repo.statistics.count(FileStatus.COMPLETED) == 0
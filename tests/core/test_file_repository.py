@@ -0,0 +1,145 @@
+"""
+Tests for FileRepository secondary indexes.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.file_repository import FileRepository
+from app.models import FileStatus, TrackedFile
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _tracked(path: str, status: FileStatus, age_seconds: int = 0) -> TrackedFile:
+    return TrackedFile(
+        file_path=path,
+        status=status,
+        discovered_at=datetime.now() - timedelta(seconds=age_seconds),
+    )
+
+
+async def test_current_for_path_prefers_active_over_history():
+    repo = FileRepository()
+    completed = _tracked("/src/a.mxf", FileStatus.COMPLETED, age_seconds=10)
+    active = _tracked("/src/a.mxf", FileStatus.DISCOVERED)
+    await repo.add(completed)
+    await repo.add(active)
+
+    assert (await repo.get_current_for_path("/src/a.mxf")).id == active.id
+    assert (await repo.get_active_for_path("/src/a.mxf")).id == active.id
+    assert [f.id for f in await repo.get_by_path("/src/a.mxf")] == [
+        active.id,
+        completed.id,
+    ]
+
+
+async def test_status_transition_updates_indexes():
+    repo = FileRepository()
+    tracked = _tracked("/src/b.mxf", FileStatus.DISCOVERED)
+    await repo.add(tracked)
+
+    tracked.status = FileStatus.COMPLETED
+    await repo.update(tracked)
+
+    assert await repo.get_by_status(FileStatus.DISCOVERED) == []
+    assert [f.id for f in await repo.get_by_status(FileStatus.COMPLETED)] == [
+        tracked.id
+    ]
+    assert await repo.get_active_for_path("/src/b.mxf") is None
+    assert (await repo.get_current_for_path("/src/b.mxf")).id == tracked.id
+
+
+async def test_current_by_status_returns_newest_entry_per_path():
+    repo = FileRepository()
+    older = _tracked("/src/c.mxf", FileStatus.FAILED, age_seconds=60)
+    newer = _tracked("/src/c.mxf", FileStatus.FAILED, age_seconds=5)
+    other = _tracked("/src/d.mxf", FileStatus.FAILED)
+    for tracked in (older, newer, other):
+        await repo.add(tracked)
+
+    current = await repo.get_current_by_status(FileStatus.FAILED)
+
+    assert {f.id for f in current} == {newer.id, other.id}
+
+
+async def test_remove_drops_index_entries():
+    repo = FileRepository()
+    tracked = _tracked("/src/e.mxf", FileStatus.READY)
+    await repo.add(tracked)
+
+    assert await repo.remove(tracked.id) is True
+
+    assert await repo.get_current_for_path("/src/e.mxf") is None
+    assert await repo.get_by_status(FileStatus.READY) == []
+    assert await repo.get_current_files() == []
+
+
+async def test_snapshot_is_reused_until_membership_changes():
+    repo = FileRepository()
+    tracked = _tracked("/src/a.mxf", FileStatus.COPYING)
+    await repo.add(tracked)
+
+    snapshot = repo.snapshot()
+    tracked.bytes_copied = 512
+    await repo.update(tracked)
+    assert repo.snapshot() is snapshot
+
+    tracked.status = FileStatus.COMPLETED
+    await repo.update(tracked)
+    await repo.add(_tracked("/src/b.mxf", FileStatus.DISCOVERED))
+    assert repo.snapshot() is not snapshot
+    assert len(repo.snapshot()) == 1  # The completed file moved to the history tier
+    assert len(await repo.get_all()) == 2
+
+
+async def test_statistics_track_current_entry_per_path():
+    repo = FileRepository()
+    history = _tracked("/src/a.mxf", FileStatus.COMPLETED, age_seconds=10)
+    history.file_size = 100
+    active = _tracked("/src/a.mxf", FileStatus.DISCOVERED)
+    active.file_size = 300
+    other = _tracked("/src/b.mxf", FileStatus.COPYING)
+    other.file_size = 50
+    for tracked in (history, active, other):
+        await repo.add(tracked)
+
+    statistics = repo.statistics
+    assert statistics.total_files == 2
+    assert statistics.total_size == 350
+    assert statistics.count(FileStatus.DISCOVERED) == 1
+    assert statistics.count(FileStatus.COMPLETED) == 0  # Shadowed by the active entry
+
+    await repo.remove(active.id)
+    other.status = FileStatus.COMPLETED
+    await repo.update(other)
+
+    assert statistics.total_size == 150
+    assert statistics.count(FileStatus.COMPLETED) == 2
+    assert statistics.count(FileStatus.COPYING) == 0
+    assert statistics.rates()["files_per_minute"] > 0
+
+
+async def test_remove_older_than_only_removes_expired_entries():
+    repo = FileRepository()
+    old = _tracked("/src/old.mxf", FileStatus.DISCOVERED, age_seconds=7200)
+    recent_completion = _tracked("/src/recent.mxf", FileStatus.COMPLETED, age_seconds=7200)
+    recent_completion.completed_at = datetime.now()
+    fresh = _tracked("/src/fresh.mxf", FileStatus.DISCOVERED)
+    for tracked in (old, recent_completion, fresh):
+        await repo.add(tracked)
+
+    removed = await repo.remove_older_than(datetime.now() - timedelta(hours=1))
+
+    assert [f.id for f in removed] == [old.id]
+    assert await repo.count() == 2
+    assert repo.statistics.total_files == 2
+
+    # A later completion moves the entry forward in the retention order
+    fresh.completed_at = datetime.now() + timedelta(hours=2)
+    fresh.status = FileStatus.COMPLETED
+    await repo.update(fresh)
+    removed = await repo.remove_older_than(datetime.now() + timedelta(hours=1))
+    assert [f.id for f in removed] == [recent_completion.id]
@@ -0,0 +1,20 @@
+"""
+Tests for FileStatistics rolling rates.
+"""
+
+from app.core.file_statistics import FileStatistics
+
+
+def test_rates_cover_only_the_rolling_window():
+    statistics = FileStatistics(rate_window_seconds=60.0)
+    statistics.record_completion(600, now=0.0)
+    statistics.record_completion(1200, now=30.0)
+
+    assert statistics.rates(now=45.0) == {
+        "files_per_minute": 2.0,
+        "bytes_per_second": 30.0,
+    }
+    assert statistics.rates(now=75.0) == {
+        "files_per_minute": 1.0,
+        "bytes_per_second": 20.0,
+    }
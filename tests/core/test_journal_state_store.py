@@ -0,0 +1,77 @@
+"""
+Tests for the append-only journal state store.
+"""
+
+import pytest
+
+from app.core.file_repository import FileRepository
+from app.core.persistence import JournalStateStore
+from app.models import FileStatus
+from app.services.state_manager import StateManager
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _repository(journal_dir, **kwargs) -> FileRepository:
+    return FileRepository(state_store=JournalStateStore(str(journal_dir), **kwargs))
+
+
+async def test_journal_replay_restores_latest_state(tmp_path):
+    store = JournalStateStore(str(tmp_path))
+    state_manager = StateManager(file_repository=FileRepository(state_store=store))
+    await state_manager.restore_persisted_state()
+
+    kept = await state_manager.add_file("/src/kept.mxf", 1024)
+    dropped = await state_manager.add_file("/src/dropped.mxf", 1024)
+    await store.flush()
+    await state_manager.update_file_status_by_id(
+        kept.id, FileStatus.COMPLETED, destination_path="/dst/kept.mxf"
+    )
+    await state_manager._file_repository.remove(dropped.id)
+    await state_manager._file_repository.close()
+
+    restored = StateManager(file_repository=_repository(tmp_path))
+    assert await restored.restore_persisted_state() == 1
+    restored_file = await restored.get_file_by_id(kept.id)
+    assert restored_file.status == FileStatus.COMPLETED
+    assert restored_file.destination_path == "/dst/kept.mxf"
+    await restored._file_repository.close()
+
+
+async def test_compaction_folds_journal_into_snapshot(tmp_path):
+    store = JournalStateStore(str(tmp_path))
+    repository = FileRepository(state_store=store)
+    state_manager = StateManager(file_repository=repository)
+    await state_manager.restore_persisted_state()
+
+    tracked = await state_manager.add_file("/src/clip.mxf", 1024)
+    for status in (FileStatus.READY, FileStatus.IN_QUEUE, FileStatus.COMPLETED):
+        await state_manager.update_file_status_by_id(tracked.id, status)
+        await store.flush()
+    await store.compact()
+
+    assert (tmp_path / "journal.jsonl").stat().st_size == 0
+    assert (tmp_path / "snapshot.jsonl").read_text().count("\n") == 1
+    await repository.close()
+
+    restored = _repository(tmp_path)
+    assert await restored.load() == 1
+    assert (await restored.get_by_id(tracked.id)).status == FileStatus.COMPLETED
+    await restored.close()
+
+
+async def test_torn_last_line_is_ignored(tmp_path):
+    repository = _repository(tmp_path)
+    state_manager = StateManager(file_repository=repository)
+    await state_manager.restore_persisted_state()
+    tracked = await state_manager.add_file("/src/clip.mxf", 1024)
+    await repository.close()
+
+    with open(tmp_path / "journal.jsonl", "a") as journal:
+        journal.write('{"op":"upsert","file_id":"x","fi')
+
+    restored = _repository(tmp_path)
+    assert await restored.load() == 1
+    assert await restored.get_by_id(tracked.id) is not None
+    await restored.close()
@@ -0,0 +1,83 @@
+"""
+Tests for RetryScheduler.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.retry_scheduler import RetryScheduler
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_due_keys_fire_together_in_one_batch():
+    batches = []
+
+    async def on_due(keys):
+        batches.append(sorted(keys))
+
+    scheduler = RetryScheduler(on_due)
+    for key in ("a", "b", "c"):
+        scheduler.schedule(key, 0.01)
+    scheduler.schedule("later", 60)
+
+    await asyncio.sleep(0.05)
+
+    assert batches == [["a", "b", "c"]]
+    assert scheduler.is_scheduled("later")
+    assert len(scheduler) == 1
+    await scheduler.stop()
+
+
+async def test_cancel_and_reschedule_drop_the_old_deadline():
+    fired = []
+
+    async def on_due(keys):
+        fired.extend(keys)
+
+    scheduler = RetryScheduler(on_due)
+    scheduler.schedule("cancelled", 0.01)
+    scheduler.schedule("moved", 0.01)
+    assert scheduler.cancel("cancelled")
+    assert not scheduler.cancel("cancelled")
+    scheduler.schedule("moved", 60)
+
+    await asyncio.sleep(0.05)
+
+    assert fired == []
+    assert scheduler.is_scheduled("moved")
+    await scheduler.stop()
+
+
+async def test_earlier_deadline_wakes_a_sleeping_scheduler():
+    fired = []
+
+    async def on_due(keys):
+        fired.extend(keys)
+
+    scheduler = RetryScheduler(on_due)
+    scheduler.schedule("slow", 60)
+    await asyncio.sleep(0.01)
+    scheduler.schedule("fast", 0.01)
+
+    await asyncio.sleep(0.05)
+
+    assert fired == ["fast"]
+    await scheduler.stop()
+
+
+async def test_many_cancellations_keep_the_heap_bounded():
+    async def on_due(keys):
+        pass
+
+    scheduler = RetryScheduler(on_due)
+    for i in range(1000):
+        scheduler.schedule(f"file-{i}", 60)
+    for i in range(990):
+        scheduler.cancel(f"file-{i}")
+
+    assert len(scheduler) == 10
+    assert len(scheduler._heap) <= 2 * len(scheduler) + 64
+    await scheduler.stop()
@@ -0,0 +1,47 @@
+"""
+Tests for ShardedLock.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.sharded_lock import ShardedLock
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_same_key_shares_a_lock_and_different_shards_do_not_block():
+    locks = ShardedLock(shard_count=16)
+    assert locks.for_key("file-a") is locks.for_key("file-a")
+
+    other_key = next(
+        key
+        for key in (f"file-{i}" for i in range(100))
+        if locks.for_key(key) is not locks.for_key("file-a")
+    )
+    async with locks.for_key("file-a"):
+        await asyncio.wait_for(locks.for_key(other_key).acquire(), timeout=0.1)
+        locks.for_key(other_key).release()
+
+
+async def test_exclusive_waits_for_every_shard():
+    locks = ShardedLock(shard_count=4)
+    held = locks.for_key("busy")
+    await held.acquire()
+
+    exclusive_entered = asyncio.Event()
+
+    async def take_exclusive():
+        async with locks.exclusive():
+            exclusive_entered.set()
+
+    task = asyncio.create_task(take_exclusive())
+    await asyncio.sleep(0.01)
+    assert not exclusive_entered.is_set()
+
+    held.release()
+    await asyncio.wait_for(task, timeout=0.1)
+    assert exclusive_entered.is_set()
+    assert not any(locks.for_key(f"k{i}").locked() for i in range(20))
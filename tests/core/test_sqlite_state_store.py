@@ -0,0 +1,109 @@
+"""
+Tests for the SQLite-backed FileRepository and warm restart.
+"""
+
+import pytest
+
+from app.core.file_repository import FileRepository
+from app.core.persistence import SqliteStateStore
+from app.models import FileStatus
+from app.services.state_manager import StateManager
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _repository(db_path) -> FileRepository:
+    return FileRepository(state_store=SqliteStateStore(str(db_path)))
+
+
+async def test_files_survive_repository_restart(tmp_path):
+    db_path = tmp_path / "state.db"
+    state_manager = StateManager(file_repository=_repository(db_path))
+    await state_manager.restore_persisted_state()
+
+    tracked = await state_manager.add_file("/src/clip.mxf", 1024)
+    await state_manager.update_file_status_by_id(
+        tracked.id, FileStatus.COMPLETED, destination_path="/dst/clip.mxf"
+    )
+    await state_manager._file_repository.close()
+
+    restored = StateManager(file_repository=_repository(db_path))
+    assert await restored.restore_persisted_state() == 1
+
+    restored_file = await restored.get_file_by_id(tracked.id)
+    assert restored_file.status == FileStatus.COMPLETED
+    assert restored_file.destination_path == "/dst/clip.mxf"
+    await restored._file_repository.close()
+
+
+async def test_interrupted_copies_restore_as_ready(tmp_path):
+    db_path = tmp_path / "state.db"
+    state_manager = StateManager(file_repository=_repository(db_path))
+    await state_manager.restore_persisted_state()
+
+    copying = await state_manager.add_file("/src/copying.mxf", 1024)
+    growing = await state_manager.add_file("/src/growing.mxf", 2048)
+    await state_manager.update_file_status_by_id(
+        copying.id, FileStatus.COPYING, bytes_copied=512, copy_progress=50.0
+    )
+    await state_manager.update_file_status_by_id(growing.id, FileStatus.GROWING)
+    await state_manager._file_repository.close()
+
+    restored = StateManager(file_repository=_repository(db_path))
+    await restored.restore_persisted_state()
+
+    restored_copying = await restored.get_file_by_id(copying.id)
+    assert restored_copying.status == FileStatus.READY
+    assert restored_copying.bytes_copied == 0
+    assert (await restored.get_file_by_id(growing.id)).status == FileStatus.GROWING
+    await restored._file_repository.close()
+
+
+async def test_removed_files_are_deleted_from_store(tmp_path):
+    db_path = tmp_path / "state.db"
+    repository = _repository(db_path)
+    state_manager = StateManager(file_repository=repository)
+    await state_manager.restore_persisted_state()
+
+    tracked = await state_manager.add_file("/src/old.mxf", 1024)
+    await repository.remove(tracked.id)
+    await repository.close()
+
+    restored_repository = _repository(db_path)
+    assert await restored_repository.load() == 0
+    await restored_repository.close()
+
+
+async def test_failed_flush_keeps_batch_for_next_flush(tmp_path):
+    store = SqliteStateStore(str(tmp_path / "state.db"))
+    await store.load()
+    repository = FileRepository(state_store=store)
+    state_manager = StateManager(file_repository=repository)
+
+    kept = await state_manager.add_file("/src/kept.mxf", 1024)
+    changed = await state_manager.add_file("/src/changed.mxf", 1024)
+
+    write_batch = store._write_batch_sync
+    calls = []
+
+    def failing_write(rows, removed_ids):
+        calls.append(rows)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        write_batch(rows, removed_ids)
+
+    store._write_batch_sync = failing_write
+    with pytest.raises(OSError):
+        await store.flush()
+
+    # A change made after the failed batch must not be overwritten by it
+    await state_manager.update_file_status_by_id(changed.id, FileStatus.COMPLETED)
+    await store.flush()
+    await repository.close()
+
+    restored = StateManager(file_repository=_repository(tmp_path / "state.db"))
+    assert await restored.restore_persisted_state() == 2
+    assert (await restored.get_file_by_id(kept.id)) is not None
+    assert (await restored.get_file_by_id(changed.id)).status == FileStatus.COMPLETED
+    await restored._file_repository.close()
@@ -0,0 +1,68 @@
+"""
+Tests for the volatile transfer progress store and its sampler.
+"""
+
+import pytest
+
+from app.core.events.event_bus import DomainEventBus
+from app.core.events.file_events import FileCopyProgressEvent
+from app.core.file_repository import FileRepository
+from app.core.transfer_progress import TransferProgress, TransferProgressStore
+from app.services.state_manager import StateManager
+from app.services.transfer_progress_sampler import TransferProgressSampler
+
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_progress_record_is_slotted_and_computes_percent():
+    progress = TransferProgress("file-1", total_bytes=1000)
+    progress.bytes_copied = 250
+
+    assert progress.copy_progress == 25.0
+    with pytest.raises(AttributeError):
+        progress.unexpected = 1
+
+
+async def test_sampler_publishes_only_transfers_that_moved():
+    event_bus = DomainEventBus()
+    state_manager = StateManager(file_repository=FileRepository())
+    tracked = await state_manager.add_file("/src/clip.mxf", 1000)
+
+    published = []
+
+    async def record(event):
+        published.append(event)
+
+    await event_bus.subscribe(FileCopyProgressEvent, record)
+
+    store = TransferProgressStore()
+    sampler = TransferProgressSampler(store, state_manager, event_bus=event_bus)
+    progress = store.start(tracked.id, total_bytes=1000)
+
+    for chunk_end in (100, 200, 300):  # Several chunks between two samples
+        progress.bytes_copied = chunk_end
+    assert await sampler.sample_once() == 1
+    assert await sampler.sample_once() == 0  # Nothing moved
+
+    assert [e.bytes_copied for e in published] == [300]
+    stored = await state_manager.get_file_by_id(tracked.id)
+    assert stored.bytes_copied == 300
+    assert stored.copy_progress == 30.0
+
+    store.finish(tracked.id)
+    assert len(store) == 0
+
+
+async def test_copy_strategy_and_sampler_share_the_provided_store():
+    from app.dependencies import (
+        get_copy_strategy,
+        get_transfer_progress_sampler,
+        get_transfer_progress_store,
+    )
+
+    store = get_transfer_progress_store()
+    assert len(store) == 0  # Empty store must still be the one injected
+
+    assert get_copy_strategy()._progress_store is store
+    assert get_transfer_progress_sampler()._progress_store is store
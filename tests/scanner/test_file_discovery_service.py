@@ -2,10 +2,14 @@
 Tests for file discovery functionality - now integrated in FileScanOrchestrator.
 """
 
+import os
+
 import pytest
-from unittest.mock import patch, AsyncMock, MagicMock
+from unittest.mock import patch, MagicMock
 from app.services.scanner.file_scanner import FileScanner
 from app.services.scanner.domain_objects import ScanConfiguration
+from app.services.scanner.observation_stage import FileObservationStage
+from app.services.scanner.tree_walker import SourceTreeWalker
 from app.services.state_manager import StateManager
 from app.config import Settings
 
@@ -35,90 +39,78 @@ class TestFileDiscovery:
         settings.growing_file_safety_margin_mb = 50
         settings.growing_file_growth_timeout_seconds = 300
         settings.growing_file_chunk_size_kb = 2048
-        return FileScanner(config, mock_state_manager, settings=settings)
+        stage = FileObservationStage(SourceTreeWalker(), max_age_seconds=5)
+        return FileScanner(config, mock_state_manager, stage, settings=settings)
 
     @pytest.mark.asyncio
-    async def test_discover_all_files_success(self, orchestrator):
+    async def test_discover_all_files_success(self, orchestrator, tmp_path):
         """Test successful file discovery."""
-        with (
-            patch("aiofiles.os.path.exists", new_callable=AsyncMock) as mock_exists,
-            patch("aiofiles.os.path.isdir", new_callable=AsyncMock) as mock_isdir,
-            patch("os.walk") as mock_walk,
-        ):
-            mock_exists.return_value = True
-            mock_isdir.return_value = True
-            mock_walk.return_value = [
-                (
-                    "/test/source",
-                    [],
-                    ["file1.mxf", "file2.MXF", "file3.mp4", "test_file.mxf"],
-                )
-            ]
+        for name in ("file1.mxf", "file2.MXF", "file3.mp4", "test_file.mxf"):
+            (tmp_path / name).write_bytes(b"x" * 10)
+        orchestrator.config.source_directory = str(tmp_path)
 
-            files = await orchestrator._discover_all_files()
+        files = await orchestrator._discover_all_files()
+
+        # Should find 2 files (excluding .mp4 and test_file)
+        assert set(files) == {
+            str(tmp_path / "file1.mxf"),
+            str(tmp_path / "file2.MXF"),
+        }
+
+    @pytest.mark.asyncio
+    async def test_discover_returns_size_and_mtime(self, orchestrator, tmp_path):
+        """The walk's own stat result is returned, so no later stage stats again."""
+        nested = tmp_path / "day1" / "cam2"
+        nested.mkdir(parents=True)
+        clip = nested / "clip.mxf"
+        clip.write_bytes(b"x" * 1234)
+        orchestrator.config.source_directory = str(tmp_path)
+
+        files = await orchestrator._discover_all_files()
 
-            # Should find 2 files (excluding .mp4 and test_file)
-            assert len(files) == 2
-            file_paths = {str(f) for f in files}
-            assert any("file1.mxf" in path for path in file_paths)
-            assert any("file2.MXF" in path for path in file_paths)
+        observation = files[str(clip)]
+        assert observation.size == 1234
+        assert observation.mtime == clip.stat().st_mtime
 
     @pytest.mark.asyncio
-    async def test_discover_source_not_exists(self, orchestrator):
+    async def test_discover_source_not_exists(self, orchestrator, tmp_path):
         """Test when source directory doesn't exist."""
-        with patch("aiofiles.os.path.exists", new_callable=AsyncMock) as mock_exists:
-            mock_exists.return_value = False
+        orchestrator.config.source_directory = str(tmp_path / "missing")
 
-            files = await orchestrator._discover_all_files()
-            assert len(files) == 0
+        files = await orchestrator._discover_all_files()
+        assert len(files) == 0
 
     @pytest.mark.asyncio
-    async def test_discover_source_not_directory(self, orchestrator):
+    async def test_discover_source_not_directory(self, orchestrator, tmp_path):
         """Test when source path is not a directory."""
-        with (
-            patch("aiofiles.os.path.exists", new_callable=AsyncMock) as mock_exists,
-            patch("aiofiles.os.path.isdir", new_callable=AsyncMock) as mock_isdir,
-        ):
-            mock_exists.return_value = True
-            mock_isdir.return_value = False
+        source_file = tmp_path / "source.mxf"
+        source_file.write_bytes(b"x")
+        orchestrator.config.source_directory = str(source_file)
 
-            files = await orchestrator._discover_all_files()
-            assert len(files) == 0
+        files = await orchestrator._discover_all_files()
+        assert len(files) == 0
 
     @pytest.mark.asyncio
     async def test_discover_handles_exception(self, orchestrator):
         """Test that exceptions are handled gracefully."""
-        with patch("aiofiles.os.path.exists", new_callable=AsyncMock) as mock_exists:
-            mock_exists.side_effect = Exception("Test error")
-
+        with patch(
+            "app.services.scanner.tree_walker.SourceTreeWalker.walk_stream",
+            side_effect=Exception("Test error"),
+        ):
             files = await orchestrator._discover_all_files()
-            assert len(files) == 0  # Should return empty set on error
+            assert len(files) == 0  # Should return empty snapshot on error
 
     @pytest.mark.asyncio
-    async def test_filters_ignored_files(self, orchestrator):
+    async def test_filters_ignored_files(self, orchestrator, tmp_path):
         """Test that ignored files are filtered out."""
-        with (
-            patch("aiofiles.os.path.exists", new_callable=AsyncMock) as mock_exists,
-            patch("aiofiles.os.path.isdir", new_callable=AsyncMock) as mock_isdir,
-            patch("os.walk") as mock_walk,
-        ):
-            mock_exists.return_value = True
-            mock_isdir.return_value = True
-            mock_walk.return_value = [
-                (
-                    "/test/source",
-                    [],
-                    [
-                        "normal.mxf",  # Should be included
-                        "test_file.mxf",  # Should be filtered out
-                        ".hidden.mxf",  # Should be filtered out
-                        "another.mp4",  # Should be filtered out (not MXF)
-                    ],
-                )
-            ]
+        for name in ("normal.mxf", "test_file.mxf", ".hidden.mxf", "another.mp4"):
+            (tmp_path / name).write_bytes(b"x")
+        orchestrator.config.source_directory = str(tmp_path)
 
+        with patch("os.DirEntry.stat", autospec=True) as mock_stat:
+            mock_stat.return_value = os.stat_result((0,) * 10)
             files = await orchestrator._discover_all_files()
 
-            assert len(files) == 1
-            file_paths = {str(f) for f in files}
-            assert any("normal.mxf" in path for path in file_paths)
+        assert set(files) == {str(tmp_path / "normal.mxf")}
+        # Filtered names are rejected before any stat call
+        assert mock_stat.call_count == 1
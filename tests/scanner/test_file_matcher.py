@@ -0,0 +1,41 @@
+"""
+Tests for FileNameMatcher.
+"""
+
+import pytest
+
+from app.services.scanner.file_matcher import FileNameMatcher
+
+
+class TestFileNameMatcher:
+    def test_defaults_match_the_original_mxf_rules(self):
+        matcher = FileNameMatcher.from_patterns()
+
+        assert matcher.matches("clip.mxf")
+        assert matcher.matches("CLIP.MXF")
+        assert not matcher.matches("clip.mov")
+        assert not matcher.matches(".hidden.mxf")
+        assert not matcher.matches("my_TEST_FILE.mxf")
+
+    def test_extension_globs_use_the_hash_set(self):
+        matcher = FileNameMatcher.from_patterns("*.mxf, *.MOV,*.wav", "")
+
+        assert matcher.include_extensions == frozenset({".mxf", ".mov", ".wav"})
+        assert matcher._include_regex is None
+        assert matcher.matches("audio.WAV")
+        assert not matcher.matches("clip.mp4")
+
+    def test_globs_and_regexes_combine(self):
+        matcher = FileNameMatcher.from_patterns(
+            r"*.mxf,CAM?_*.mp4,re:^\d{6}_pgm\.mov$", r"*_proxy.*,re:\.tmp$"
+        )
+
+        assert matcher.matches("CAM1_take3.mp4")
+        assert matcher.matches("251016_PGM.mov")
+        assert not matcher.matches("CAM12_take3.mp4")
+        assert not matcher.matches("clip_proxy.mxf")  # Exclude wins over include
+        assert not matcher.matches("upload.mxf.tmp")
+
+    def test_invalid_regex_is_reported(self):
+        with pytest.raises(ValueError):
+            FileNameMatcher.from_patterns("re:([unclosed", "")
@@ -0,0 +1,150 @@
+"""
+Tests for the inotify watcher and the scanner's close-write fast track.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.file_repository import FileRepository
+from app.services.scanner.domain_objects import ScanConfiguration
+from app.services.scanner.file_scanner import FileScanner
+from app.services.scanner.observation_stage import FileObservationStage
+from app.services.scanner.tree_walker import SourceTreeWalker
+from app.services.scanner.inotify_watcher import (
+    APPEARED,
+    CLOSED,
+    InotifyWatcher,
+    WatchEvent,
+)
+from app.services.state_manager import StateManager
+from app.config import Settings
+from app.models import FileStatus
+
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(
+        not InotifyWatcher.is_supported(), reason="inotify requires Linux"
+    ),
+]
+
+
+async def _drain(watcher, expected_count, timeout=1.0):
+    events = []
+    while len(events) < expected_count:
+        events.append(await asyncio.wait_for(watcher.events.get(), timeout))
+    return events
+
+
+async def test_new_file_is_reported_as_appeared_then_closed(tmp_path):
+    watcher = InotifyWatcher(str(tmp_path))
+    assert await watcher.start()
+    try:
+        clip = tmp_path / "clip.mxf"
+        clip.write_bytes(b"x" * 100)
+        (tmp_path / "notes.txt").write_text("ignored")
+
+        events = await _drain(watcher, 2)
+
+        assert events == [
+            WatchEvent(APPEARED, str(clip)),
+            WatchEvent(CLOSED, str(clip)),
+        ]
+        assert watcher.events.empty()
+    finally:
+        watcher.stop()
+
+
+async def test_files_in_a_new_subdirectory_are_picked_up(tmp_path):
+    watcher = InotifyWatcher(str(tmp_path))
+    assert await watcher.start()
+    try:
+        # Built outside the tree and moved in, so only the directory event fires
+        staging = tmp_path.parent / f"{tmp_path.name}-staging"
+        staging.mkdir()
+        (staging / "early.mxf").write_bytes(b"x")
+        staging.rename(tmp_path / "day1")
+
+        events = await _drain(watcher, 1)
+        assert events == [WatchEvent(APPEARED, str(tmp_path / "day1" / "early.mxf"))]
+
+        late = tmp_path / "day1" / "late.mxf"
+        late.write_bytes(b"x")
+        events = await _drain(watcher, 2)
+        assert WatchEvent(CLOSED, str(late)) in events
+    finally:
+        watcher.stop()
+
+
+async def test_tree_registration_runs_off_the_event_loop(tmp_path, monkeypatch):
+    (tmp_path / "day1" / "cam1").mkdir(parents=True)
+    registered_on = []
+    original_watch_tree = InotifyWatcher._watch_tree
+
+    def recording_watch_tree(self, root, report_files):
+        registered_on.append(threading.current_thread())
+        original_watch_tree(self, root, report_files)
+
+    monkeypatch.setattr(InotifyWatcher, "_watch_tree", recording_watch_tree)
+    watcher = InotifyWatcher(str(tmp_path))
+    assert await watcher.start()
+    try:
+        (tmp_path / "day2").mkdir()
+        clip = tmp_path / "day2" / "clip.mxf"
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if watcher.watch_count == 4:
+                break
+        clip.write_bytes(b"x")
+        events = await _drain(watcher, 2)
+
+        assert WatchEvent(CLOSED, str(clip)) in events
+        assert len(registered_on) == 2
+        assert threading.main_thread() not in registered_on
+    finally:
+        watcher.stop()
+
+
+async def test_missing_source_does_not_start(tmp_path):
+    watcher = InotifyWatcher(str(tmp_path / "missing"))
+    assert not await watcher.start()
+
+
+async def test_close_write_fast_tracks_file_to_ready(tmp_path):
+    settings = Settings(
+        source_directory=str(tmp_path),
+        growing_file_growth_timeout_seconds=300,
+        growing_file_min_size_mb=100,
+    )
+    config = ScanConfiguration(
+        source_directory=str(tmp_path),
+        polling_interval_seconds=3600,
+        file_stable_time_seconds=300,
+        keep_files_hours=1,
+        inotify_enabled=True,
+        inotify_close_settle_seconds=0.05,
+    )
+    state_manager = StateManager(file_repository=FileRepository())
+    stage = FileObservationStage(SourceTreeWalker(), max_age_seconds=5)
+    scanner = FileScanner(config, state_manager, stage, settings=settings)
+    await scanner.start_scanning()
+    try:
+        await asyncio.sleep(0.05)  # Let the first (empty) poll finish
+        clip = tmp_path / "clip.mxf"
+        clip.write_bytes(b"x" * 4096)
+
+        tracked_file = None
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            tracked_file = await state_manager.get_active_file_by_path(str(clip))
+            if tracked_file is not None and tracked_file.status == FileStatus.READY:
+                break
+
+        # Without the close event this would wait for the 300 s growth timeout
+        assert tracked_file is not None
+        assert tracked_file.status == FileStatus.READY
+        assert tracked_file.file_size == 4096
+    finally:
+        await scanner.stop_scanning()
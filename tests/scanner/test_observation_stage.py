@@ -0,0 +1,115 @@
+"""
+Tests for FileObservationStage, the stat stage shared by scanner and growth monitor.
+"""
+
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.config import Settings
+from app.core.file_repository import FileRepository
+from app.models import FileStatus
+from app.services.growing_file_detector import GrowingFileDetector
+from app.services.scanner.domain_objects import FileObservation
+from app.services.scanner.observation_stage import FileObservationStage
+from app.services.scanner.tree_walker import SourceTreeWalker
+from app.services.state_manager import StateManager
+
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def walker():
+    walker = SourceTreeWalker()
+    yield walker
+    walker.close()
+
+
+async def test_published_observations_are_reused_without_a_stat(tmp_path, walker):
+    clip = tmp_path / "clip.mxf"
+    clip.write_bytes(b"x" * 10)
+    stage = FileObservationStage(walker, max_age_seconds=5)
+    walker.observe_many = AsyncMock(wraps=walker.observe_many)
+
+    stage.publish({str(clip): FileObservation(str(clip), 10, 0.0)})
+    observations = await stage.observe_many([str(clip)])
+
+    assert observations[str(clip)].size == 10
+    walker.observe_many.assert_not_called()
+
+
+async def test_stale_and_unknown_paths_are_stated_in_one_batch(tmp_path, walker):
+    stale = tmp_path / "stale.mxf"
+    stale.write_bytes(b"x" * 20)
+    unseen = tmp_path / "unseen.mxf"
+    unseen.write_bytes(b"x" * 30)
+    gone = str(tmp_path / "gone.mxf")
+    stage = FileObservationStage(walker, max_age_seconds=5)
+    stage.publish(
+        {str(stale): FileObservation(str(stale), 1, 0.0, observed_at=time.time() - 60)}
+    )
+    walker.observe_many = AsyncMock(wraps=walker.observe_many)
+
+    observations = await stage.observe_many([str(stale), str(unseen), gone])
+
+    walker.observe_many.assert_awaited_once()
+    assert observations[str(stale)].size == 20
+    assert observations[str(unseen)].size == 30
+    assert observations[gone] is None
+
+
+async def test_unanswered_paths_are_left_out_not_reported_gone(walker):
+    stage = FileObservationStage(walker, max_age_seconds=5)
+    walker.observe_many = AsyncMock(return_value={})
+
+    observations = await stage.observe_many(["/hung/mount/clip.mxf"])
+
+    assert "/hung/mount/clip.mxf" not in observations
+
+
+async def test_growth_check_consumes_the_given_observation(tmp_path, walker):
+    state_manager = StateManager(file_repository=FileRepository())
+    stage = FileObservationStage(walker, max_age_seconds=5)
+    stage.observe_many = AsyncMock()
+    detector = GrowingFileDetector(Settings(), state_manager, stage)
+    path = str(tmp_path / "clip.mxf")  # Never created: no stat may happen
+    tracked_file = await state_manager.add_file(path, 100)
+
+    status, _ = await detector.check_file_growth_status(
+        tracked_file, FileObservation(path, 100, 0.0)
+    )
+
+    assert status == FileStatus.DISCOVERED
+    stage.observe_many.assert_not_called()
+
+
+async def test_unchanged_file_poll_writes_and_publishes_nothing(tmp_path, walker):
+    from app.core.events.event_bus import DomainEventBus
+    from app.core.events.file_events import FilesBatchUpdatedEvent
+
+    event_bus = DomainEventBus()
+    state_manager = StateManager(file_repository=FileRepository(), event_bus=event_bus)
+    detector = GrowingFileDetector(
+        Settings(), state_manager, FileObservationStage(walker, max_age_seconds=5)
+    )
+    path = str(tmp_path / "clip.mxf")
+    tracked_file = await state_manager.add_file(path, 100)
+    await detector.check_file_growth_status(tracked_file, FileObservation(path, 100, 0.0))
+    await detector.check_file_growth_status(tracked_file, FileObservation(path, 200, 0.0))
+    await detector.check_file_growth_status(tracked_file, FileObservation(path, 200, 0.0))
+
+    batches = []
+
+    async def record(event):
+        batches.append(event)
+
+    await event_bus.subscribe(FilesBatchUpdatedEvent, record)
+    for _ in range(3):
+        time.sleep(0.01)  # Each poll observes at a later time
+        await detector.check_file_growth_status(
+            tracked_file, FileObservation(path, 200, 0.0)
+        )
+
+    assert batches == []
@@ -0,0 +1,224 @@
+"""
+Tests for SourceTreeWalker's per-directory listing cache.
+"""
+
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.services.scanner.file_matcher import FileNameMatcher
+from app.services.scanner.tree_walker import SourceTreeWalker
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _age_directories(root):
+    """Push every directory's mtime out of the racy window so listings are trusted."""
+    past = time.time() - 60
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, (past, past))
+
+
+def _build_tree(tmp_path):
+    for folder in ("cold/archive1", "cold/archive2", "hot"):
+        (tmp_path / folder).mkdir(parents=True)
+    (tmp_path / "cold/archive1/old.mxf").write_bytes(b"x" * 10)
+    (tmp_path / "cold/archive2/older.mxf").write_bytes(b"x" * 20)
+    (tmp_path / "hot/live.mxf").write_bytes(b"x" * 30)
+    _age_directories(tmp_path)
+
+
+async def test_unchanged_directories_are_not_listed_again(tmp_path):
+    _build_tree(tmp_path)
+    walker = SourceTreeWalker(full_rescan_interval_seconds=3600)
+
+    first = await walker.walk(str(tmp_path))
+    assert walker.directories_listed == 5
+    second = await walker.walk(str(tmp_path))
+
+    assert walker.directories_listed == 0
+    assert walker.directories_reused == 5
+    assert second == first
+
+
+async def test_only_the_changed_directory_is_relisted(tmp_path):
+    _build_tree(tmp_path)
+    walker = SourceTreeWalker(full_rescan_interval_seconds=3600)
+    await walker.walk(str(tmp_path))
+
+    new_clip = tmp_path / "hot" / "new.mxf"
+    new_clip.write_bytes(b"x" * 5)
+    (tmp_path / "cold/archive1/old.mxf").unlink()
+    snapshot = await walker.walk(str(tmp_path))
+
+    assert walker.directories_listed == 2
+    assert str(new_clip) in snapshot
+    assert str(tmp_path / "cold/archive1/old.mxf") not in snapshot
+    assert str(tmp_path / "cold/archive2/older.mxf") in snapshot
+
+
+async def test_refresh_paths_get_fresh_sizes_in_unchanged_directories(tmp_path):
+    _build_tree(tmp_path)
+    walker = SourceTreeWalker(full_rescan_interval_seconds=3600)
+    await walker.walk(str(tmp_path))
+
+    live = tmp_path / "hot" / "live.mxf"
+    with open(live, "ab") as f:
+        f.write(b"y" * 70)
+
+    stale = await walker.walk(str(tmp_path))
+    fresh = await walker.walk(str(tmp_path), refresh_paths={str(live)})
+
+    assert walker.directories_listed == 0
+    assert stale[str(live)].size == 30
+    assert fresh[str(live)].size == 100
+
+
+async def test_empty_file_is_restatted_in_unchanged_directory(tmp_path):
+    (tmp_path / "hot").mkdir()
+    clip = tmp_path / "hot" / "clip.mxf"
+    clip.write_bytes(b"")
+    _age_directories(tmp_path)
+    walker = SourceTreeWalker(full_rescan_interval_seconds=3600)
+
+    first = await walker.walk(str(tmp_path))
+    with open(clip, "ab") as f:
+        f.write(b"y" * 1000)  # Appending leaves the directory mtime alone
+    second = await walker.walk(str(tmp_path))
+
+    assert first[str(clip)].size == 0
+    assert walker.directories_listed == 0
+    assert second[str(clip)].size == 1000
+
+
+async def test_full_rescan_relists_everything(tmp_path):
+    _build_tree(tmp_path)
+    walker = SourceTreeWalker(full_rescan_interval_seconds=0)
+    await walker.walk(str(tmp_path))
+    await walker.walk(str(tmp_path))
+
+    assert walker.directories_listed == 5
+    assert walker.directories_reused == 0
+
+
+async def test_recently_changed_directory_is_not_trusted(tmp_path):
+    (tmp_path / "clip.mxf").write_bytes(b"x")
+    walker = SourceTreeWalker(full_rescan_interval_seconds=3600)
+
+    await walker.walk(str(tmp_path))
+    await walker.walk(str(tmp_path))
+
+    # The directory changed within the mtime granularity window, so it is listed again
+    assert walker.directories_listed == 1
+
+
+async def test_stream_yields_each_directory_as_it_completes(tmp_path):
+    _build_tree(tmp_path)
+    walker = SourceTreeWalker(max_workers=2)
+
+    batches = [batch async for batch in walker.walk_stream(str(tmp_path))]
+
+    assert len(batches) == 3
+    assert sorted(len(batch) for batch in batches) == [1, 1, 1]
+
+
+async def test_hung_directory_is_skipped_without_blocking_the_loop(tmp_path, monkeypatch):
+    _build_tree(tmp_path)
+    walker = SourceTreeWalker(directory_timeout_seconds=0.1)
+    hung = str(tmp_path / "cold")
+    original_visit = walker._visit
+
+    def visit(heartbeat, directory, full, refresh_paths):
+        if directory == hung:
+            time.sleep(0.5)  # A stuck NFS/SMB directory
+        return original_visit(heartbeat, directory, full, refresh_paths)
+
+    monkeypatch.setattr(walker, "_visit", visit)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    snapshot = await walker.walk(str(tmp_path))
+    ticker_task.cancel()
+
+    assert set(snapshot) == {str(tmp_path / "hot/live.mxf")}
+    assert walker.unreachable_directories == [hung]
+    assert ticks >= 5  # The event loop kept running during the walk
+    walker.close()
+
+
+async def test_stuck_directory_is_not_visited_again_until_it_returns(tmp_path, monkeypatch):
+    _build_tree(tmp_path)
+    walker = SourceTreeWalker(full_rescan_interval_seconds=0, directory_timeout_seconds=0.05)
+    hung = str(tmp_path / "cold")
+    release = threading.Event()
+    visits = []
+    original_visit = walker._visit
+
+    def visit(heartbeat, directory, full, refresh_paths):
+        visits.append(directory)
+        if directory == hung:
+            release.wait(5)
+        return original_visit(heartbeat, directory, full, refresh_paths)
+
+    monkeypatch.setattr(walker, "_visit", visit)
+
+    await walker.walk(str(tmp_path))
+    await walker.walk(str(tmp_path))
+    assert visits.count(hung) == 1
+    assert walker.unreachable_directories == [hung]
+
+    release.set()
+    await asyncio.sleep(0.05)
+    snapshot = await walker.walk(str(tmp_path))
+    assert visits.count(hung) == 2
+    assert str(tmp_path / "cold/archive1/old.mxf") in snapshot
+    walker.close()
+
+
+async def test_slow_directory_that_keeps_answering_is_listed(tmp_path, monkeypatch):
+    for index in range(5):
+        (tmp_path / f"clip{index}.mxf").write_bytes(b"x")
+    walker = SourceTreeWalker(directory_timeout_seconds=0.1)
+    original_stat = os.DirEntry.stat
+
+    def slow_stat(entry, *args, **kwargs):
+        time.sleep(0.05)  # Each stat is slow, the whole listing exceeds the timeout
+        return original_stat(entry, *args, **kwargs)
+
+    monkeypatch.setattr(os.DirEntry, "stat", slow_stat)
+    snapshot = await walker.walk(str(tmp_path))
+    walker.close()
+
+    assert len(snapshot) == 5
+    assert walker.unreachable_directories == []
+
+
+async def test_configured_matcher_selects_files_before_stat(tmp_path, monkeypatch):
+    for name in ("clip.mxf", "clip.mov", "clip.wav", "clip.txt"):
+        (tmp_path / name).write_bytes(b"x")
+    walker = SourceTreeWalker(matcher=FileNameMatcher.from_patterns("*.mxf,*.mov", ""))
+
+    stat_calls = []
+    original_stat = os.DirEntry.stat
+
+    def counting_stat(entry, *args, **kwargs):
+        stat_calls.append(entry.name)
+        return original_stat(entry, *args, **kwargs)
+
+    monkeypatch.setattr(os.DirEntry, "stat", counting_stat)
+    snapshot = await walker.walk(str(tmp_path))
+    walker.close()
+
+    assert {os.path.basename(path) for path in snapshot} == {"clip.mxf", "clip.mov"}
+    assert sorted(stat_calls) == ["clip.mov", "clip.mxf"]
@@ -16,6 +16,8 @@ import pytest
 
 from app.services.state_manager import StateManager
 from app.domains.file_discovery.file_scanner_service import FileScannerService
+from app.services.scanner.observation_stage import FileObservationStage
+from app.services.scanner.tree_walker import SourceTreeWalker
 from app.models import FileStatus
 from app.config import Settings
 
@@ -51,7 +53,8 @@ class TestCompletedFilesPersistence:
     @pytest.fixture
     def file_scanner(self, state_manager, test_settings):
         """Create FileScannerService for testing"""
-        scanner = FileScannerService(test_settings, state_manager)
+        stage = FileObservationStage(SourceTreeWalker(), max_age_seconds=5)
+        scanner = FileScannerService(test_settings, state_manager, stage)
         yield scanner
         scanner.stop_scanning()
 
@@ -204,8 +207,9 @@ class TestCompletedFilesPersistence:
         # Manually set completion time to 3 hours ago
         old_completed_time = datetime.now() - timedelta(hours=3)
 
-        async with state_manager._lock:
-            tracked_file = await state_manager._get_current_file_for_path("/old/file.mxf")
+        async with state_manager._locks.exclusive():
+            current = await state_manager._get_current_file_for_path("/old/file.mxf")
+            tracked_file = await state_manager._file_repository.get_for_update(current.id)
             if tracked_file:
                 tracked_file.completed_at = old_completed_time
                 await state_manager._file_repository.add(tracked_file)
@@ -244,7 +248,11 @@ class TestCompletedFilesPersistence:
 
             # Make some files old
             if i < 2:  # First 2 files are old
-                tracked.completed_at = datetime.now() - timedelta(hours=25)
+                await state_manager.update_file_status_by_id(
+                    tracked.id,
+                    FileStatus.COMPLETED,
+                    completed_at=datetime.now() - timedelta(hours=25),
+                )
             # Last file is recent (current time)
 
             tracked_files.append(tracked)
@@ -0,0 +1,135 @@
+"""
+Tests for streaming content checksums and the verification modes.
+"""
+
+import hashlib
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.history import get_checksum
+from app.config import Settings
+from app.core.file_repository import FileRepository
+from app.models import CopyCheckpoint, FileStatus
+from app.services.copy import content_hasher
+from app.services.copy.content_hasher import BLAKE2B, ContentHasher
+from app.services.copy.file_copy_executor import FileCopyExecutor
+from app.services.copy_strategies import create_copy_strategy
+from app.services.state_manager import StateManager
+
+
+pytestmark = pytest.mark.asyncio
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 17)
+EXPECTED = hashlib.blake2b(PAYLOAD, digest_size=32).hexdigest()
+
+
+async def test_hasher_matches_one_shot_digest_and_resumes_from_file(tmp_path):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+    hasher = ContentHasher()
+
+    hasher.update_from_file(str(source), 1000)
+    hasher.update(PAYLOAD[1000:5000])
+    hasher.update_from_file(str(source))
+
+    assert hasher.position == len(PAYLOAD)
+    assert hasher.hexdigest() == EXPECTED
+
+
+async def test_xxhash_falls_back_to_blake2b_when_not_installed(monkeypatch):
+    monkeypatch.setattr(content_hasher, "xxhash", None)
+    assert ContentHasher("xxhash").algorithm == BLAKE2B
+
+
+@pytest.fixture
+def state_manager():
+    return StateManager(file_repository=FileRepository())
+
+
+async def _copy(tmp_path, state_manager, **overrides):
+    source = tmp_path / "src" / "clip.mxf"
+    source.parent.mkdir(exist_ok=True)
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "dst" / "clip.mxf"
+    settings = Settings(
+        growing_file_chunk_size_kb=256, progress_sample_interval_seconds=0.01, **overrides
+    )
+    strategy = create_copy_strategy(
+        settings, state_manager, AsyncMock(spec=FileCopyExecutor)
+    )
+    tracked_file = await state_manager.add_file(str(source), len(PAYLOAD))
+    await state_manager.update_file_status_by_id(tracked_file.id, FileStatus.READY)
+    return strategy, tracked_file, str(source), str(dest)
+
+
+@pytest.mark.parametrize("copy_mode", ["sequential", "pipelined", "threaded"])
+async def test_source_hash_is_streamed_and_stored(tmp_path, state_manager, copy_mode):
+    strategy, tracked_file, source, dest = await _copy(
+        tmp_path, state_manager, copy_mode=copy_mode, verification_mode="source_hash"
+    )
+
+    assert await strategy.copy_file(source, dest, tracked_file)
+
+    completed = await state_manager.get_file_by_id(tracked_file.id)
+    assert completed.status == FileStatus.COMPLETED
+    assert completed.content_hash == EXPECTED
+    assert completed.content_hash_algorithm == BLAKE2B
+    assert not os.path.exists(source)
+
+    response = await get_checksum(source, state_manager)
+    assert response["content_hash"] == EXPECTED
+
+
+async def test_resumed_copy_hashes_the_kept_prefix(tmp_path, state_manager):
+    strategy, tracked_file, source, dest = await _copy(
+        tmp_path, state_manager, verification_mode="source_hash"
+    )
+    os.makedirs(os.path.dirname(dest))
+    with open(dest, "wb") as f:
+        f.write(PAYLOAD[: 2 * 1024 * 1024])
+    await state_manager.update_many(
+        {tracked_file.id: {"copy_checkpoint": CopyCheckpoint(destination_path=dest)}}
+    )
+
+    assert await strategy.copy_file(source, dest, tracked_file)
+    assert (await state_manager.get_file_by_id(tracked_file.id)).content_hash == EXPECTED
+
+
+async def test_readback_mismatch_fails_and_discards_destination(tmp_path, state_manager):
+    strategy, tracked_file, source, dest = await _copy(
+        tmp_path, state_manager, verification_mode="readback"
+    )
+
+    with patch("app.services.copy.content_verifier.file_digest", return_value="0" * 64):
+        assert not await strategy.copy_file(source, dest, tracked_file)
+
+    assert os.path.exists(source)
+    assert not os.path.exists(dest)
+    assert (await state_manager.get_file_by_id(tracked_file.id)).content_hash is None
+
+
+async def test_readback_match_completes(tmp_path, state_manager):
+    strategy, tracked_file, source, dest = await _copy(
+        tmp_path, state_manager, verification_mode="readback", checksum_algorithm="blake2b"
+    )
+
+    assert await strategy.copy_file(source, dest, tracked_file)
+    assert (await state_manager.get_file_by_id(tracked_file.id)).content_hash == EXPECTED
+
+
+async def test_unknown_verification_mode_is_rejected(state_manager):
+    with pytest.raises(ValueError, match="verification_mode"):
+        create_copy_strategy(
+            Settings(verification_mode="md5"),
+            state_manager,
+            AsyncMock(spec=FileCopyExecutor),
+        )
+
+
+async def test_checksum_endpoint_reports_unknown_file(state_manager):
+    with pytest.raises(HTTPException) as exc_info:
+        await get_checksum("/src/unknown.mxf", state_manager)
+    assert exc_info.value.status_code == 404
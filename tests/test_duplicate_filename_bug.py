@@ -19,6 +19,8 @@ import pytest
 
 from app.services.state_manager import StateManager
 from app.domains.file_discovery.file_scanner_service import FileScannerService
+from app.services.scanner.observation_stage import FileObservationStage
+from app.services.scanner.tree_walker import SourceTreeWalker
 from app.config import Settings
 from app.models import FileStatus
 
@@ -57,7 +59,8 @@ class TestDuplicateFilenameBug:
     @pytest.fixture
     def file_scanner(self, state_manager, settings):
         """Create FileScannerService instance"""
-        return FileScannerService(settings, state_manager)
+        stage = FileObservationStage(SourceTreeWalker(), max_age_seconds=5)
+        return FileScannerService(settings, state_manager, stage)
 
     @pytest.mark.asyncio
     async def test_duplicate_filename_creates_new_tracked_file(
@@ -269,7 +272,8 @@ async def manual_test_duplicate_filename_bug():
             file_stable_time_seconds=1,
         )
 
-        file_scanner = FileScannerService(settings, state_manager)
+        stage = FileObservationStage(SourceTreeWalker(), max_age_seconds=5)
+        file_scanner = FileScannerService(settings, state_manager, stage)
         test_file = source_dir / "duplicate_test.mxv"
 
         # Primera fil
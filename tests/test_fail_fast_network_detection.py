@@ -10,6 +10,7 @@ from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 from app.config import Settings
+from app.core.transfer_progress import TransferProgress
 from app.models import FileStatus, TrackedFile
 from app.services.copy.network_error_detector import NetworkError, NetworkErrorDetector
 from app.services.copy_strategies import GrowingFileCopyStrategy
@@ -122,8 +123,7 @@ class TestFailFastNetworkErrorDetection:
                     start_bytes=0,
                     end_bytes=65536,  # 64KB
                     chunk_size=65536,
-                    tracked_file=tracked_file,
-                    current_file_size=2000000,
+                    progress=TransferProgress(tracked_file.id, total_bytes=2000000),
                     pause_ms=0,
                     network_detector=network_detector,
                 )
@@ -68,6 +68,7 @@ class TestFileCopyExecutorBasics:
 
         expected_info = {
             "chunk_size_kb": 2048,  # Simple 2MB chunks
+            "use_kernel_copy": True,
             "progress_update_interval": 10,  # From settings (fixed)
             "use_temporary_file": True,
             "default_strategy": "temp_file",
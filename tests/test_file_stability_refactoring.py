@@ -8,10 +8,11 @@ for file stability tracking instead of the removed FileStabilityTracker.
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from datetime import datetime, timedelta
-from pathlib import Path
 
 from app.services.scanner.file_scanner import FileScanner
-from app.services.scanner.domain_objects import ScanConfiguration
+from app.services.scanner.domain_objects import FileObservation, ScanConfiguration
+from app.services.scanner.observation_stage import FileObservationStage
+from app.services.scanner.tree_walker import SourceTreeWalker
 from app.services.state_manager import StateManager
 from app.models import FileStatus
 from app.dependencies import reset_singletons
@@ -52,6 +53,7 @@ class TestFileStabilityRefactoring:
         return FileScanner(
             config=scan_config,
             state_manager=state_manager,
+            observation_stage=FileObservationStage(SourceTreeWalker(), max_age_seconds=5),
             storage_monitor=None,
             settings=settings,
         )
@@ -77,39 +79,33 @@ class TestFileStabilityRefactoring:
         # Store original discovered_at
         original_discovered = tracked_file.discovered_at
 
-        # Create metadata dictionary with changed size
+        # The scan's snapshot now carries the changed size
         new_time = datetime.now()
-        metadata = {
-            "path": Path(file_path),
-            "size": 2048,  # Different size
-            "last_write_time": new_time,
+        snapshot = {
+            file_path: FileObservation(
+                path=file_path, size=2048, mtime=new_time.timestamp()
+            )
         }
 
         # Call stability logic
-        with patch(
-            "app.services.scanner.file_scanner.get_file_metadata",
-            new_callable=AsyncMock,
-        ) as mock_get_metadata:
-            mock_get_metadata.return_value = metadata
-            # Mock the state manager's get_files_by_status to return our file
+        with patch.object(
+            state_manager, "get_files_by_status", new_callable=AsyncMock
+        ) as mock_get_files:
+            mock_get_files.return_value = [tracked_file]
+            # We need to simulate that the _handle_growing_file_logic method actually calls the growing detector
             with patch.object(
-                state_manager, "get_files_by_status", new_callable=AsyncMock
-            ) as mock_get_files:
-                mock_get_files.return_value = [tracked_file]
-                # We need to simulate that the _handle_growing_file_logic method actually calls the growing detector
+                orchestrator.growing_file_detector,
+                "update_file_growth_info",
+                new_callable=AsyncMock,
+            ):
                 with patch.object(
                     orchestrator.growing_file_detector,
-                    "update_file_growth_info",
+                    "check_file_growth_status",
                     new_callable=AsyncMock,
-                ):
-                    with patch.object(
-                        orchestrator.growing_file_detector,
-                        "check_file_growth_status",
-                        new_callable=AsyncMock,
-                    ) as mock_check_growth:
-                        # Return the same status to prevent any status change
-                        mock_check_growth.return_value = (FileStatus.DISCOVERED, None)
-                        await orchestrator._check_file_stability()
+                ) as mock_check_growth:
+                    # Return the same status to prevent any status change
+                    mock_check_growth.return_value = (FileStatus.DISCOVERED, None)
+                    await orchestrator._check_file_stability(snapshot)
 
         # Verify file metadata was updated and timer reset
         updated_file = await state_manager.get_file_by_id(tracked_file.id)
@@ -117,9 +113,6 @@ class TestFileStabilityRefactoring:
         assert updated_file.last_write_time == new_time
         assert updated_file.discovered_at > original_discovered  # Timer was reset
 
-    @pytest.mark.skip(
-        reason="Test is outdated - new architecture uses growing file logic for all files"
-    )
     async def test_stable_file_transitions_to_ready(self, orchestrator, state_manager):
         """Test that stable files transition to READY status."""
 
@@ -140,38 +133,32 @@ class TestFileStabilityRefactoring:
             discovered_at=datetime.now() - timedelta(seconds=3),
         )
 
-        # Create metadata dictionary (no changes)
-        metadata = {
-            "path": Path(file_path),
-            "size": 1024,
-            "last_write_time": write_time,
+        # The scan's snapshot shows no changes
+        snapshot = {
+            file_path: FileObservation(
+                path=file_path, size=1024, mtime=write_time.timestamp()
+            )
         }
 
         # Call stability logic
-        with patch(
-            "app.services.scanner.file_scanner.get_file_metadata",
-            new_callable=AsyncMock,
-        ) as mock_get_metadata:
-            mock_get_metadata.return_value = metadata
-            # Mock the state manager's get_files_by_status to return our file
+        with patch.object(
+            state_manager, "get_files_by_status", new_callable=AsyncMock
+        ) as mock_get_files:
+            mock_get_files.return_value = [tracked_file]
+            # We need to simulate the growing file detector behavior
             with patch.object(
-                state_manager, "get_files_by_status", new_callable=AsyncMock
-            ) as mock_get_files:
-                mock_get_files.return_value = [tracked_file]
-                # We need to simulate the growing file detector behavior
+                orchestrator.growing_file_detector,
+                "update_file_growth_info",
+                new_callable=AsyncMock,
+            ):
                 with patch.object(
                     orchestrator.growing_file_detector,
-                    "update_file_growth_info",
+                    "check_file_growth_status",
                     new_callable=AsyncMock,
-                ):
-                    with patch.object(
-                        orchestrator.growing_file_detector,
-                        "check_file_growth_status",
-                        new_callable=AsyncMock,
-                    ) as mock_check_growth:
-                        # Return READY status to simulate file is ready
-                        mock_check_growth.return_value = (FileStatus.READY, None)
-                        await orchestrator._check_file_stability()
+                ) as mock_check_growth:
+                    # Return READY status to simulate file is ready
+                    mock_check_growth.return_value = (FileStatus.READY, None)
+                    await orchestrator._check_file_stability(snapshot)
 
         # Verify file transitioned to READY
         updated_file = await state_manager.get_file_by_id(tracked_file.id)
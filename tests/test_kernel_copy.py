@@ -0,0 +1,139 @@
+"""
+Tests for the kernel-side copy path (copy_file_range/sendfile).
+"""
+
+import errno
+import os
+from unittest.mock import AsyncMock, patch
+
+import aiofiles
+import pytest
+
+from app.config import Settings
+from app.core.transfer_progress import TransferProgress
+from app.services.copy.file_copy_executor import FileCopyExecutor
+from app.services.copy.kernel_copy import (
+    COPY_FILE_RANGE,
+    KernelCopier,
+    KernelCopyUnsupported,
+    file_descriptor,
+    kernel_copy_methods,
+)
+from app.services.copy.network_error_detector import NetworkErrorDetector
+from app.services.copy_strategies import GrowingFileCopyStrategy
+from app.services.state_manager import StateManager
+
+
+pytestmark = [
+    pytest.mark.asyncio,
+    pytest.mark.skipif(not kernel_copy_methods(), reason="no kernel copy syscalls"),
+]
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 123)
+
+
+def _settings(**overrides):
+    return Settings(use_temporary_file=False, kernel_copy_range_mb=1, **overrides)
+
+
+async def test_executor_copies_with_kernel_and_reports_progress(tmp_path):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "out" / "clip.mxf"
+    executor = FileCopyExecutor(_settings())
+    reported = []
+
+    with patch.object(FileCopyExecutor, "_kernel_copy", wraps=executor._kernel_copy) as kernel:
+        result = await executor.copy_file(source, dest, reported.append)
+
+    assert result.success
+    assert kernel.await_count == 1
+    assert dest.read_bytes() == PAYLOAD
+    assert result.bytes_copied == len(PAYLOAD)
+    assert reported and reported[-1].bytes_copied == len(PAYLOAD)
+
+
+async def test_growing_strategy_appends_kernel_range_after_existing_bytes(tmp_path):
+    source = tmp_path / "growing.mxf"
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "growing_out.mxf"
+    strategy = GrowingFileCopyStrategy(
+        settings=_settings(),
+        state_manager=AsyncMock(spec=StateManager),
+        file_copy_executor=AsyncMock(spec=FileCopyExecutor),
+    )
+    progress = TransferProgress("file-1", total_bytes=len(PAYLOAD))
+    detector = NetworkErrorDetector(str(dest))
+
+    async with aiofiles.open(dest, "wb") as dst:
+        # The first part goes through the buffered writer, the rest via the kernel
+        await dst.write(PAYLOAD[:1000])
+        copied = await strategy._copy_chunk_range(
+            str(source), dst, 1000, len(PAYLOAD), 65536, progress, 0, detector
+        )
+
+    assert copied == len(PAYLOAD)
+    assert progress.bytes_copied == len(PAYLOAD)
+    assert dest.read_bytes() == PAYLOAD
+
+
+async def test_mocked_file_objects_fall_back_to_read_write(tmp_path):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD[:4096])
+    executor = FileCopyExecutor(_settings())
+    mock_file = AsyncMock()
+
+    assert file_descriptor(mock_file) is None
+    copied = await executor._kernel_copy(
+        mock_file, mock_file, NetworkErrorDetector(str(tmp_path)), lambda _: None
+    )
+    assert copied is None
+
+
+async def test_copier_steps_down_when_copy_file_range_is_refused(tmp_path):
+    if COPY_FILE_RANGE not in kernel_copy_methods() or len(kernel_copy_methods()) < 2:
+        pytest.skip("needs both copy_file_range and sendfile")
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "copy.mxf"
+    copier = KernelCopier()
+
+    def refuse(*args, **kwargs):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    with patch("os.copy_file_range", refuse):
+        with open(source, "rb") as src, open(dest, "wb") as dst:
+            copied = copier.copy_range(src.fileno(), dst.fileno(), 0, len(PAYLOAD))
+
+    assert copier.method == "sendfile"
+    assert copied == len(PAYLOAD)
+    assert dest.read_bytes() == PAYLOAD
+
+
+async def test_copier_reports_unsupported_when_no_method_works(tmp_path):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(b"x")
+    copier = KernelCopier()
+
+    def refuse(*args, **kwargs):
+        raise OSError(errno.ENOSYS, "Function not implemented")
+
+    with patch("os.copy_file_range", refuse, create=True), patch("os.sendfile", refuse):
+        with open(source, "rb") as src, open(tmp_path / "copy.mxf", "wb") as dst:
+            with pytest.raises(KernelCopyUnsupported):
+                copier.copy_range(src.fileno(), dst.fileno(), 0, 1)
+
+
+async def test_copier_checks_stop_flag_between_syscalls(tmp_path):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+    copier = KernelCopier()
+    if copier.method is None:
+        pytest.skip("no kernel copy syscall on this platform")
+
+    with open(source, "rb") as src, open(tmp_path / "copy.mxf", "wb") as dst:
+        copied = copier.copy_range(
+            src.fileno(), dst.fileno(), 0, len(PAYLOAD), should_stop=lambda: True
+        )
+
+    assert copied == 0
@@ -0,0 +1,156 @@
+"""
+Tests for the pipelined (double-buffered) copy engine and strategy selection.
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock
+
+import aiofiles
+import pytest
+
+from app.config import Settings
+from app.core.transfer_progress import TransferProgress
+from app.services.copy.file_copy_executor import FileCopyExecutor
+from app.services.copy.network_error_detector import NetworkError, NetworkErrorDetector
+from app.services.copy.pipelined_copy import PipelinedRangeCopier
+from app.services.copy_strategies import (
+    GrowingFileCopyStrategy,
+    PipelinedFileCopyStrategy,
+    create_copy_strategy,
+)
+from app.services.state_manager import StateManager
+
+
+pytestmark = pytest.mark.asyncio
+
+PAYLOAD = os.urandom(1024 * 1024 + 77)
+
+
+class SlowSource:
+    """In-memory source whose reads take a fixed time, like a busy disk."""
+
+    def __init__(self, data: bytes, delay: float):
+        self._data = data
+        self._position = 0
+        self._delay = delay
+
+    async def readinto(self, view) -> int:
+        await asyncio.sleep(self._delay)
+        chunk = self._data[self._position : self._position + len(view)]
+        view[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+
+class SlowDestination:
+    def __init__(self, delay: float, fail_after: int = -1):
+        self.data = bytearray()
+        self._delay = delay
+        self._fail_after = fail_after
+
+    async def write(self, view) -> int:
+        await asyncio.sleep(self._delay)
+        if self._fail_after == 0:
+            raise OSError(5, "Input/output error")
+        self._fail_after -= 1
+        self.data += view
+        return len(view)
+
+
+async def _noop(_):
+    pass
+
+
+async def test_reads_and_writes_overlap():
+    chunk_size = len(PAYLOAD) // 8 + 1
+    copier = PipelinedRangeCopier(chunk_size, depth=3)
+    destination = SlowDestination(delay=0.02)
+
+    started = time.monotonic()
+    copied = await copier.copy_range(
+        SlowSource(PAYLOAD, delay=0.02), destination, 0, len(PAYLOAD), _noop
+    )
+    elapsed = time.monotonic() - started
+
+    assert copied == len(PAYLOAD)
+    assert bytes(destination.data) == PAYLOAD
+    # Sequential would be 8 x (read + write) = 0.32 s; overlapped is ~0.18 s
+    assert elapsed < 0.27
+
+
+async def test_source_ending_early_returns_short_position():
+    copier = PipelinedRangeCopier(4096, depth=2)
+    destination = SlowDestination(delay=0)
+
+    copied = await copier.copy_range(
+        SlowSource(PAYLOAD[:10000], delay=0), destination, 500, 500 + 20000, _noop
+    )
+
+    assert copied == 500 + 10000
+
+
+async def test_write_error_is_translated_and_reader_stopped():
+    copier = PipelinedRangeCopier(4096, depth=2)
+    detector = NetworkErrorDetector("/fake/dest")
+
+    def on_write_error(error):
+        detector.check_write_error(error, "pipelined chunk write")
+
+    with pytest.raises(NetworkError, match="pipelined chunk write"):
+        await copier.copy_range(
+            SlowSource(PAYLOAD, delay=0),
+            SlowDestination(delay=0, fail_after=2),
+            0,
+            len(PAYLOAD),
+            _noop,
+            on_write_error,
+        )
+
+
+async def test_read_error_propagates():
+    source = SlowSource(PAYLOAD, delay=0)
+    source.readinto = AsyncMock(side_effect=OSError(5, "Input/output error"))
+    copier = PipelinedRangeCopier(4096, depth=2)
+
+    with pytest.raises(OSError):
+        await copier.copy_range(source, SlowDestination(delay=0), 0, 8192, _noop)
+
+
+async def test_pipelined_strategy_copies_real_files(tmp_path):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "clip_out.mxf"
+    settings = Settings(copy_mode="pipelined", use_kernel_copy=False)
+    strategy = create_copy_strategy(
+        settings, AsyncMock(spec=StateManager), AsyncMock(spec=FileCopyExecutor)
+    )
+    progress = TransferProgress("file-1", total_bytes=len(PAYLOAD))
+
+    async with aiofiles.open(dest, "wb") as dst:
+        copied = await strategy._copy_chunk_range(
+            str(source),
+            dst,
+            0,
+            len(PAYLOAD),
+            65536,
+            progress,
+            0,
+            NetworkErrorDetector(str(dest)),
+        )
+
+    assert isinstance(strategy, PipelinedFileCopyStrategy)
+    assert copied == progress.bytes_copied == len(PAYLOAD)
+    assert dest.read_bytes() == PAYLOAD
+
+
+async def test_copy_mode_selects_strategy():
+    state_manager = AsyncMock(spec=StateManager)
+    executor = AsyncMock(spec=FileCopyExecutor)
+
+    sequential = create_copy_strategy(Settings(), state_manager, executor)
+    assert type(sequential) is GrowingFileCopyStrategy
+
+    with pytest.raises(ValueError, match="copy_mode"):
+        create_copy_strategy(Settings(copy_mode="turbo"), state_manager, executor)
@@ -0,0 +1,181 @@
+"""
+Tests for resumable copies (enable_secure_resume).
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.config import Settings
+from app.core.file_repository import FileRepository
+from app.models import CopyCheckpoint, FileStatus
+from app.services.consumer.job_file_preparation_service import JobFilePreparationService
+from app.services.consumer.job_models import QueueJob
+from app.services.copy.file_copy_executor import FileCopyExecutor
+from app.services.copy.copy_resume import CopyResumer
+from app.services.copy.resume_verifier import ResumeVerifier
+from app.services.copy_strategies import GrowingFileCopyStrategy
+from app.services.state_manager import StateManager
+
+
+pytestmark = pytest.mark.asyncio
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 5)
+PREFIX = 2 * 1024 * 1024
+
+
+async def test_verifier_accepts_matching_prefix(tmp_path):
+    source, dest = tmp_path / "src.mxf", tmp_path / "dst.mxf"
+    source.write_bytes(PAYLOAD)
+    dest.write_bytes(PAYLOAD[:PREFIX])
+
+    offset = await ResumeVerifier(64 * 1024).find_resume_offset(str(source), str(dest))
+
+    assert offset == PREFIX
+
+
+async def test_verifier_falls_back_to_checkpoint_when_tail_is_garbage(tmp_path):
+    source, dest = tmp_path / "src.mxf", tmp_path / "dst.mxf"
+    source.write_bytes(PAYLOAD)
+    dest.write_bytes(PAYLOAD[:PREFIX] + b"\0" * 4096)  # Write that died mid-chunk
+
+    verifier = ResumeVerifier(64 * 1024)
+    offset = await verifier.find_resume_offset(str(source), str(dest), [PREFIX])
+
+    assert offset == PREFIX
+
+
+async def test_verifier_rejects_a_different_file(tmp_path):
+    source, dest = tmp_path / "src.mxf", tmp_path / "dst.mxf"
+    source.write_bytes(PAYLOAD)
+    dest.write_bytes(os.urandom(PREFIX))
+
+    assert await ResumeVerifier().find_resume_offset(str(source), str(dest)) == 0
+
+
+async def test_resumed_destination_drops_the_unverified_tail(tmp_path):
+    dest = tmp_path / "dst.mxf"
+    dest.write_bytes(PAYLOAD[:PREFIX] + b"\0" * 100)
+    resumer = CopyResumer(Settings(enable_secure_resume=True), MagicMock())
+
+    async with resumer.open_destination(str(dest), PREFIX) as dst:
+        await dst.write(PAYLOAD[PREFIX:])
+
+    assert dest.read_bytes() == PAYLOAD
+
+
+@pytest.fixture
+def state_manager():
+    return StateManager(file_repository=FileRepository())
+
+
+def _strategy(state_manager):
+    settings = Settings(
+        enable_secure_resume=True, resume_verify_window_mb=1, use_kernel_copy=False
+    )
+    return GrowingFileCopyStrategy(
+        settings, state_manager, AsyncMock(spec=FileCopyExecutor)
+    )
+
+
+async def test_copy_continues_from_verified_prefix(tmp_path, state_manager):
+    source, dest = tmp_path / "src.mxf", tmp_path / "dst.mxf"
+    source.write_bytes(PAYLOAD)
+    dest.write_bytes(PAYLOAD[:PREFIX] + b"\0" * 100)
+    tracked_file = await state_manager.add_file(str(source), len(PAYLOAD))
+    await state_manager.update_file_status_by_id(
+        tracked_file.id,
+        FileStatus.COPYING,
+        copy_checkpoint=CopyCheckpoint(destination_path=str(dest), bytes_copied=PREFIX),
+    )
+    strategy = _strategy(state_manager)
+
+    with patch.object(
+        strategy, "_copy_chunk_range", wraps=strategy._copy_chunk_range
+    ) as copy_range:
+        assert await strategy._copy_growing_file(str(source), str(dest), tracked_file)
+
+    assert copy_range.call_args.args[2] == PREFIX  # start_bytes
+    assert dest.read_bytes() == PAYLOAD
+
+
+async def test_failed_copy_records_checkpoint(tmp_path, state_manager):
+    source, dest = tmp_path / "src.mxf", tmp_path / "dst.mxf"
+    source.write_bytes(PAYLOAD)
+    tracked_file = await state_manager.add_file(str(source), len(PAYLOAD))
+    strategy = _strategy(state_manager)
+
+    async def interrupted_loop(*args, **kwargs):
+        progress = args[-1]
+        progress.bytes_copied = 1234
+        raise RuntimeError("copy interrupted")
+
+    with patch.object(strategy, "_growing_copy_loop", interrupted_loop):
+        assert not await strategy._copy_growing_file(
+            str(source), str(dest), tracked_file
+        )
+
+    checkpoint = (await state_manager.get_file_by_id(tracked_file.id)).copy_checkpoint
+    assert checkpoint.destination_path == str(dest)
+    assert checkpoint.bytes_copied == 1234
+
+
+async def test_retry_entry_inherits_checkpoint_of_failed_entry(tmp_path, state_manager):
+    partial = tmp_path / "clip.mxf"
+    partial.write_bytes(b"x")
+    failed = await state_manager.add_file("/src/clip.mxf", 100)
+    await state_manager.update_file_status_by_id(
+        failed.id,
+        FileStatus.FAILED,
+        copy_checkpoint=CopyCheckpoint(destination_path=str(partial), bytes_copied=1),
+    )
+    retry = await state_manager.add_file("/src/clip.mxf", 100)
+    preparer = JobFilePreparationService(
+        MagicMock(enable_secure_resume=True), state_manager, MagicMock(), MagicMock()
+    )
+
+    prepared = await preparer.prepare_file_for_copy(
+        QueueJob(tracked_file=retry, added_to_queue_at=datetime.now())
+    )
+
+    assert prepared.destination_path == Path(partial)
+    assert retry.copy_checkpoint.destination_path == str(partial)
+
+
+async def test_completed_entry_blocks_resume_of_older_failure(state_manager):
+    failed = await state_manager.add_file("/src/clip.mxf", 100)
+    await state_manager.update_file_status_by_id(
+        failed.id,
+        FileStatus.FAILED,
+        copy_checkpoint=CopyCheckpoint(destination_path="/dst/clip.mxf"),
+    )
+    completed = await state_manager.add_file("/src/clip.mxf", 100)
+    await state_manager.update_file_status_by_id(completed.id, FileStatus.COMPLETED)
+    newest = await state_manager.add_file("/src/clip.mxf", 100)
+
+    assert await state_manager.get_resume_checkpoint(newest) is None
+
+
+async def test_newest_entry_decides_resume_regardless_of_status(state_manager):
+    completed = await state_manager.add_file("/src/clip.mxf", 100)
+    await state_manager.update_file_status_by_id(completed.id, FileStatus.COMPLETED)
+    failed = await state_manager.add_file("/src/clip.mxf", 100)
+    await state_manager.update_file_status_by_id(
+        failed.id,
+        FileStatus.FAILED,
+        copy_checkpoint=CopyCheckpoint(destination_path="/dst/clip.mxf"),
+    )
+    retry = await state_manager.add_file("/src/clip.mxf", 100)
+
+    # An older COMPLETED copy of a reused clip name does not block the newer failure
+    checkpoint = await state_manager.get_resume_checkpoint(retry)
+    assert checkpoint.destination_path == "/dst/clip.mxf"
+
+    await state_manager.update_file_status_by_id(retry.id, FileStatus.REMOVED)
+    newest = await state_manager.add_file("/src/clip.mxf", 100)
+
+    # A newer REMOVED entry does
+    assert await state_manager.get_resume_checkpoint(newest) is None
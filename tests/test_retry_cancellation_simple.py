@@ -37,7 +37,7 @@ class TestRetryTaskCancellationFailAndRediscover:
             retry_type="space",
         )
 
-        assert tracked_file.id in state_manager._retry_tasks, (
+        assert state_manager._retry_scheduler.is_scheduled(tracked_file.id), (
             "Retry task should be scheduled"
         )
 
@@ -49,6 +49,6 @@ class TestRetryTaskCancellationFailAndRediscover:
         )
 
         # Verify retry task was cancelled
-        assert tracked_file.id not in state_manager._retry_tasks, (
+        assert not state_manager._retry_scheduler.is_scheduled(tracked_file.id), (
             "CRITICAL: Retry task was not cancelled when file failed immediately!"
         )
@@ -250,11 +250,12 @@ class TestScannerUUIDIntegration:
         # Simulate old completion
         from datetime import datetime, timedelta
 
-        # Get file reference OUTSIDE the lock, then modify it
-        file = await state_manager.get_file_by_id(completed.id)
-        if file:
-            # Now manually set the completed_at time without holding the lock
-            file.completed_at = datetime.now() - timedelta(hours=3)
+        # Backdate the completion through the StateManager so the retention index sees it
+        await state_manager.update_file_status_by_id(
+            completed.id,
+            FileStatus.COMPLETED,
+            completed_at=datetime.now() - timedelta(hours=3),
+        )
 
         # Add recent
         recent = await state_manager.add_file("/test/recent.mxf", 100)
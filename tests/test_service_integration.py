@@ -36,6 +36,7 @@ def test_settings():
     settings.growing_file_chunk_size_kb = 32
     settings.chunk_size_kb = 2048  # Simple 2MB chunks
     settings.max_concurrent_copies = 1
+    settings.enable_secure_resume = False
     # Output folder template settings
     settings.output_folder_template_enabled = False
     settings.output_folder_default_category = "OTHER"
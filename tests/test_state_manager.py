@@ -95,6 +95,16 @@ class TestStateManager:
         remaining_ids = {f.id for f in all_files if f.status != FileStatus.REMOVED}
         assert len(remaining_ids) == 1
 
+    async def test_cleanup_keeps_files_in_unreachable_directories(self, state_manager):
+        await state_manager.add_file("/test/hung/file1.mxf", 1024)
+        await state_manager.add_file("/test/hung-not/file2.mxf", 2048)
+        removed_count = await state_manager.cleanup_missing_files(
+            set(), unreachable_directories=["/test/hung"]
+        )
+        assert removed_count == 1
+        kept = await state_manager.get_active_file_by_path("/test/hung/file1.mxf")
+        assert kept.status != FileStatus.REMOVED
+
     async def test_thread_safety_concurrent_operations(self, state_manager):
         """Test thread safety med concurrent add/update/remove operationer."""
         file_paths = [f"/test/file_{i}.mxf" for i in range(100)]
@@ -208,3 +218,87 @@ class TestStateManager:
         # Cancel all retries
         cancelled_count = await state_manager.cancel_all_retries()
         assert cancelled_count == 2
+
+    async def test_update_many_skips_unchanged_values(self, state_manager):
+        """Test at update_many kun skriver filer hvor noget faktisk ændrede sig."""
+        file1 = await state_manager.add_file("/test/file1.mxf", 1024)
+        file2 = await state_manager.add_file("/test/file2.mxf", 2048)
+
+        changed = await state_manager.update_many(
+            {
+                file1.id: {"file_size": 1024},  # Unchanged
+                file2.id: {"file_size": 4096, "status": FileStatus.GROWING},
+                "unknown-id": {"file_size": 1},
+            }
+        )
+
+        assert [f.id for f in changed] == [file2.id]
+        updated = await state_manager.get_file_by_id(file2.id)
+        assert updated.file_size == 4096
+        assert updated.status == FileStatus.GROWING
+
+    async def test_update_many_does_not_count_bookkeeping_as_a_change(self, state_manager):
+        """Test at last_growth_check sættes, men alene ikke skriver eller annoncerer filen."""
+        from datetime import datetime
+
+        tracked = await state_manager.add_file("/test/file1.mxf", 1024)
+        checked_at = datetime.now()
+
+        changed = await state_manager.update_many(
+            {tracked.id: {"file_size": 1024, "last_growth_check": checked_at}}
+        )
+
+        assert changed == []
+        assert (await state_manager.get_file_by_id(tracked.id)).last_growth_check == checked_at
+
+    async def test_progress_sample_for_finished_file_is_dropped(self, state_manager):
+        """Test at et sent progress-sample ikke forsøger at ændre en read-only history-kopi."""
+        from app.core.transfer_progress import TransferProgress
+
+        tracked = await state_manager.add_file("/test/file1.mxf", 1024)
+        await state_manager.update_file_status_by_id(tracked.id, FileStatus.COMPLETED)
+        progress = TransferProgress(tracked.id, total_bytes=1024)
+        progress.bytes_copied = 512
+
+        assert await state_manager.apply_transfer_progress(progress) is None
+
+    async def test_update_many_publishes_one_batch_event(self):
+        """Test at en batch giver én samlet notifikation plus FileReadyEvent for READY."""
+        from app.core.events.event_bus import DomainEventBus
+        from app.core.events.file_events import (
+            FileReadyEvent,
+            FilesBatchUpdatedEvent,
+            FileStatusChangedEvent,
+        )
+        from app.core.file_repository import FileRepository
+
+        event_bus = DomainEventBus()
+        state_manager = StateManager(
+            file_repository=FileRepository(), event_bus=event_bus
+        )
+        file1 = await state_manager.add_file("/test/file1.mxf", 1024)
+        file2 = await state_manager.add_file("/test/file2.mxf", 2048)
+        await asyncio.sleep(0.01)  # Let the DISCOVERED events settle
+
+        received = []
+
+        async def record(event):
+            received.append(event)
+
+        for event_type in (FilesBatchUpdatedEvent, FileReadyEvent, FileStatusChangedEvent):
+            await event_bus.subscribe(event_type, record)
+
+        await state_manager.update_many(
+            {
+                file1.id: {"status": FileStatus.READY},
+                file2.id: {"file_size": 4096},
+            }
+        )
+        await asyncio.sleep(0.01)
+
+        batch_events = [e for e in received if isinstance(e, FilesBatchUpdatedEvent)]
+        assert len(batch_events) == 1
+        assert set(batch_events[0].file_ids) == {file1.id, file2.id}
+        assert [c.file_id for c in batch_events[0].status_changes] == [file1.id]
+        assert [e.file_id for e in received if isinstance(e, FileReadyEvent)] == [file1.id]
+        assert not [e for e in received if isinstance(e, FileStatusChangedEvent)]
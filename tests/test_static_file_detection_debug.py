@@ -28,6 +28,11 @@ class TestStaticFileDetectionDebug:
         settings.growing_file_poll_interval_seconds = 5
         settings.growing_copy_pause_ms = 100
         settings.growing_file_growth_timeout_seconds = 30
+        settings.use_kernel_copy = False
+        settings.kernel_copy_range_mb = 16
+        settings.resume_verify_window_mb = 4
+        settings.verification_mode = "size"
+        settings.enable_secure_resume = False
         return settings
 
     @pytest.fixture
@@ -0,0 +1,187 @@
+"""
+Tests for the thread-resident copy loop and its async supervisor.
+"""
+
+import os
+import time
+
+import aiofiles
+import pytest
+from unittest.mock import AsyncMock
+
+from app.config import Settings
+from app.core.transfer_progress import TransferProgress
+from app.services.copy.file_copy_executor import FileCopyExecutor
+from app.services.copy.network_error_detector import NetworkError, NetworkErrorDetector
+from app.services.copy.threaded_copy import ThreadedTransferCopy
+from app.services.copy_strategies import ThreadedFileCopyStrategy, create_copy_strategy
+from app.services.state_manager import StateManager
+
+
+pytestmark = pytest.mark.asyncio
+
+PAYLOAD = os.urandom(2 * 1024 * 1024 + 99)
+
+
+@pytest.mark.parametrize("use_kernel_copy", [True, False])
+async def test_thread_copies_ranges_and_counts_bytes(tmp_path, use_kernel_copy):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "copy.mxf"
+
+    with open(dest, "wb") as dst:
+        dst.write(PAYLOAD[:100])
+        dst.flush()
+        copy = ThreadedTransferCopy(
+            str(source), dst.fileno(), 65536, use_kernel_copy=use_kernel_copy
+        )
+        copy.start()
+        thread = copy._thread
+        for start, end in ((100, 4096), (4096, len(PAYLOAD))):  # Two growing-copy cycles
+            copy.copy_range(start, end)
+            assert await copy.wait(5.0)
+            assert copy.error is None
+            assert copy.bytes_copied == end
+        assert copy._thread is thread  # One resident thread for the whole transfer
+        assert await copy.close(5.0)
+
+    assert not thread.is_alive()
+    assert dest.read_bytes() == PAYLOAD
+
+
+async def test_cancel_flag_stops_the_thread(tmp_path):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+
+    with open(tmp_path / "copy.mxf", "wb") as dst:
+        copy = ThreadedTransferCopy(str(source), dst.fileno(), 4096, use_kernel_copy=False)
+        copy.start()
+        copy.copy_range(0, len(PAYLOAD), pause_ms=50)
+        copy.cancel()
+        assert await copy.wait(1.0)
+        assert await copy.close(1.0)
+
+    assert copy.bytes_copied < len(PAYLOAD)
+
+
+async def test_missing_source_error_is_reported(tmp_path):
+    with open(tmp_path / "copy.mxf", "wb") as dst:
+        copy = ThreadedTransferCopy(str(tmp_path / "missing.mxf"), dst.fileno(), 4096)
+        copy.start()
+        copy.copy_range(0, 10)
+        assert await copy.wait(1.0)
+        await copy.close(1.0)
+
+    assert isinstance(copy.error, FileNotFoundError)
+
+
+async def test_hung_thread_is_abandoned_with_its_own_fd(tmp_path, monkeypatch):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "copy.mxf"
+
+    def hung_write(self, src, end_bytes, pause_seconds):
+        time.sleep(0.2)  # Stuck in a write to a share that stopped answering
+        os.write(self._dst_fd, b"late")
+
+    monkeypatch.setattr(ThreadedTransferCopy, "_copy", hung_write)
+
+    with open(dest, "wb") as dst:
+        copy = ThreadedTransferCopy(str(source), dst.fileno(), 4096)
+        copy.start()
+        copy.copy_range(0, len(PAYLOAD))
+        assert not await copy.close(0.01)
+    # The caller's fd is closed; the late write lands through the thread's dup
+    copy._thread.join(2.0)
+
+    assert not copy._thread.is_alive()
+    assert copy.error is None
+    assert dest.read_bytes() == b"late"
+
+
+def _strategy(**overrides):
+    settings = Settings(
+        copy_mode="threaded", progress_sample_interval_seconds=0.01, **overrides
+    )
+    return create_copy_strategy(
+        settings, AsyncMock(spec=StateManager), AsyncMock(spec=FileCopyExecutor)
+    )
+
+
+async def test_threaded_strategy_copies_and_samples_progress(tmp_path):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "clip_out.mxf"
+    strategy = _strategy(use_kernel_copy=False)
+    progress = TransferProgress("file-1", total_bytes=len(PAYLOAD))
+
+    async with aiofiles.open(dest, "wb") as dst:
+        copied = await strategy._copy_chunk_range(
+            str(source), dst, 0, len(PAYLOAD), 65536, progress, 0,
+            NetworkErrorDetector(str(dest)),
+        )
+
+    assert isinstance(strategy, ThreadedFileCopyStrategy)
+    assert copied == progress.bytes_copied == len(PAYLOAD)
+    assert dest.read_bytes() == PAYLOAD
+
+
+async def test_stalled_thread_fails_the_copy(tmp_path, monkeypatch):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD)
+    dest = tmp_path / "clip_out.mxf"
+    strategy = _strategy(copy_stall_timeout_seconds=0.05)
+
+    def hung_write(self, src, end_bytes, pause_seconds):
+        time.sleep(0.3)  # A destination share that stopped answering
+
+    monkeypatch.setattr(ThreadedTransferCopy, "_copy", hung_write)
+
+    async with aiofiles.open(dest, "wb") as dst:
+        with pytest.raises(NetworkError, match="stalled"):
+            await strategy._copy_chunk_range(
+                str(source), dst, 0, len(PAYLOAD), 65536,
+                TransferProgress("file-1", total_bytes=len(PAYLOAD)), 0,
+                NetworkErrorDetector(str(dest)),
+            )
+
+
+async def test_growing_transfer_keeps_one_thread_across_cycles(tmp_path, monkeypatch):
+    source = tmp_path / "clip.mxf"
+    source.write_bytes(PAYLOAD[:4096])
+    dest = tmp_path / "clip_out.mxf"
+    strategy = _strategy(use_kernel_copy=False)
+    starts = []
+    original_start = ThreadedTransferCopy.start
+
+    def counting_start(self):
+        starts.append(self)
+        original_start(self)
+
+    monkeypatch.setattr(ThreadedTransferCopy, "start", counting_start)
+
+    lookups = 0
+
+    async def get_file_by_id(file_id):
+        nonlocal lookups
+        lookups += 1
+        if lookups == 2:
+            source.write_bytes(PAYLOAD)  # The recorder appends between cycles
+        return tracked
+
+    tracked = AsyncMock()
+    tracked.id = "file-1"
+    strategy.state_manager.get_file_by_id.side_effect = get_file_by_id
+    progress = TransferProgress("file-1")
+
+    async with aiofiles.open(dest, "wb") as dst:
+        copied = await strategy._growing_copy_loop(
+            str(source), dst, tracked, 0, 0, 0, 2, 0, 65536, 0.01, 0,
+            NetworkErrorDetector(str(dest)), progress,
+        )
+
+    assert copied == len(PAYLOAD)
+    assert dest.read_bytes() == PAYLOAD
+    assert len(starts) == 1
+    assert not starts[0]._thread.is_alive()
+    assert strategy._transfers == {}
@@ -0,0 +1,79 @@
+"""
+Tests for WebSocket reconnects: delta resync vs. full initial state.
+"""
+
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.core.events.file_events import FileStatusChangedEvent
+from app.core.file_repository import FileRepository
+from app.models import FileStatus
+from app.services.state_manager import StateManager
+from app.services.websocket_manager import WebSocketManager
+
+
+class _FakeWebSocket:
+    def __init__(self):
+        self.accept = AsyncMock()
+        self.sent = []
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+
+@pytest.fixture
+def state_manager():
+    return StateManager(FileRepository())
+
+
+async def _change(ws_manager, state_manager, path, status):
+    tracked = await state_manager.add_file(path, 100)
+    await state_manager.update_file_status_by_id(tracked.id, status)
+    await ws_manager.handle_file_status_changed_event(
+        FileStatusChangedEvent(
+            file_id=tracked.id,
+            file_path=path,
+            old_status=FileStatus.DISCOVERED,
+            new_status=status,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_reconnect_within_buffer_gets_only_missed_changes(state_manager):
+    ws_manager = WebSocketManager(state_manager)
+    first = _FakeWebSocket()
+    await ws_manager.connect(first)
+    initial = first.sent[0]["data"]
+    ws_manager.disconnect(first)
+
+    # Changes while disconnected are still recorded
+    await _change(ws_manager, state_manager, "/src/a.mxf", FileStatus.READY)
+    await _change(ws_manager, state_manager, "/src/b.mxf", FileStatus.READY)
+
+    second = _FakeWebSocket()
+    await ws_manager.connect(second, last_seq=initial["seq"], epoch=initial["epoch"])
+
+    assert [m["type"] for m in second.sent] == [
+        "file_update",
+        "file_update",
+        "resync_complete",
+    ]
+    assert [m["seq"] for m in second.sent[:2]] == [1, 2]
+    assert second.sent[-1]["data"]["seq"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reconnect_past_the_buffer_falls_back_to_full_state(state_manager):
+    ws_manager = WebSocketManager(state_manager, change_buffer_size=1)
+    for path in ("/src/a.mxf", "/src/b.mxf"):
+        await _change(ws_manager, state_manager, path, FileStatus.READY)
+
+    client = _FakeWebSocket()
+    await ws_manager.connect(client, last_seq=0, epoch=ws_manager._changes.epoch)
+
+    assert [m["type"] for m in client.sent] == ["initial_state"]
+    assert client.sent[0]["data"]["seq"] == 2
+    assert len(client.sent[0]["data"]["files"]) == 2